@@ -0,0 +1,154 @@
+import json
+import math
+import os
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from bot_logging import get_logger
+
+logger = get_logger("adaptive_timeouts")
+
+PBTREE_TIMEOUTS_FILE = "pbtree_timeouts.json"
+RETOOL_TIMEOUTS_FILE = "retool_timeouts.json"
+
+
+class AdaptiveTimeouts:
+    """
+    Wait timeouts learned from how long each named wait target actually takes to appear.
+
+    Every successful wait records its time-to-appear for the target (e.g. "table_rows:section#affiliates").
+    Once a target has enough samples, its timeout is the rolling high percentile of those samples
+    times a safety margin, plus a fixed pad, clamped between min_timeout and the hardcoded default
+    times max_factor. Until then the hardcoded default is used.
+
+    Two kinds of waits behave differently when they time out:
+      - Optional waits (an element that is often legitimately absent, like the affiliates tab or
+        an office address) just fail fast; a timeout there says nothing about page speed.
+      - Required waits back off: each timeout multiplies that target's timeout by backoff_factor
+        until the next success, so a slow day stretches the waits instead of failing every page.
+        Anything whose timeout loses data (a section, its rows, a profile field) must be required,
+        otherwise a learned timeout that is too short is never corrected.
+
+    Samples are kept per target in a JSON file so the learned values carry over between runs.
+    """
+
+    def __init__(self, path=None, percentile=95, margin=1.5, pad_seconds=0.5, min_timeout=1.0,
+                 max_factor=3.0, window=200, min_samples=5, backoff_factor=1.5, save_every=25):
+        self.path = path
+        self.percentile = percentile
+        self.margin = margin
+        self.pad_seconds = pad_seconds
+        self.min_timeout = min_timeout
+        self.max_factor = max_factor
+        self.window = window
+        self.min_samples = min_samples
+        self.backoff_factor = backoff_factor
+        self.save_every = save_every
+
+        self._samples = {}   # {target: [seconds, ...]} most recent last, at most `window` entries
+        self._backoff = {}   # {target: multiplier applied after consecutive required-wait timeouts}
+        self._timeouts = {}  # {target: timeouts seen this run}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self._samples = {target: list(samples)[-self.window:] for target, samples in stored.get("samples", {}).items()}
+            logger.info(f"Loaded learned wait timeouts for {len(self._samples)} targets from {self.path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load learned wait timeouts from {self.path}, starting from defaults. Error: {e}")
+
+    def save(self):
+        """Writes the rolling samples to disk (atomically, so an interrupted run can't corrupt them)."""
+        if not self.path:
+            return
+        with self._lock:
+            payload = {"updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "samples": self._samples}
+            self._unsaved = 0
+            temp_path = self.path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save learned wait timeouts to {self.path}. Error: {e}")
+
+    def _percentile(self, samples):
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(self.percentile / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    def timeout(self, target, default):
+        """
+        Returns the timeout to use for a wait target.
+
+        Args:
+            target (str): Stable name of what is being waited for.
+            default (float): The previously hardcoded timeout; used until enough samples exist
+                             and as the basis for the upper bound.
+        """
+        with self._lock:
+            samples = self._samples.get(target)
+            backoff = self._backoff.get(target, 1.0)
+        upper = default * self.max_factor
+        if not samples or len(samples) < self.min_samples:
+            return min(upper, default * backoff)
+        learned = self._percentile(samples) * self.margin + self.pad_seconds
+        return round(min(upper, max(self.min_timeout, learned * backoff)), 2)
+
+    def record(self, target, seconds):
+        with self._lock:
+            samples = self._samples.setdefault(target, [])
+            samples.append(round(seconds, 3))
+            if len(samples) > self.window:
+                del samples[:len(samples) - self.window]
+            self._backoff.pop(target, None)
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def record_timeout(self, target, optional=False):
+        with self._lock:
+            self._timeouts[target] = self._timeouts.get(target, 0) + 1
+            if not optional:
+                self._backoff[target] = min(self.max_factor, self._backoff.get(target, 1.0) * self.backoff_factor)
+
+    def wait(self, driver, target, default, optional=False):
+        """
+        Drop-in for WebDriverWait(driver, default): the returned wait's until() uses the learned
+        timeout for `target` and records how long the condition took (or that it timed out).
+        `driver` can also be a WebElement, as with WebDriverWait.
+        """
+        return _LearnedWait(self, driver, target, default, optional)
+
+    def close(self):
+        self.save()
+
+
+class _LearnedWait:
+
+    def __init__(self, timeouts, driver, target, default, optional):
+        self.timeouts = timeouts
+        self.driver = driver
+        self.target = target
+        self.timeout = timeouts.timeout(target, default)
+        self.optional = optional
+
+    def until(self, condition, message=""):
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, self.timeout).until(condition, message)
+        except TimeoutException:
+            self.timeouts.record_timeout(self.target, self.optional)
+            raise
+        self.timeouts.record(self.target, time.monotonic() - started)
+        return result
@@ -0,0 +1,289 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+
+from pb_fixture_server import FixtureGraph, FixtureServer
+from pb_tree_crawler import WebScraper, CHROMEDRIVER_PATH, run_coordinated_worker
+from crawl_budget import CrawlBudget
+from crawl_coordinator import CrawlCoordinator
+from crawl_snapshot import CrawlSnapshot
+from pb_ids import canonical_profile_url
+
+from bot_logging import get_logger, add_logging_arguments, configure_logging_from_args, flush_logging, COLOR_GREEN, COLOR_RESET
+
+logger = get_logger("benchmark")
+
+CRAWL_MODES = ["full", "incremental", "budgeted", "worker", "workers"]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; returns None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class CrawlInstrumentation:
+    """
+    Counts WebDriver commands and times scrape_profile_and_affiliates on one scraper.
+
+    Every Selenium call (driver and element methods, waits polling find_element) ends up in
+    driver.execute, so wrapping it on the instance counts round-trips to the browser. Profile
+    timings are exclusive: time spent in recursive child calls is subtracted from the parent.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.webdriver_calls = 0
+        self.profile_seconds = []
+        self._stack = []
+
+        original_execute = scraper.driver.execute
+        def counting_execute(driver_command, params=None):
+            self.webdriver_calls += 1
+            return original_execute(driver_command, params)
+        scraper.driver.execute = counting_execute
+
+        original_scrape = scraper.scrape_profile_and_affiliates
+        def timed_scrape(*args, **kwargs):
+            frame = {"start": time.perf_counter(), "child_seconds": 0.0}
+            self._stack.append(frame)
+            try:
+                result = original_scrape(*args, **kwargs)
+            finally:
+                self._stack.pop()
+                elapsed = time.perf_counter() - frame["start"]
+                if self._stack:
+                    self._stack[-1]["child_seconds"] += elapsed
+            if result and result.get("status") == "scraped":
+                self.profile_seconds.append(elapsed - frame["child_seconds"])
+            return result
+        scraper.scrape_profile_and_affiliates = timed_scrape
+
+    def reset(self):
+        self.webdriver_calls = 0
+        self.profile_seconds = []
+
+    def report(self, mode, wall_seconds, pages_served):
+        return build_report(mode, wall_seconds, pages_served, self.webdriver_calls, self.profile_seconds)
+
+
+def build_report(mode, wall_seconds, pages_served, webdriver_calls, profile_seconds):
+    profiles = len(profile_seconds)
+    return {
+        "mode": mode,
+        "profiles": profiles,
+        "pages_served": pages_served,
+        "wall_seconds": round(wall_seconds, 2),
+        "profiles_per_minute": round(profiles / (wall_seconds / 60.0), 2) if wall_seconds and profiles else 0.0,
+        "webdriver_calls": webdriver_calls,
+        "webdriver_calls_per_profile": round(webdriver_calls / profiles, 1) if profiles else None,
+        "p50_profile_seconds": _round_or_none(percentile(profile_seconds, 50)),
+        "p95_profile_seconds": _round_or_none(percentile(profile_seconds, 95)),
+    }
+
+
+def _round_or_none(value, digits=3):
+    return round(value, digits) if value is not None else None
+
+
+def reset_crawl_state(scraper):
+    scraper.visited_pb_ids = set()
+    scraper.profile_cache = {}
+    scraper.edge_changes = []
+    scraper.previous_snapshot = None
+    scraper.crawl_budget = None
+
+
+def crawl_roots(scraper, server, max_depth, budget_factory=None):
+    """Recursive crawl of every fixture root, the way PBTree's main loop runs it."""
+    trees = []
+    for root in server.graph.roots_for_scraping():
+        scraper.crawl_budget = budget_factory() if budget_factory else None
+        tree = scraper.scrape_profile_and_affiliates(canonical_profile_url(root["pitchbook_id"], server.base_url), max_depth=max_depth)
+        scraper.crawl_budget = None
+        if tree:
+            tree["root_name"] = root["root_company_name"]
+            trees.append(tree)
+    return trees
+
+
+def _worker_process_main(worker_number, base_url, db_path, workdir, args, ready, start, results):
+    """One PBTree worker process for the 'workers' mode: its own browser, the shared coordinator database."""
+    configure_logging_from_args(args)
+    scraper = None
+    try:
+        scraper = WebScraper(headless=args.headless, profile_dir=os.path.join(workdir, f"chrome_profile_{worker_number}"), chromedriver_path=args.chromedriver)
+        scraper.base_url = base_url
+        scraper.profile_base_url = base_url
+        instrumentation = CrawlInstrumentation(scraper)
+        coordinator = CrawlCoordinator(db_path)
+        # Browser startup is not part of the measurement; every worker starts crawling together
+        ready.release()
+        start.wait()
+        run_coordinated_worker(scraper, coordinator, poll_seconds=0.1)
+        coordinator.close()
+        results.put({"webdriver_calls": instrumentation.webdriver_calls, "profile_seconds": instrumentation.profile_seconds})
+    except Exception as e:
+        logger.error(f"Benchmark worker {worker_number} failed: {e}")
+        ready.release()
+        results.put(None)
+    finally:
+        if scraper:
+            scraper.close()
+        flush_logging()
+
+
+def run_worker_processes(server, args, workdir):
+    """Runs --workers PBTree worker processes against one coordinator database and merges their measurements."""
+    db_path = os.path.join(workdir, f"benchmark_workers_{int(time.time())}.db")
+    coordinator = CrawlCoordinator(db_path)
+    coordinator.seed_roots(server.graph.roots_for_scraping(), args.depth)
+    coordinator.close()
+
+    # Spawn rather than fork: the parent runs the fixture server and logging threads
+    context = multiprocessing.get_context("spawn")
+    ready = context.Semaphore(0)
+    start = context.Event()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker_process_main, args=(worker_number, server.base_url, db_path, workdir, args, ready, start, results))
+        for worker_number in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.acquire()
+
+    pages_before = server.pages_served
+    started = time.perf_counter()
+    start.set()
+    # Drain the queue before joining, a process with unread queue data does not exit
+    worker_results = [results.get() for _ in processes]
+    wall_seconds = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    failed_workers = sum(1 for result in worker_results if result is None)
+    if failed_workers:
+        logger.warning(f"{failed_workers} of {args.workers} benchmark workers failed; their profiles are not counted.")
+    worker_results = [result for result in worker_results if result is not None]
+    report = build_report(
+        f"workers x{args.workers}", wall_seconds, server.pages_served - pages_before,
+        sum(result["webdriver_calls"] for result in worker_results),
+        [seconds for result in worker_results for seconds in result["profile_seconds"]],
+    )
+    return report
+
+
+def run_mode(mode, scraper, instrumentation, server, args, workdir, baseline_trees):
+    if mode == "workers":
+        return run_worker_processes(server, args, workdir), None
+    reset_crawl_state(scraper)
+    if mode == "incremental":
+        if baseline_trees is None:
+            logger.info("Running an unmeasured full crawl to build the incremental baseline...")
+            baseline_trees = crawl_roots(scraper, server, args.depth)
+            reset_crawl_state(scraper)
+        scraper.previous_snapshot = CrawlSnapshot(baseline_trees)
+
+    instrumentation.reset()
+    pages_before = server.pages_served
+    started = time.perf_counter()
+    trees = None
+    if mode in ("full", "incremental"):
+        trees = crawl_roots(scraper, server, args.depth)
+    elif mode == "budgeted":
+        max_fanout = max(1, args.fanout // 2)
+        trees = crawl_roots(scraper, server, args.depth, lambda: CrawlBudget(max_fanout=max_fanout))
+    elif mode == "worker":
+        coordinator = CrawlCoordinator(os.path.join(workdir, f"benchmark_{int(time.time())}.db"))
+        coordinator.seed_roots(server.graph.roots_for_scraping(), args.depth)
+        run_coordinated_worker(scraper, coordinator, poll_seconds=0.1)
+        coordinator.close()
+    wall_seconds = time.perf_counter() - started
+
+    report = instrumentation.report(mode, wall_seconds, server.pages_served - pages_before)
+    return report, trees
+
+
+def print_report(reports):
+    print(f"\n{COLOR_GREEN}=== Crawler Benchmark Results ==={COLOR_RESET}")
+    header = f"{'mode':<12}{'profiles':>9}{'wall s':>9}{'prof/min':>10}{'calls/prof':>12}{'p50 s':>8}{'p95 s':>8}"
+    print(f"{COLOR_GREEN}{header}{COLOR_RESET}")
+    for report in reports:
+        print(f"{COLOR_GREEN}{report['mode']:<12}{report['profiles']:>9}{report['wall_seconds']:>9}"
+              f"{report['profiles_per_minute']:>10}{str(report['webdriver_calls_per_profile']):>12}"
+              f"{str(report['p50_profile_seconds']):>8}{str(report['p95_profile_seconds']):>8}{COLOR_RESET}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PBTree against a local PitchBook fixture server.")
+    parser.add_argument("--modes", nargs="+", choices=CRAWL_MODES, default=CRAWL_MODES,
+                        help="Crawl modes to measure (default: all).")
+    parser.add_argument("--roots", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=2, help="Fixture tree depth, also used as the crawl's --max-depth.")
+    parser.add_argument("--fanout", type=int, default=4, help="Related companies per fixture profile.")
+    parser.add_argument("--page-size", type=int, default=10, help="Rows per fixture table page.")
+    parser.add_argument("--latency-ms", type=int, default=50, help="Server delay before each page response.")
+    parser.add_argument("--render-delay-ms", type=int, default=100, help="Client-side delay before a table page renders.")
+    parser.add_argument("--cross-link-ratio", type=float, default=0.1, help="Share of profiles linking back to an existing company.")
+    parser.add_argument("--workers", type=int, default=3, help="Worker processes for the 'workers' mode.")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--chromedriver", default=CHROMEDRIVER_PATH)
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file.")
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging_from_args(args)
+    graph = FixtureGraph(roots=args.roots, depth=args.depth, fanout=args.fanout, cross_link_ratio=args.cross_link_ratio)
+    server = FixtureServer(graph, latency_ms=args.latency_ms, render_delay_ms=args.render_delay_ms, page_size=args.page_size).start()
+    logger.info(f"Fixture server with {len(graph.companies)} profiles running at {server.base_url}")
+
+    # Error screenshots and the worker database go to a scratch directory, not the repo
+    workdir = tempfile.mkdtemp(prefix="pbtree_benchmark_")
+    original_cwd = os.getcwd()
+    output_path = os.path.abspath(args.output) if args.output else None
+    scraper = None
+    reports = []
+    try:
+        os.chdir(workdir)
+        scraper = WebScraper(headless=args.headless, profile_dir=os.path.join(workdir, "chrome_profile"), chromedriver_path=args.chromedriver)
+        scraper.base_url = server.base_url
+        scraper.profile_base_url = server.base_url
+        instrumentation = CrawlInstrumentation(scraper)
+
+        baseline_trees = None
+        for mode in args.modes:
+            logger.progress(f"\n=== Benchmarking crawl mode '{mode}' ===")
+            report, trees = run_mode(mode, scraper, instrumentation, server, args, workdir, baseline_trees)
+            if mode == "full":
+                baseline_trees = trees
+            reports.append(report)
+    finally:
+        if scraper:
+            scraper.close()
+        server.stop()
+        os.chdir(original_cwd)
+
+    # The report is printed directly; let queued crawl logs go out first so they don't interleave
+    flush_logging()
+    print_report(reports)
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump({"fixture": vars(args), "results": reports}, f, indent=2)
+        logger.info(f"Results saved to {output_path}")
+    return reports
+
+
+if __name__ == "__main__":
+    main()
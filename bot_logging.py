@@ -0,0 +1,216 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import threading
+import time
+
+COLOR_BLUE = "\033[96m"
+COLOR_GREEN = "\033[92m"
+COLOR_YELLOW = "\033[93m"
+COLOR_ORANGE = "\033[33m"
+COLOR_RED = "\033[91m"
+COLOR_RESET = "\033[0m"
+
+# Between INFO and WARNING: run milestones (section headers, per-root and per-row results).
+# Quiet mode shows these plus warnings and errors.
+PROGRESS = 25
+logging.addLevelName(PROGRESS, "PROGRESS")
+
+LOG_ROOT = "hl"
+
+LEVEL_COLORS = {
+    logging.DEBUG: COLOR_YELLOW,
+    logging.INFO: COLOR_BLUE,
+    PROGRESS: COLOR_BLUE,
+    logging.WARNING: COLOR_ORANGE,
+    logging.ERROR: COLOR_RED,
+    logging.CRITICAL: COLOR_RED,
+}
+
+ANSI_ESCAPE_PATTERN = re.compile(r'\033\[[0-9;]*m')
+
+_listener = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class BotLogger(logging.LoggerAdapter):
+    """
+    Logger used by the bots in place of colored print calls.
+
+    Adds progress() and milestone() at the PROGRESS level (shown in quiet mode), success() for
+    green INFO lines, and accepts a color= keyword on any call to override the console color for
+    that line (e.g. the yellow 'skipping' notices).
+    """
+
+    def __init__(self, logger, info_color=None):
+        super().__init__(logger, {})
+        self.info_color = info_color
+
+    def log(self, level, msg, *args, **kwargs):
+        _ensure_configured()
+        if self.info_color and level in (logging.INFO, PROGRESS):
+            kwargs.setdefault("color", self.info_color)
+        super().log(level, msg, *args, **kwargs)
+
+    def process(self, msg, kwargs):
+        color = kwargs.pop("color", None)
+        if color:
+            kwargs["extra"] = {**kwargs.get("extra", {}), "color": color}
+        return msg, kwargs
+
+    def progress(self, msg, *args, **kwargs):
+        self.log(PROGRESS, msg, *args, **kwargs)
+
+    def milestone(self, msg, *args, **kwargs):
+        """A completed step worth seeing even in quiet mode, shown in green."""
+        kwargs.setdefault("color", COLOR_GREEN)
+        self.log(PROGRESS, msg, *args, **kwargs)
+
+    def success(self, msg, *args, **kwargs):
+        kwargs.setdefault("color", COLOR_GREEN)
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+
+def get_logger(name, info_color=None):
+    """
+    Returns the BotLogger for a module, e.g. get_logger("pbtree").
+    info_color keeps a module's own shade for info and progress lines.
+    """
+    return BotLogger(logging.getLogger(f"{LOG_ROOT}.{name}"), info_color)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Renders records the way the old print calls did: the bare message in its level's color."""
+
+    def __init__(self, use_color=True):
+        super().__init__()
+        self.use_color = use_color
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+        if not self.use_color:
+            return ANSI_ESCAPE_PATTERN.sub("", message)
+        color = getattr(record, "color", None) or LEVEL_COLORS.get(record.levelno, "")
+        # Keep leading blank lines outside the color codes, as the prints did
+        stripped = message.lstrip("\n")
+        return f"{message[:len(message) - len(stripped)]}{color}{stripped}{COLOR_RESET}"
+
+
+class JSONLFormatter(logging.Formatter):
+    """One JSON object per record, with ANSI codes and layout newlines removed, for machine analysis."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": ANSI_ESCAPE_PATTERN.sub("", record.getMessage()).strip("\n"),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def configure_logging(quiet=False, verbose=False, jsonl_path=None, use_color=True):
+    """
+    Routes all bot loggers through a queue so the calling thread never waits on console or
+    file I/O. A background listener writes to the console and, optionally, a JSONL file.
+
+    Args:
+        quiet (bool): Console shows only progress, warnings and errors.
+        verbose (bool): Also show debug records.
+        jsonl_path (str, optional): Append every record (at the configured level) to this JSONL file.
+        use_color (bool): Keep the ANSI colors on the console.
+    """
+    global _listener, _configured
+    shutdown_logging()
+    _configured = True
+
+    console_level = PROGRESS if quiet else (logging.DEBUG if verbose else logging.INFO)
+    file_level = logging.DEBUG if verbose else logging.INFO
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(ConsoleFormatter(use_color=use_color))
+    handlers = [console_handler]
+
+    if jsonl_path:
+        file_handler = logging.FileHandler(jsonl_path, mode="a", encoding="utf-8")
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(JSONLFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger(LOG_ROOT)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_RecordQueueHandler(log_queue))
+    # Records below every handler's level are dropped at the call site, before they are queued
+    root.setLevel(min(handler.level for handler in handlers))
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _ensure_configured():
+    """Console defaults for modules used without a bot's command line; configured on first use, not at import."""
+    if _configured:
+        return
+    with _configure_lock:
+        if not _configured:
+            configure_logging()
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def flush_logging():
+    """Waits until every queued record is written, e.g. before printing a report to stdout."""
+    if _listener is not None:
+        # stop() drains the queue; the listener can be started again afterwards
+        _listener.stop()
+        _listener.start()
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Formatting happens on the listener thread; just make the record safe to hand over
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def add_logging_arguments(parser):
+    """Adds the shared --quiet/--verbose/--log-jsonl flags to a bot's argument parser."""
+    parser.add_argument("--quiet", action="store_true",
+                        help="Only log progress, warnings and errors to the console.")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Also log debug detail.")
+    parser.add_argument("--log-jsonl", default=None, metavar="PATH",
+                        help="Append structured log records to this JSONL file.")
+
+
+def configure_logging_from_args(args):
+    configure_logging(quiet=args.quiet, verbose=args.verbose, jsonl_path=args.log_jsonl)
+
+
+atexit.register(shutdown_logging)
@@ -3,9 +3,10 @@ from tkinter import ttk, messagebox
 import json
 import os
 import webbrowser
-import re
 import subprocess
 
+from pb_ids import node_pb_id
+
 try:
     from dotenv import set_key, load_dotenv
 except ImportError:
@@ -50,15 +51,8 @@ def clean_key(key):
     return display_key
 
 def extract_pitchbook_id(company_data):
-    """Extracts Pitchbook ID from profile URLs."""
-    url_fields = ["profile_url", "Name_link", "contact_profile_link"]
-    for field in url_fields:
-        url = company_data.get(field)
-        if url:
-            match = re.search(r'/profile/([^/]+)/', url)
-            if match:
-                return match.group(1)
-    return None
+    """Returns the company's Pitchbook ID, using the shared canonicalization in pb_ids."""
+    return node_pb_id(company_data)
 
 def open_link(url):
     """Opens a URL in the default web browser."""
@@ -257,7 +251,7 @@ class PitchbookViewerApp:
 
     def _display_company_details(self, parent_frame, company_data):
         excluded_keys = [
-            "profile_url", "depth", "status", "legal_name", "root_name", "Name", "Name_link", "Industry_link", 
+            "profile_url", "pb_id", "depth", "status", "legal_name", "root_name", "Name", "Name_link", "Industry_link", 
             "Location_link", "Year Founded_link", "contact_profile_link", "contact_email_link", 
             "Deal Date_link", "Deal Type_link", "Deal Size_link", "Co-Investors_link", 
             "Company Stage_link", "Lead Partner_link", "related_companies", "nested_related_companies", "website_link"
@@ -0,0 +1,117 @@
+import time
+
+# Reasons recorded on a partial tree when a budget stops the crawl
+BUDGET_NODE_CAP = "node_cap"
+BUDGET_WALL_CLOCK = "wall_clock"
+BUDGET_FANOUT = "fanout"
+
+# Lower values are descended into first when a node has more children than its fanout allows
+SOURCE_TYPE_PRIORITY = {
+    "Affiliate": 0,
+    "Investment (Buy-Side)": 1,
+}
+
+
+class CrawlBudget:
+    """
+    Limits how much of a tree one crawl may scrape: a node cap, a wall-clock budget and a
+    per-node fanout. A per-root budget can be chained to a global one with `parent`, so
+    every scraped node counts against both and whichever runs out first stops the crawl.
+    """
+
+    def __init__(self, max_nodes=None, max_seconds=None, max_fanout=None, parent=None):
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.max_fanout = max_fanout
+        self.parent = parent
+        self.nodes_used = 0
+        self.started_at = time.monotonic()
+        self.exhausted_reason = None # First reason this budget (or its parent) ran out, kept for reporting
+        self.truncation_reasons = set() # Every reason some part of the tree was left out
+
+    def elapsed_seconds(self):
+        return time.monotonic() - self.started_at
+
+    def check(self):
+        """Returns the reason the budget is exhausted, or None if there is room for another node."""
+        reason = None
+        if self.max_nodes is not None and self.nodes_used >= self.max_nodes:
+            reason = BUDGET_NODE_CAP
+        elif self.max_seconds is not None and self.elapsed_seconds() >= self.max_seconds:
+            reason = BUDGET_WALL_CLOCK
+        elif self.parent is not None:
+            reason = self.parent.check()
+        if reason:
+            if not self.exhausted_reason:
+                self.exhausted_reason = reason
+            self.truncation_reasons.add(reason)
+        return reason
+
+    def record_truncation(self, reason):
+        """Notes that part of the tree was skipped for a reason other than running out (e.g. fanout)."""
+        self.truncation_reasons.add(reason)
+
+    def is_partial(self):
+        """True if anything was left out of the tree because of this budget."""
+        return bool(self.truncation_reasons)
+
+    def consume_node(self):
+        """Counts one scraped profile against this budget and its parent."""
+        self.nodes_used += 1
+        if self.parent is not None:
+            self.parent.consume_node()
+
+    def fanout_limit(self):
+        """The tightest fanout limit across this budget and its parents, or None."""
+        limits = [budget.max_fanout for budget in self._chain() if budget.max_fanout is not None]
+        return min(limits) if limits else None
+
+    def _chain(self):
+        budget = self
+        while budget is not None:
+            yield budget
+            budget = budget.parent
+
+    def summary(self):
+        return {
+            "truncation_reasons": sorted(self.truncation_reasons),
+            "nodes_scraped": self.nodes_used,
+            "elapsed_seconds": round(self.elapsed_seconds(), 1),
+            "max_nodes": self.max_nodes,
+            "max_seconds": self.max_seconds,
+            "max_fanout": self.max_fanout,
+        }
+
+
+def _year_founded(entry):
+    try:
+        return int(str(entry.get("Year Founded") or "").strip()[:4])
+    except ValueError:
+        return None
+
+
+def child_priority_key(entry):
+    """
+    Deterministic order for descending into related companies: direct affiliates before
+    investments, then by year founded (oldest first, unknown last), then by name.
+    """
+    year = _year_founded(entry)
+    return (
+        SOURCE_TYPE_PRIORITY.get(entry.get("Source_Type"), len(SOURCE_TYPE_PRIORITY)),
+        year is None,
+        year or 0,
+        (entry.get("Name") or "").lower(),
+    )
+
+
+def prioritize_children(entries, max_fanout=None):
+    """
+    Orders related companies by child_priority_key and splits them at the fanout limit.
+
+    Returns:
+        tuple: (entries_to_descend, entries_over_fanout), both in priority order.
+    """
+    ordered = sorted(entries, key=child_priority_key)
+    if max_fanout is None:
+        return ordered, []
+    return ordered[:max_fanout], ordered[max_fanout:]
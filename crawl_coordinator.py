@@ -0,0 +1,317 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+from pb_ids import extract_pb_id, canonical_profile_url
+from bot_logging import get_logger
+
+logger = get_logger("crawl_coordinator")
+
+STATE_PENDING = "pending"
+STATE_LEASED = "leased"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS roots (
+    pb_id TEXT PRIMARY KEY,
+    root_name TEXT,
+    position INTEGER
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    pb_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    root_pb_id TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frontier_claim_idx ON frontier (state, depth, enqueued_at);
+CREATE TABLE IF NOT EXISTS results (
+    pb_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    worker_id TEXT,
+    completed_at REAL NOT NULL
+);
+"""
+
+
+class CrawlCoordinator:
+    """
+    Shared crawl state for running several PBTree worker processes against one set of roots.
+
+    The frontier, visited set (every PB ID ever enqueued), per-URL leases and scraped results
+    all live in one SQLite database in WAL mode. Workers claim a URL under a lease, scrape it
+    and commit the result together with its children in one transaction. If a worker dies,
+    its lease expires and the URL is handed to the next worker that asks.
+
+    Note: SQLite WAL needs shared memory between processes, so the database should live on a
+    local disk. A network share works for a single machine's workers only if the share
+    supports proper file locking.
+    """
+
+    def __init__(self, db_path, lease_seconds=600, max_attempts=3, worker_id=None):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front so two workers can't claim the same row
+        return _ImmediateTransaction(self.conn)
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def seed_roots(self, companies, max_depth):
+        """
+        Adds the selected root companies to the frontier. Safe to call from every worker:
+        roots that are already known are left untouched.
+
+        Args:
+            companies (list): Entries from selected_for_scraping.json ('root_company_name', 'pitchbook_id').
+            max_depth (int): Maximum depth below each root, stored for all workers.
+
+        Returns:
+            int: Number of roots newly added.
+        """
+        added = 0
+        now = time.time()
+        with self._transaction():
+            if self.get_meta("max_depth") is None:
+                self.set_meta("max_depth", max_depth)
+            for position, company_info in enumerate(companies):
+                pb_id = extract_pb_id(company_info.get("pitchbook_id"))
+                if not pb_id:
+                    logger.warning(f"Skipping '{company_info.get('root_company_name')}' due to missing or null PitchBook ID.")
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO roots (pb_id, root_name, position) VALUES (?, ?, ?)",
+                    (pb_id, company_info.get("root_company_name"), position),
+                )
+                added += cursor.rowcount
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO frontier (pb_id, url, depth, root_pb_id, state, enqueued_at) VALUES (?, ?, 0, ?, ?, ?)",
+                    (pb_id, canonical_profile_url(pb_id), pb_id, STATE_PENDING, now),
+                )
+        return added
+
+    def roots(self):
+        """Returns the seeded roots as [{"root_company_name", "pitchbook_id"}], in selection order."""
+        rows = self.conn.execute("SELECT pb_id, root_name FROM roots ORDER BY position").fetchall()
+        return [{"root_company_name": row["root_name"], "pitchbook_id": row["pb_id"]} for row in rows]
+
+    @property
+    def max_depth(self):
+        return self.get_meta("max_depth", 5)
+
+    def claim(self):
+        """
+        Leases the next URL to scrape: pending URLs first, then URLs whose lease has expired.
+        Shallower URLs are handed out first so roots fill in breadth-first. An expired URL that
+        already used up max_attempts (its workers keep dying on it) is marked failed instead.
+
+        Returns:
+            dict or None: {"pb_id", "url", "depth", "root_pb_id"} or None if nothing is claimable right now.
+        """
+        now = time.time()
+        with self._transaction():
+            while True:
+                row = self.conn.execute(
+                    """
+                    SELECT pb_id, url, depth, root_pb_id, state, lease_owner, attempts FROM frontier
+                    WHERE state = ? OR (state = ? AND lease_expires < ?)
+                    ORDER BY depth, enqueued_at
+                    LIMIT 1
+                    """,
+                    (STATE_PENDING, STATE_LEASED, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["state"] != STATE_LEASED:
+                    break
+                if row["attempts"] < self.max_attempts:
+                    logger.warning(f"Lease on {row['pb_id']} held by {row['lease_owner']} expired. Re-claiming.")
+                    break
+                logger.error(f"Lease on {row['pb_id']} held by {row['lease_owner']} expired after {row['attempts']} attempts. Marking it failed.")
+                self.conn.execute(
+                    "UPDATE frontier SET state = ?, lease_owner = NULL, lease_expires = NULL, last_error = ? WHERE pb_id = ?",
+                    (STATE_FAILED, f"Lease expired after {row['attempts']} attempts", row["pb_id"]),
+                )
+            self.conn.execute(
+                "UPDATE frontier SET state = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE pb_id = ?",
+                (STATE_LEASED, self.worker_id, now + self.lease_seconds, row["pb_id"]),
+            )
+        return {"pb_id": row["pb_id"], "url": row["url"], "depth": row["depth"], "root_pb_id": row["root_pb_id"]}
+
+    def renew_lease(self, pb_id):
+        """Extends this worker's lease on a URL it is still scraping. Called as each page or table of the profile is scraped."""
+        self.conn.execute(
+            "UPDATE frontier SET lease_expires = ? WHERE pb_id = ? AND state = ? AND lease_owner = ?",
+            (time.time() + self.lease_seconds, pb_id, STATE_LEASED, self.worker_id),
+        )
+
+    def complete(self, claim, profile_data):
+        """
+        Stores a scraped profile and enqueues its related companies in one transaction.
+        Children already in the frontier (claimed, done or pending) are not enqueued again,
+        which is what makes the frontier table the shared visited set.
+
+        The result is only stored while this worker still holds the lease. If the lease expired
+        and another worker re-claimed the URL, that worker's result wins and this one is dropped.
+
+        Returns:
+            int or None: Number of new URLs added to the frontier, or None if the lease was lost.
+        """
+        now = time.time()
+        enqueued = 0
+        child_depth = claim["depth"] + 1
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE frontier SET state = ?, lease_owner = NULL, lease_expires = NULL, last_error = NULL WHERE pb_id = ? AND state = ? AND lease_owner = ?",
+                (STATE_DONE, claim["pb_id"], STATE_LEASED, self.worker_id),
+            )
+            if cursor.rowcount == 0:
+                logger.warning(f"[{self.worker_id}] Lost the lease on {claim['pb_id']} before completing it. Dropping this result.")
+                return None
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (pb_id, data, worker_id, completed_at) VALUES (?, ?, ?, ?)",
+                (claim["pb_id"], json.dumps(profile_data, ensure_ascii=False), self.worker_id, now),
+            )
+            # A redirect means the surviving profile was scraped too; don't let anyone scrape it
+            # again, including a copy of it that is already waiting in the frontier
+            final_pb_id = profile_data.get("pb_id")
+            if final_pb_id and final_pb_id != claim["pb_id"]:
+                self.conn.execute(
+                    """
+                    INSERT INTO frontier (pb_id, url, depth, root_pb_id, state, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (pb_id) DO UPDATE SET state = excluded.state WHERE frontier.state = ?
+                    """,
+                    (final_pb_id, canonical_profile_url(final_pb_id), claim["depth"], claim["root_pb_id"], STATE_DONE, now, STATE_PENDING),
+                )
+                # Entries that link to the surviving PB ID directly must still find the profile
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO results (pb_id, data, worker_id, completed_at) VALUES (?, ?, ?, ?)",
+                    (final_pb_id, json.dumps(profile_data, ensure_ascii=False), self.worker_id, now),
+                )
+            if child_depth <= self.max_depth and profile_data.get("status") == "scraped":
+                for entry in profile_data.get("related_companies") or []:
+                    child_pb_id = entry.get("pb_id") or extract_pb_id(entry.get("Name_link"))
+                    if not child_pb_id:
+                        continue
+                    cursor = self.conn.execute(
+                        "INSERT OR IGNORE INTO frontier (pb_id, url, depth, root_pb_id, state, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (child_pb_id, canonical_profile_url(entry.get("Name_link") or child_pb_id), child_depth, claim["root_pb_id"], STATE_PENDING, now),
+                    )
+                    enqueued += cursor.rowcount
+        return enqueued
+
+    def fail(self, claim, error):
+        """Releases a URL after a scrape error; it is retried until max_attempts is reached."""
+        with self._transaction():
+            row = self.conn.execute("SELECT attempts FROM frontier WHERE pb_id = ?", (claim["pb_id"],)).fetchone()
+            attempts = row["attempts"] if row else self.max_attempts
+            new_state = STATE_FAILED if attempts >= self.max_attempts else STATE_PENDING
+            self.conn.execute(
+                "UPDATE frontier SET state = ?, lease_owner = NULL, lease_expires = NULL, last_error = ? WHERE pb_id = ?",
+                (new_state, str(error)[:1000], claim["pb_id"]),
+            )
+        return new_state
+
+    def counts(self):
+        """Returns {state: count} for the frontier."""
+        rows = self.conn.execute("SELECT state, COUNT(*) AS n FROM frontier GROUP BY state").fetchall()
+        return {row["state"]: row["n"] for row in rows}
+
+    def is_finished(self):
+        """True once nothing is pending and no worker holds a lease."""
+        row = self.conn.execute(
+            "SELECT COUNT(*) AS n FROM frontier WHERE state IN (?, ?)", (STATE_PENDING, STATE_LEASED)
+        ).fetchone()
+        return row["n"] == 0
+
+    def assemble(self, merge_child_details):
+        """
+        Rebuilds one nested tree per root from the stored results, in the same shape the
+        recursive crawler produces. Each company's subtree is attached at its first
+        occurrence (depth first, in table order), later occurrences only get its details.
+
+        Args:
+            merge_child_details (callable): (related_company_entry, child_profile_or_None) -> None,
+                                            copies a child's scalar details onto its entry.
+
+        Yields:
+            dict: One assembled root tree at a time, so callers can stream them to disk.
+        """
+        max_depth = self.max_depth
+        roots = self.conn.execute("SELECT pb_id, root_name FROM roots ORDER BY position").fetchall()
+        attached = set()
+
+        def load_result(pb_id):
+            row = self.conn.execute("SELECT data FROM results WHERE pb_id = ?", (pb_id,)).fetchone()
+            return json.loads(row["data"]) if row else None
+
+        for root in roots:
+            root_data = load_result(root["pb_id"])
+            if root_data is None:
+                logger.warning(f"No result stored for root '{root['root_name']}' ({root['pb_id']}). Skipping.")
+                continue
+            attached.add(root["pb_id"])
+            self._attach_children(root_data, 0, max_depth, load_result, merge_child_details, attached)
+            root_data["root_name"] = root["root_name"]
+            yield root_data
+
+    def _attach_children(self, node, depth, max_depth, load_result, merge_child_details, attached):
+        # Recursion depth is bounded by max_depth, same as the recursive crawler
+        for entry in node.get("related_companies") or []:
+            child_pb_id = entry.get("pb_id") or extract_pb_id(entry.get("Name_link"))
+            child_data = load_result(child_pb_id) if child_pb_id and depth < max_depth else None
+            merge_child_details(entry, child_data)
+            if child_data is None or child_pb_id in attached:
+                entry["nested_related_companies"] = []
+                continue
+            attached.add(child_pb_id)
+            self._attach_children(child_data, depth + 1, max_depth, load_result, merge_child_details, attached)
+            entry["nested_related_companies"] = child_data.get("related_companies", [])
+
+
+class _ImmediateTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
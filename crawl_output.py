@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+
+from bot_logging import get_logger
+
+logger = get_logger("crawl_output")
+
+# Fixed CSV schema for flattened PBTree output. Declared up front so rows can be written as
+# soon as a root finishes instead of collecting every key from every row first.
+CSV_FIELDNAMES = [
+    "root_name", "Type", "Source_Type", "Name", "profile_url", "pb_id", "legal_name", "also_known_as",
+    "website_link", "source_company_name", "source_profile_url",
+    "former_names", "Name_link",
+    "Industry", "Industry_link", "Location", "Location_link", "Year Founded", "Year Founded_link",
+    "Deal Date", "Deal Date_link", "Deal Type", "Deal Type_link", "Deal Size", "Deal Size_link",
+    "Co-Investors", "Co-Investors_link", "Company Stage", "Company Stage_link",
+    "Lead Partner", "Lead Partner_link",
+    "contact_name", "contact_profile_link", "contact_title", "contact_email", "contact_email_link",
+    "contact_business_phone", "contact_mobile_phone",
+    "office_address_line1", "office_address_line2", "office_address_line3", "office_email", "office_phone",
+    "change_status", "edge_status", "truncated",
+]
+
+# Tree keys that are structure, not columns
+CSV_EXCLUDED_KEYS = {"related_companies", "nested_related_companies", "status", "depth"}
+
+
+def flatten_company_tree(company_node, parent_name=None, parent_url=None):
+    """
+    Yields one flat row per company in a scraped tree, depth first, without building
+    the whole flattened list in memory.
+    """
+    node_data = {k: v for k, v in company_node.items() if k not in CSV_EXCLUDED_KEYS}
+
+    if parent_name:
+        node_data["source_company_name"] = parent_name
+    if parent_url:
+        node_data["source_profile_url"] = parent_url
+
+    yield node_data
+
+    for related_company in company_node.get("related_companies", []) or []:
+        yield from flatten_company_tree(related_company, node_data.get("Name"), node_data.get("profile_url"))
+
+    for nested_related_company in company_node.get("nested_related_companies", []) or []:
+        yield from flatten_company_tree(nested_related_company, node_data.get("Name"), node_data.get("profile_url"))
+
+
+class StreamingJSONArrayWriter:
+    """
+    Appends completed root trees to a JSON array file and flushes after each one.
+    The file is kept a valid JSON array after every write, so an interrupted run still
+    leaves every finished root readable by RetoolBot and the viewer.
+    """
+
+    _CLOSING = b"\n]\n"
+
+    def __init__(self, filename, indent=2):
+        self.filename = filename
+        self.indent = indent
+        self.count = 0
+        self._file = open(filename, "wb")
+        self._file.write(b"[" + self._CLOSING)
+        self._file.flush()
+
+    def write(self, item):
+        encoded = json.dumps(item, indent=self.indent, ensure_ascii=False).encode("utf-8")
+        # Overwrite the closing bracket, append the item, then close the array again
+        self._file.seek(-len(self._CLOSING), os.SEEK_END)
+        separator = b",\n" if self.count else b"\n"
+        self._file.write(separator + encoded + self._CLOSING)
+        self._file.truncate()
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self._file.close()
+            logger.info(f"Data saved to {self.filename} ({self.count} entries)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class StreamingJSONLWriter:
+    """Appends one JSON document per line and flushes after each write."""
+
+    def __init__(self, filename, append=False):
+        self.filename = filename
+        self.count = 0
+        self._file = open(filename, "a" if append else "w", encoding="utf-8")
+
+    def write(self, item):
+        self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self._file.close()
+            logger.info(f"Data saved to {self.filename} ({self.count} entries)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class StreamingCSVWriter:
+    """
+    Writes flattened company rows incrementally against the fixed CSV_FIELDNAMES schema.
+    Keys outside the schema are ignored, matching the previous extrasaction='ignore' behavior.
+    """
+
+    def __init__(self, filename, fieldnames=None):
+        self.filename = filename
+        self.fieldnames = list(fieldnames or CSV_FIELDNAMES)
+        self.row_count = 0
+        self._file = open(filename, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write_tree(self, company_tree):
+        """Flattens one root tree and writes its rows, then flushes."""
+        if not isinstance(company_tree, dict):
+            logger.warning("Warning: CSV writer received a non-dictionary tree. Skipping.")
+            return
+        for row in flatten_company_tree(company_tree):
+            self._writer.writerow(row)
+            self.row_count += 1
+        self._file.flush()
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self._file.close()
+            logger.info(f"Data saved to {self.filename} ({self.row_count} rows)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from pb_ids import extract_pb_id, extract_entity_type, canonical_profile_url
+from bot_logging import get_logger, add_logging_arguments, configure_logging_from_args, flush_logging
+
+logger = get_logger("crawl_replay")
+
+MANIFEST_FILENAME = "manifest.json"
+
+SCRIPT_TAG_PATTERN = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+HEAD_OPEN_PATTERN = re.compile(r'<head\b[^>]*>', re.IGNORECASE)
+
+# Blocks every request that is not to the replay server itself, so a replay never touches the network
+REPLAY_CSP = "<meta http-equiv=\"Content-Security-Policy\" content=\"default-src 'self' 'unsafe-inline' data:\">"
+
+REPLAY_SCRIPT = """
+const REPLAY_TABLE_PAGES = %(table_pages)s;
+const replayCurrentPage = {};
+
+function replayShowPage(sectionId, page) {
+    const pages = REPLAY_TABLE_PAGES[sectionId];
+    const section = document.getElementById(sectionId);
+    if (!pages || !pages[page] || !section) { return; }
+    section.outerHTML = pages[page];
+    replayCurrentPage[sectionId] = parseInt(page, 10);
+}
+
+document.addEventListener("click", function (event) {
+    const button = event.target.closest('nav[aria-label="Pagination"] button');
+    if (!button) { return; }
+    const sectionId = button.closest("section").id;
+    const current = replayCurrentPage[sectionId] || 1;
+    const label = button.getAttribute("aria-label");
+    let target = current;
+    if (label === "Go to next page") {
+        target = current + 1;
+    } else if (label === "Go to previous page") {
+        target = current - 1;
+    } else {
+        const caption = button.querySelector("span.button__caption");
+        target = caption ? parseInt(caption.textContent, 10) : current;
+    }
+    replayShowPage(sectionId, String(target));
+});
+
+// The profile was captured as soon as it was ready, possibly before its tables rendered
+Object.keys(REPLAY_TABLE_PAGES).forEach(function (sectionId) { replayShowPage(sectionId, "1"); });
+"""
+
+
+def _section_id(main_section_selector):
+    # "section#affiliates" -> "affiliates"
+    return main_section_selector.split("#", 1)[-1]
+
+
+class ReplayRecorder:
+    """
+    Snapshots every page state the crawler scrapes into a replay archive: the profile HTML once
+    the profile is ready, and the outer HTML of each table section after every pagination step.
+
+    Archive layout:
+        manifest.json                 roots and, per PB ID, its URL and recorded files
+        <pb_id>/profile.html
+        <pb_id>/<section>_page_<n>.html
+    """
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        os.makedirs(archive_dir, exist_ok=True)
+        self.manifest_path = os.path.join(archive_dir, MANIFEST_FILENAME)
+        self.manifest = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "roots": [], "profiles": {}}
+        if os.path.exists(self.manifest_path):
+            # Recording into an existing archive extends it
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.current_pb_id = None
+        logger.info(f"Recording replay archive to {archive_dir}")
+
+    def _write_file(self, pb_id, filename, content):
+        profile_dir = os.path.join(self.archive_dir, pb_id)
+        os.makedirs(profile_dir, exist_ok=True)
+        with open(os.path.join(profile_dir, filename), "w", encoding="utf-8") as f:
+            f.write(content)
+        return f"{pb_id}/{filename}"
+
+    def _save_manifest(self):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def record_root(self, root_name, pb_id):
+        if not any(root["pitchbook_id"] == pb_id for root in self.manifest["roots"]):
+            self.manifest["roots"].append({"root_company_name": root_name, "pitchbook_id": pb_id})
+            self._save_manifest()
+
+    def record_profile(self, profile_url, page_source):
+        """Stores the ready profile page; later table pages are attached to this profile."""
+        pb_id = extract_pb_id(profile_url)
+        if not pb_id:
+            self.current_pb_id = None
+            return
+        self.current_pb_id = pb_id
+        entry = self.manifest["profiles"].setdefault(pb_id, {"tables": {}})
+        entry["url"] = profile_url
+        entry["entity_type"] = extract_entity_type(profile_url)
+        entry["profile_file"] = self._write_file(pb_id, "profile.html", page_source)
+        self._save_manifest()
+
+    def record_table_page(self, main_section_selector, page_num, section_html):
+        if not self.current_pb_id:
+            return
+        section_id = _section_id(main_section_selector)
+        filename = self._write_file(self.current_pb_id, f"{section_id}_page_{page_num}.html", section_html)
+        tables = self.manifest["profiles"][self.current_pb_id].setdefault("tables", {})
+        tables.setdefault(section_id, {})[str(page_num)] = filename
+        self._save_manifest()
+
+
+class ReplayArchive:
+    """Read side of a replay archive: builds the HTML the replay server returns for a profile."""
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        with open(os.path.join(archive_dir, MANIFEST_FILENAME), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.profiles = self.manifest.get("profiles", {})
+        self._page_cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def roots(self):
+        return self.manifest.get("roots", [])
+
+    def _read(self, relative_path):
+        with open(os.path.join(self.archive_dir, relative_path), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def render_profile(self, pb_id):
+        """
+        Returns the recorded profile with its original scripts removed and the replay script
+        injected, or None if the profile was never recorded. Rendered pages are cached so
+        repeated visits cost nothing.
+        """
+        with self._lock:
+            if pb_id in self._page_cache:
+                return self._page_cache[pb_id]
+        entry = self.profiles.get(pb_id)
+        if not entry or not entry.get("profile_file"):
+            return None
+
+        page = SCRIPT_TAG_PATTERN.sub("", self._read(entry["profile_file"]))
+        table_pages = {
+            section_id: {page_num: self._read(path) for page_num, path in pages.items()}
+            for section_id, pages in (entry.get("tables") or {}).items()
+        }
+        script = "<script>" + REPLAY_SCRIPT % {"table_pages": json.dumps(table_pages).replace("</", "<\\/")} + "</script>"
+        if HEAD_OPEN_PATTERN.search(page):
+            page = HEAD_OPEN_PATTERN.sub(lambda match: match.group(0) + REPLAY_CSP, page, count=1)
+        else:
+            page = REPLAY_CSP + page
+        if "</body>" in page:
+            page = page.replace("</body>", script + "</body>", 1)
+        else:
+            page += script
+
+        with self._lock:
+            self._page_cache[pb_id] = page
+        return page
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].split("#", 1)[0]
+        pb_id = extract_pb_id(path)
+        body = self.server.archive.render_profile(pb_id) if pb_id else None
+        if body is None:
+            self.send_error(404, "Profile not in replay archive")
+            return
+        encoded = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serves a replay archive on localhost so the unmodified crawler can run against it."""
+
+    daemon_threads = True
+
+    def __init__(self, archive, host="127.0.0.1", port=0):
+        super().__init__((host, port), ReplayRequestHandler)
+        self.archive = archive
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def replay_crawl(archive_dir, max_depth=5, headless=True, chromedriver_path=None, output=None):
+    """
+    Re-runs scrape_profile_and_affiliates for every recorded root against the archive and
+    reports the same throughput numbers as the fixture benchmark.
+    """
+    # Imported here so the recorder can be used from the crawler without a circular import
+    from pb_tree_crawler import WebScraper, CHROMEDRIVER_PATH
+    from benchmark_crawler import CrawlInstrumentation, print_report
+
+    archive = ReplayArchive(archive_dir)
+    if not archive.roots:
+        logger.error(f"Replay archive {archive_dir} has no recorded roots.")
+        return None
+    server = ReplayServer(archive).start()
+    logger.info(f"Replaying {len(archive.profiles)} recorded profiles from {archive_dir} at {server.base_url}")
+
+    workdir = tempfile.mkdtemp(prefix="pbtree_replay_")
+    original_cwd = os.getcwd()
+    output_path = os.path.abspath(output) if output else None
+    scraper = None
+    trees = []
+    try:
+        os.chdir(workdir)
+        scraper = WebScraper(headless=headless, profile_dir=os.path.join(workdir, "chrome_profile"),
+                             chromedriver_path=chromedriver_path or CHROMEDRIVER_PATH)
+        scraper.base_url = server.base_url
+        scraper.profile_base_url = server.base_url
+        instrumentation = CrawlInstrumentation(scraper)
+        started = time.perf_counter()
+        for root in archive.roots:
+            root_url = canonical_profile_url(root["pitchbook_id"], server.base_url)
+            tree = scraper.scrape_profile_and_affiliates(root_url, max_depth=max_depth)
+            if tree:
+                tree["root_name"] = root["root_company_name"]
+                trees.append(tree)
+        report = instrumentation.report("replay", time.perf_counter() - started, None)
+    finally:
+        if scraper:
+            scraper.close()
+        server.stop()
+        os.chdir(original_cwd)
+
+    flush_logging()
+    print_report([report])
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(trees, f, indent=2, ensure_ascii=False)
+        logger.info(f"Replayed trees saved to {output_path}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded PBTree crawl offline.")
+    parser.add_argument("archive", help="Replay archive directory written by pb_tree_crawler.py --record-replay.")
+    parser.add_argument("--max-depth", type=int, default=5)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--chromedriver", default=None)
+    parser.add_argument("--output", default=None, help="Write the replayed trees to this JSON file for comparison with the recording run.")
+    add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging_from_args(args)
+    replay_crawl(args.archive, args.max_depth, args.headless, args.chromedriver, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import hashlib
+import json
+
+from pb_ids import node_pb_id
+from bot_logging import get_logger
+
+logger = get_logger("crawl_snapshot")
+
+# Per-node change markers written by an incremental crawl
+CHANGE_STATUS_NEW = "new"             # Profile was not in the previous snapshot
+CHANGE_STATUS_CHANGED = "changed"     # Fingerprint differed, subtree was re-crawled
+CHANGE_STATUS_UNCHANGED = "unchanged" # Fingerprint matched, subtree reused from the snapshot
+EDGE_STATUS_ADDED = "added"           # Related company that was not under this parent last time
+
+INCREMENTAL_FIELDS = ["table_fingerprint", "change_status", "added_edges", "removed_edges"]
+
+
+def node_children(node):
+    """Returns a node's related companies whether it is a root or a nested entry."""
+    if not isinstance(node, dict):
+        return []
+    children = node.get("related_companies")
+    if not children:
+        children = node.get("nested_related_companies")
+    return children if isinstance(children, list) else []
+
+
+def edge_key(node):
+    """Identifies a related company for edge diffs: PB ID, falling back to its displayed name."""
+    return node_pb_id(node) or (node.get("Name") or node.get("legal_name") or "").strip().lower() or None
+
+
+def compute_table_fingerprint(sections):
+    """
+    Builds a cheap fingerprint of a profile's related-company tables from their first page.
+
+    Args:
+        sections (dict): {section_name: (first_page_rows, page_count)} for affiliates and investments.
+
+    Returns:
+        dict: {section_name: {"page_count", "first_page_rows", "first_page_hash"}}
+    """
+    fingerprint = {}
+    for section_name in sorted(sections):
+        rows, page_count = sections[section_name]
+        rows = rows or []
+        digest = hashlib.sha1(json.dumps(rows, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        fingerprint[section_name] = {
+            "page_count": page_count,
+            "first_page_rows": len(rows),
+            "first_page_hash": digest,
+        }
+    return fingerprint
+
+
+def diff_edges(previous_children, current_children):
+    """
+    Compares the related companies under a parent between two crawls.
+
+    Returns:
+        tuple: (added, removed) lists of {"pb_id", "Name"} for edges that appeared or disappeared.
+    """
+    previous_by_key = {edge_key(child): child for child in previous_children or [] if isinstance(child, dict)}
+    current_by_key = {edge_key(child): child for child in current_children or [] if isinstance(child, dict)}
+    previous_by_key.pop(None, None)
+    current_by_key.pop(None, None)
+
+    def describe(child):
+        return {"pb_id": node_pb_id(child), "Name": child.get("Name") or child.get("legal_name")}
+
+    added = [describe(current_by_key[key]) for key in current_by_key if key not in previous_by_key]
+    removed = [describe(previous_by_key[key]) for key in previous_by_key if key not in current_by_key]
+    return added, removed
+
+
+def collect_subtree_pb_ids(children):
+    """Yields the PB IDs of every company in a list of related companies and their descendants."""
+    stack = list(children or [])
+    while stack:
+        child = stack.pop()
+        if not isinstance(child, dict):
+            continue
+        pb_id = node_pb_id(child)
+        if pb_id:
+            yield pb_id
+        stack.extend(node_children(child))
+
+
+def reset_change_markers(children):
+    """
+    Clears the previous run's change markers from a reused subtree, so only this run's
+    changes are flagged. Reused nodes are marked unchanged; fingerprints are kept.
+    """
+    stack = list(children or [])
+    while stack:
+        child = stack.pop()
+        if not isinstance(child, dict):
+            continue
+        for field in ("edge_status", "added_edges", "removed_edges"):
+            child.pop(field, None)
+        if "change_status" in child:
+            child["change_status"] = CHANGE_STATUS_UNCHANGED
+        stack.extend(node_children(child))
+
+
+class CrawlSnapshot:
+    """
+    Index over a previous multi_company_pitchbook_data.json, keyed by PB ID, used by the
+    incremental crawl to decide which subtrees can be reused instead of re-crawled.
+    """
+
+    def __init__(self, roots):
+        self.roots = roots if isinstance(roots, list) else []
+        self._nodes = {}
+        for root in self.roots:
+            self._index(root)
+
+    @classmethod
+    def load(cls, filename):
+        """Loads a snapshot from a PBTree JSON file. Returns an empty snapshot if unavailable."""
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            snapshot = cls(data)
+            logger.info(f"Loaded previous snapshot '{filename}' with {len(snapshot)} indexed profiles.")
+            return snapshot
+        except FileNotFoundError:
+            logger.warning(f"Previous snapshot '{filename}' not found. Incremental crawl will scrape everything.")
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding previous snapshot '{filename}': {e}. Incremental crawl will scrape everything.")
+        return cls([])
+
+    def _rank(self, node):
+        # Prefer fully scraped occurrences over 'already visited' stubs of the same company
+        return (1 if node.get("table_fingerprint") else 0, 1 if node_children(node) else 0)
+
+    def _index(self, root):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            pb_id = node_pb_id(node)
+            if pb_id:
+                existing = self._nodes.get(pb_id)
+                if existing is None or self._rank(node) > self._rank(existing):
+                    self._nodes[pb_id] = node
+            stack.extend(node_children(node))
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, pb_id):
+        return pb_id in self._nodes
+
+    def get(self, pb_id):
+        return self._nodes.get(pb_id)
+
+    def children_of(self, pb_id):
+        return node_children(self._nodes.get(pb_id))
+
+    def fingerprint_of(self, pb_id):
+        node = self._nodes.get(pb_id)
+        return node.get("table_fingerprint") if node else None
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import queue
+from collections import OrderedDict, deque
+import threading
+import time
+
+from bot_logging import get_logger
+
+logger = get_logger("failure_artifacts")
+
+ARTIFACT_MODE_OFF = "off"               # Never capture anything
+ARTIFACT_MODE_DOM = "dom"               # One script round-trip: URL, title and a truncated DOM snippet
+ARTIFACT_MODE_SCREENSHOT = "screenshot" # DOM snippet plus a PNG, for when layout matters
+ARTIFACT_MODES = [ARTIFACT_MODE_OFF, ARTIFACT_MODE_DOM, ARTIFACT_MODE_SCREENSHOT]
+
+FAILURE_ARTIFACTS_DIR = "failure_artifacts"
+
+# Collects everything for a DOM artifact in a single WebDriver call
+DOM_SNIPPET_SCRIPT = """
+const selector = arguments[0];
+const maxChars = arguments[1];
+let element = null;
+if (selector) {
+    try { element = document.querySelector(selector); } catch (e) { element = null; }
+}
+const html = (element || document.body || document.documentElement).outerHTML || "";
+return {
+    url: window.location.href,
+    title: document.title,
+    selector_found: !!element,
+    html: html.length > maxChars ? html.slice(0, maxChars) : html,
+    truncated: html.length > maxChars
+};
+"""
+
+_STOP = object()
+
+
+class FailureArtifacts:
+    """
+    Throttled diagnostics for timeouts and exceptions.
+
+    Each capture is checked against a per-error-type budget (a maximum count and a minimum
+    interval) before the browser is touched at all. Captures that produce the same URL and
+    DOM as an earlier one of the same type are dropped. Files are written by a background
+    thread, and the output directory is kept under its disk quota by deleting the oldest
+    artifacts (from this or earlier runs) to make room for new ones.
+
+    Parallel workers writing to the same directory share one instance, so the quota and the
+    rate limits apply to the run as a whole; each worker captures from its own browser
+    through bind(driver).
+    """
+
+    def __init__(self, driver, output_dir=FAILURE_ARTIFACTS_DIR, mode=ARTIFACT_MODE_DOM, max_per_type=5,
+                 min_interval_seconds=30, max_total_bytes=50 * 1024 * 1024, dom_snippet_chars=20000,
+                 max_signatures=1000):
+        self.driver = driver
+        self.output_dir = output_dir
+        self.mode = mode if mode in ARTIFACT_MODES else ARTIFACT_MODE_DOM
+        self.max_per_type = max_per_type
+        self.min_interval_seconds = min_interval_seconds
+        self.max_total_bytes = max_total_bytes
+        self.dom_snippet_chars = dom_snippet_chars
+        self.max_signatures = max_signatures
+
+        self._captured_counts = {}   # {error_type: artifacts written or queued}
+        self._last_capture_at = {}   # {error_type: monotonic time of the last capture}
+        self._suppressed_counts = {} # {error_type: failures not captured because of rate limits or dedupe}
+        self._seen_signatures = OrderedDict() # Recently captured signatures, least recently seen first
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._used_bytes = 0
+        self._files = deque()  # (path, size) of the artifacts on disk, oldest first
+        self._evicted_count = 0
+
+        if self.mode != ARTIFACT_MODE_OFF:
+            os.makedirs(self.output_dir, exist_ok=True)
+            # The quota covers artifacts left over from earlier runs too; those are the first to go
+            existing = []
+            for entry in os.scandir(self.output_dir):
+                if entry.is_file():
+                    stat = entry.stat()
+                    existing.append((stat.st_mtime, entry.path, stat.st_size))
+            for _, path, size in sorted(existing):
+                self._files.append((path, size))
+                self._used_bytes += size
+            self._writer = threading.Thread(target=self._write_loop, name="failure-artifact-writer", daemon=True)
+            self._writer.start()
+
+    def _allow(self, error_type):
+        now = time.monotonic()
+        with self._lock:
+            count = self._captured_counts.get(error_type, 0)
+            last = self._last_capture_at.get(error_type)
+            if count >= self.max_per_type or (last is not None and now - last < self.min_interval_seconds):
+                self._suppressed_counts[error_type] = self._suppressed_counts.get(error_type, 0) + 1
+                return False
+            self._captured_counts[error_type] = count + 1
+            self._last_capture_at[error_type] = now
+            return True
+
+    def bind(self, driver):
+        """Returns a view of these artifacts that captures from the given browser."""
+        return BoundFailureArtifacts(self, driver)
+
+    def capture(self, error_type, selector=None, context=None, driver=None):
+        """
+        Records diagnostics for a failure if this error type still has budget.
+
+        Args:
+            error_type (str): Stable name for the failure, e.g. "error_table_load". Used for rate limits and filenames.
+            selector (str, optional): CSS selector of the region worth keeping; falls back to the whole body.
+            context (dict, optional): Extra JSON-serializable details stored with the artifact.
+            driver (WebDriver, optional): Browser to capture from; defaults to the one given at construction.
+
+        Returns:
+            str or None: Base path the artifact will be written to, or None if nothing was captured.
+        """
+        if self.mode == ARTIFACT_MODE_OFF or not self._allow(error_type):
+            return None
+
+        driver = driver or self.driver
+        try:
+            snapshot = driver.execute_script(DOM_SNIPPET_SCRIPT, selector, self.dom_snippet_chars) or {}
+        except Exception as e:
+            snapshot = {"error": f"{type(e).__name__}: {e}"}
+
+        signature = hashlib.sha1(
+            f"{error_type}|{snapshot.get('url')}|{snapshot.get('html')}".encode("utf-8", "replace")
+        ).hexdigest()
+        with self._lock:
+            if signature in self._seen_signatures:
+                # A duplicate doesn't use up the error type's budget
+                self._seen_signatures.move_to_end(signature)
+                self._captured_counts[error_type] -= 1
+                self._suppressed_counts[error_type] = self._suppressed_counts.get(error_type, 0) + 1
+                return None
+            self._seen_signatures[signature] = True
+            if len(self._seen_signatures) > self.max_signatures:
+                self._seen_signatures.popitem(last=False)
+            self._sequence += 1
+            sequence = self._sequence
+
+        screenshot_png = None
+        if self.mode == ARTIFACT_MODE_SCREENSHOT:
+            try:
+                screenshot_png = driver.get_screenshot_as_png()
+            except Exception as e:
+                snapshot["screenshot_error"] = f"{type(e).__name__}: {e}"
+
+        base_path = os.path.join(self.output_dir, f"{error_type}_{int(time.time())}_{sequence:03d}")
+        metadata = {
+            "error_type": error_type,
+            "captured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "selector": selector,
+            "context": context or {},
+            **{key: value for key, value in snapshot.items() if key != "html"},
+        }
+        document = f"<!-- {json.dumps(metadata, default=str)} -->\n{snapshot.get('html') or ''}"
+        self._queue.put((base_path + ".html", document.encode("utf-8", "replace")))
+        if screenshot_png:
+            self._queue.put((base_path + ".png", screenshot_png))
+        return base_path
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            path, payload = item
+            try:
+                if len(payload) > self.max_total_bytes:
+                    logger.warning(f"Failure artifact {path} is larger than the {self.max_total_bytes} byte quota. Discarded.")
+                    continue
+                self._evict_for(len(payload))
+                with open(path, "wb") as f:
+                    f.write(payload)
+                self._used_bytes += len(payload)
+                self._files.append((path, len(payload)))
+            except Exception as e:
+                logger.error(f"Could not write failure artifact {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _evict_for(self, incoming_bytes):
+        """Deletes the oldest artifacts until incoming_bytes fit under the quota."""
+        while self._files and self._used_bytes + incoming_bytes > self.max_total_bytes:
+            path, size = self._files.popleft()
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass # Already cleaned up by hand or by another process
+            except OSError as e:
+                logger.warning(f"Could not delete old failure artifact {path}: {e}")
+                continue
+            self._used_bytes -= size
+            self._evicted_count += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                "captured": dict(self._captured_counts),
+                "suppressed": dict(self._suppressed_counts),
+                "bytes_on_disk": self._used_bytes,
+                "evicted": self._evicted_count,
+            }
+
+    def close(self):
+        """Waits for pending writes and reports how many failures were throttled."""
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join(timeout=10)
+        self._writer = None
+        summary = self.summary()
+        suppressed = sum(summary["suppressed"].values())
+        if summary["captured"] or suppressed:
+            logger.info(f"Failure artifacts: {sum(summary['captured'].values())} captured, {suppressed} suppressed by rate limits or dedupe ({self.output_dir}).")
+        if summary["evicted"]:
+            logger.info(f"Deleted {summary['evicted']} old failure artifacts to stay under the {self.max_total_bytes} byte quota.")
+
+
+class BoundFailureArtifacts:
+    """
+    One worker's handle on a shared FailureArtifacts: captures from that worker's browser.
+    close() is left to whoever created the shared instance.
+    """
+
+    def __init__(self, artifacts, driver):
+        self.artifacts = artifacts
+        self.driver = driver
+
+    def capture(self, error_type, selector=None, context=None):
+        return self.artifacts.capture(error_type, selector=selector, context=context, driver=self.driver)
+
+    def summary(self):
+        return self.artifacts.summary()
+
+    def close(self):
+        pass
@@ -0,0 +1,111 @@
+from name_normalization import normalize_name, normalize_names
+from name_matching import NgramIndex, AUTO_ACCEPT_SCORE, MIN_SIGNIFICANT_TOKEN_LENGTH, identifier_tokens
+from bot_logging import get_logger
+
+logger = get_logger("name_index")
+
+
+class NameTokenIndex:
+    """
+    Inverted index from normalized name tokens to the companies whose name contains them.
+
+    Finds the same matches as calling are_names_similar(query, name) against every indexed name:
+    a company matches when its normalized name equals the normalized query, or when every
+    significant query token (length >= 3) is one of its name tokens. Instead of comparing every
+    pair, candidates come from intersecting the posting sets of the query's tokens, and each name
+    is only normalized once, when it is added.
+
+    Unlike are_names_similar, a fund number, roman numeral or year in the query must be the
+    company's too: "Alpha Capital Partners II" does not match "Alpha Capital Partners III", even
+    though "ii" is too short to count as a significant token.
+
+    Matches are ranked by token overlap (shared tokens over all tokens of both names), so the
+    company whose name is closest to the query comes first; ties keep insertion order.
+
+    Names are also kept in a character n-gram index, so best_match can fall back to a scored
+    match (see name_matching) for spelling variants that share no exact tokens with the query.
+    """
+
+    def __init__(self, normalizer=normalize_name):
+        self.normalizer = normalizer
+        self.items = []             # [(item, normalized name, token set, identifier tokens)] in insertion order
+        self.postings = {}          # {token: set of item positions}
+        self.exact = {}             # {normalized name: [item positions]}
+        self._positions_by_id = {}  # {id(item): position} so an item added under several keys is indexed once
+        self.ngrams = NgramIndex()
+
+    @classmethod
+    def from_company_map(cls, company_data_map):
+        """
+        Indexes the legal names of the distinct companies in a load_company_data_from_json map.
+        Records carry their normalized name from load time; any that don't are normalized as one batch.
+        """
+        index = cls()
+        companies = [company_data for company_data in company_data_map.values() if isinstance(company_data, dict) and company_data.get("legal_name")]
+        missing = [company_data for company_data in companies if company_data.get("normalized_name") is None]
+        for company_data, normalized in zip(missing, normalize_names([company_data["legal_name"] for company_data in missing])):
+            company_data["normalized_name"] = normalized
+        for company_data in companies:
+            index.add(company_data["legal_name"], company_data, normalized=company_data["normalized_name"])
+        logger.info(f"Indexed {len(index.items)} company names ({len(index.postings)} distinct tokens) for queue matching.")
+        return index
+
+    def add(self, name, item, normalized=None):
+        if id(item) in self._positions_by_id:
+            return
+        if normalized is None:
+            normalized = self.normalizer(name)
+        if not normalized:
+            return
+        position = len(self.items)
+        tokens = set(normalized.split())
+        self.items.append((item, normalized, tokens, identifier_tokens(tokens)))
+        self._positions_by_id[id(item)] = position
+        self.exact.setdefault(normalized, []).append(position)
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(position)
+        self.ngrams.add(name, item)
+
+    def matches(self, query_name):
+        """Returns the matching items for a name, best overlap first."""
+        normalized_query = self.normalizer(query_name)
+        if not normalized_query:
+            return []
+        query_tokens = set(normalized_query.split())
+        significant = [token for token in query_tokens if len(token) >= MIN_SIGNIFICANT_TOKEN_LENGTH]
+
+        positions = set(self.exact.get(normalized_query, ()))
+        if significant:
+            # Rarest token first keeps the running intersection small
+            postings = sorted((self.postings.get(token, set()) for token in significant), key=len)
+            if postings[0]:
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates &= posting
+                    if not candidates:
+                        break
+                positions |= candidates
+        query_identifiers = identifier_tokens(query_tokens)
+        if query_identifiers:
+            positions = {position for position in positions if self.items[position][3] == query_identifiers}
+
+        def overlap(position):
+            tokens = self.items[position][2]
+            return len(query_tokens & tokens) / len(query_tokens | tokens)
+
+        ranked = sorted(positions, key=lambda position: (-overlap(position), position))
+        return [self.items[position][0] for position in ranked]
+
+    def best_match(self, query_name, fuzzy=False):
+        """
+        Returns the best token match for a name, or None. With fuzzy=True, a name without token
+        matches falls back to the closest n-gram candidate, if it scores as an auto-accept.
+        """
+        matches = self.matches(query_name)
+        if matches:
+            return matches[0]
+        if fuzzy:
+            candidates = self.ngrams.candidates(query_name, limit=1, min_score=AUTO_ACCEPT_SCORE)
+            if candidates:
+                return candidates[0][2]
+        return None
@@ -0,0 +1,232 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+from name_normalization import normalize_name
+
+# Calibrated on companies_to_review.json: one-word names against longer, different companies
+# ("Engage" vs "Engage Anywhere", "Remco" vs "Adams Remco") score about 0.6-0.75, while spelling
+# and plural variants of the same name ("Blue River Partner" vs "Blue River Partners") score above 0.95.
+AUTO_ACCEPT_SCORE = 0.95
+REVIEW_SCORE = 0.8
+
+DECISION_ACCEPT = "accept"
+DECISION_REVIEW = "review"
+DECISION_REJECT = "reject"
+
+# Names that are not equivalent (see name_key) never auto-accept, however close they score; and
+# names whose numbers, roman numerals or years differ ("Fund XII" vs "Fund XIII") are different
+# entities, so they are rejected.
+NEAR_MATCH_MAX_SCORE = 0.94
+CONFLICTING_IDENTIFIER_MAX_SCORE = 0.5
+
+# A name whose significant tokens all appear in the other name ("Blackstone" vs "The Blackstone
+# Group") is at least worth a review, however low the longer name drags the score.
+MIN_SIGNIFICANT_TOKEN_LENGTH = 3
+
+ROMAN_NUMERAL_PATTERN = re.compile(r'^m{0,3}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$')
+
+NGRAM_SIZE = 3
+TOKEN_WEIGHT = 0.6 # The rest of the score is the character n-gram cosine
+
+# Node fields whose values are names of the company, for validating name search results
+NODE_NAME_FIELDS = ["legal_name", "Name", "former_names", "also_known_as"]
+
+
+def jaro_winkler(a, b, prefix_scale=0.1):
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(0, max(len(a), len(b)) // 2 - 1)
+    a_matched = [False] * len(a)
+    b_matched = [False] * len(b)
+    matches = 0
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not b_matched[j] and b[j] == char:
+                a_matched[i] = b_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    a_chars = [char for char, matched in zip(a, a_matched) if matched]
+    b_chars = [char for char, matched in zip(b, b_matched) if matched]
+    transpositions = sum(x != y for x, y in zip(a_chars, b_chars)) / 2
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def char_ngrams(normalized, n=NGRAM_SIZE):
+    """Character n-gram counts of a normalized name, each token padded with spaces so word edges count."""
+    grams = Counter()
+    for token in normalized.split():
+        padded = f" {token} "
+        for i in range(max(1, len(padded) - n + 1)):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+
+def ngram_cosine(grams_a, grams_b):
+    if not grams_a or not grams_b:
+        return 0.0
+    if len(grams_a) > len(grams_b):
+        grams_a, grams_b = grams_b, grams_a
+    dot = sum(count * grams_b.get(gram, 0) for gram, count in grams_a.items())
+    norm_a = math.sqrt(sum(count * count for count in grams_a.values()))
+    norm_b = math.sqrt(sum(count * count for count in grams_b.values()))
+    return dot / (norm_a * norm_b)
+
+
+def soft_token_score(tokens_a, tokens_b):
+    """
+    Token-set similarity where tokens match by Jaro-Winkler instead of exactly. Each side's tokens
+    are matched to their best counterpart, and the weaker of the two directions is kept, so a short
+    name contained in a longer one ("remco" in "adams remco") is not a perfect match.
+    """
+    if not tokens_a or not tokens_b:
+        return 0.0
+    def directed(source, target):
+        return sum(max(jaro_winkler(token, other) for other in target) for token in source) / len(source)
+    return min(directed(tokens_a, tokens_b), directed(tokens_b, tokens_a))
+
+
+def identifier_tokens(tokens):
+    """The tokens that tell numbered entities apart: anything with a digit (fund numbers, years) and roman numerals."""
+    return frozenset(token for token in tokens if any(char.isdigit() for char in token) or ROMAN_NUMERAL_PATTERN.match(token))
+
+
+def name_key(tokens):
+    """
+    Key under which two normalized names are equivalent: plural 's' endings dropped and the tokens
+    joined without spaces, so "Blue River Partner" and "Blue River Partners", or "Blue-River" and
+    "Blue River", share a key.
+    """
+    return "".join(token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token for token in tokens)
+
+
+def contains_significant_tokens(tokens, other_tokens):
+    """True if every significant token (length >= MIN_SIGNIFICANT_TOKEN_LENGTH) of one name is a token of the other."""
+    significant = [token for token in tokens if len(token) >= MIN_SIGNIFICANT_TOKEN_LENGTH]
+    return bool(significant) and set(significant) <= set(other_tokens)
+
+
+@lru_cache(maxsize=16384)
+def _profile(name):
+    normalized = normalize_name(name)
+    tokens = tuple(normalized.split())
+    return normalized, tokens, char_ngrams(normalized), name_key(tokens), identifier_tokens(tokens)
+
+
+def _profile_similarity(profile_a, profile_b):
+    if not profile_a[0] or not profile_b[0]:
+        return 0.0
+    if profile_a[0] == profile_b[0]:
+        return 1.0
+    token_score = soft_token_score(profile_a[1], profile_b[1])
+    score = round(TOKEN_WEIGHT * token_score + (1 - TOKEN_WEIGHT) * ngram_cosine(profile_a[2], profile_b[2]), 4)
+    if profile_a[4] and profile_b[4] and profile_a[4] != profile_b[4]:
+        return min(score, CONFLICTING_IDENTIFIER_MAX_SCORE)
+    if profile_a[3] == profile_b[3]:
+        return max(score, AUTO_ACCEPT_SCORE)
+    if contains_significant_tokens(profile_a[1], profile_b[1]) or contains_significant_tokens(profile_b[1], profile_a[1]):
+        score = max(score, REVIEW_SCORE)
+    return min(score, NEAR_MATCH_MAX_SCORE)
+
+
+def name_similarity(name_a, name_b):
+    """
+    Similarity between two company names in [0, 1]; 1.0 when they are equal after normalization.
+    Only equivalent names (plural or punctuation differences) reach AUTO_ACCEPT_SCORE, a name
+    contained in the other scores at least REVIEW_SCORE, and names with different numbers, roman
+    numerals or years score as a reject.
+    """
+    if not name_a or not name_b:
+        return 0.0
+    return _profile_similarity(_profile(name_a), _profile(name_b))
+
+
+def match_decision(score):
+    if score >= AUTO_ACCEPT_SCORE:
+        return DECISION_ACCEPT
+    if score >= REVIEW_SCORE:
+        return DECISION_REVIEW
+    return DECISION_REJECT
+
+
+def node_name_set(company_details):
+    """The distinct names a node is known by (legal name, former names, also known as)."""
+    names = []
+    for field in NODE_NAME_FIELDS:
+        value = company_details.get(field)
+        if isinstance(value, str) and value.strip() and value not in names:
+            names.append(value)
+    return names
+
+
+def score_table(result_names, node_names):
+    """
+    Scores every result row name against a node's name set in one call; each node name is
+    profiled once for the whole table.
+
+    Returns:
+        list: One {"name", "score", "matched_name", "decision"} per result name, in input order,
+              scored against the node name it is closest to.
+    """
+    node_profiles = [(node_name, _profile(node_name)) for node_name in node_names if node_name]
+    scored = []
+    for result_name in result_names:
+        best_score, best_name = 0.0, None
+        if result_name:
+            result_profile = _profile(result_name)
+            for node_name, node_profile in node_profiles:
+                score = _profile_similarity(node_profile, result_profile)
+                if score > best_score:
+                    best_score, best_name = score, node_name
+        scored.append({"name": result_name, "score": best_score, "matched_name": best_name, "decision": match_decision(best_score)})
+    return scored
+
+
+class NgramIndex:
+    """
+    Character n-gram index over names, for finding the names most similar to a query without
+    scoring every indexed name. Candidates sharing the most n-grams with the query are scored
+    with name_similarity and returned best first.
+    """
+
+    def __init__(self, candidate_pool=50):
+        self.candidate_pool = candidate_pool
+        self.items = []     # [(item, name, profile)]
+        self.postings = {}  # {ngram: [item positions]}
+
+    def add(self, name, item):
+        profile = _profile(name) if name else None
+        if not profile or not profile[0]:
+            return
+        position = len(self.items)
+        self.items.append((item, name, profile))
+        for gram in profile[2]:
+            self.postings.setdefault(gram, []).append(position)
+
+    def candidates(self, query_name, limit=5, min_score=REVIEW_SCORE):
+        """Returns up to `limit` (score, name, item) tuples scoring at least min_score, best first."""
+        query_profile = _profile(query_name) if query_name else None
+        if not query_profile or not query_profile[0]:
+            return []
+        shared = Counter()
+        for gram in query_profile[2]:
+            shared.update(self.postings.get(gram, ()))
+        ranked = []
+        for position, _ in shared.most_common(self.candidate_pool):
+            item, name, profile = self.items[position]
+            score = _profile_similarity(query_profile, profile)
+            if score >= min_score:
+                ranked.append((score, position, name, item))
+        ranked.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+        return [(score, name, item) for score, _, name, item in ranked[:limit]]
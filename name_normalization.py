@@ -0,0 +1,58 @@
+import re
+import string
+from functools import lru_cache
+
+COMMON_SUFFIXES = [
+    "inc", "llc", "corp", "ltd", "co", "gmbh", "as", "ag", "sarl", "nv", "sa",
+    "bv", "oy", "ab", "kft", "plc", "pvt", "pte", "pty", "s.a.", "s.a.r.l.", "n.v.", "s.p.a.",
+    "company", "group", "holding", "holdings", "system", "systems", "products", "solutions",
+    "technologies", "technology", "inc.", "llc.", "corp.", "ltd.", "co.", "gmbh.", "as.", "ag.",
+    "sarl.", "nv.", "sa.", "bv.", "oy.", "ab.", "kft.", "plc.", "pvt.", "pte.", "pty.",
+    "limited", "unlimited", "and", "&"
+]
+
+SUFFIX_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(s) for s in COMMON_SUFFIXES) + r')\b', re.IGNORECASE)
+
+# Punctuation is stripped before suffixes are removed, so only the plain-word suffixes can still match
+SUFFIX_TOKENS = frozenset(suffix for suffix in COMMON_SUFFIXES if suffix.isalnum())
+
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+NORMALIZE_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize(name):
+    kept = []
+    for token in name.lower().translate(PUNCTUATION_TABLE).split():
+        if token in SUFFIX_TOKENS:
+            continue
+        if not token.isalnum():
+            # Non-ASCII punctuation (e.g. an en dash) still separates words for the suffix pattern
+            token = SUFFIX_PATTERN.sub('', token)
+            if not token:
+                continue
+        kept.append(token)
+    return ' '.join(kept)
+
+
+def normalize_name(name):
+    """
+    Lowercases a company name and strips punctuation and common legal suffixes ("Inc", "GmbH",
+    "Holdings", ...), collapsing whitespace. Results are kept in a bounded LRU cache, since the
+    same names are normalized over and over while matching.
+    """
+    if not name:
+        return ""
+    return _normalize(name)
+
+
+def normalize_names(names):
+    """Normalizes a whole column of names, computing each distinct name once. Returns a list in input order."""
+    names = list(names)
+    normalized_by_name = {name: normalize_name(name) for name in set(names) if name}
+    return [normalized_by_name.get(name, "") for name in names]
+
+
+def normalization_cache_info():
+    return _normalize.cache_info()
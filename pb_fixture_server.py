@@ -0,0 +1,350 @@
+import argparse
+import html
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+COLOR_BLUE = "\033[96m"
+COLOR_RESET = "\033[0m"
+
+PROFILE_PATH_PATTERN = re.compile(r'^/profile/([A-Za-z0-9]+-[A-Za-z0-9]+)/([a-z]+)/profile/?$')
+
+AFFILIATE_HEADERS = ["Name", "Industry", "Location", "Year Founded"]
+INVESTMENT_HEADERS = ["Company Name", "Deal Date", "Deal Type", "Deal Size", "Industry"]
+INDUSTRIES = ["Software", "Healthcare Services", "Industrial Machinery", "Specialty Retail", "Media"]
+CITIES = ["Chicago, IL", "Boston, MA", "Austin, TX", "Denver, CO", "Seattle, WA"]
+
+
+class FixtureGraph:
+    """
+    Deterministic synthetic PitchBook company graph: `roots` trees of the given depth where
+    every company has `fanout` related companies, split between affiliates and M&A
+    investments. `cross_link_ratio` adds links back to already generated companies so the
+    crawler's dedupe paths are exercised, and `noise_rows` adds investment rows the crawler
+    is expected to skip (non-M&A deals and exited deals).
+    """
+
+    def __init__(self, roots=2, depth=2, fanout=4, cross_link_ratio=0.0, noise_rows=1, seed=7):
+        self.depth = depth
+        self.fanout = fanout
+        self.noise_rows = noise_rows
+        self.random = random.Random(seed)
+        self.companies = {}
+        self.root_ids = []
+        self._sequence = 0
+
+        for _ in range(roots):
+            self.root_ids.append(self._build(0))
+
+        if cross_link_ratio:
+            all_ids = list(self.companies)
+            for pb_id in all_ids:
+                company = self.companies[pb_id]
+                if company["children"] and self.random.random() < cross_link_ratio:
+                    target = self.random.choice(all_ids)
+                    if target != pb_id and target not in company["children"]:
+                        company["children"].append(target)
+
+    def _next_id(self):
+        self._sequence += 1
+        return f"{100000 + self._sequence}-{self._sequence % 97:02d}"
+
+    def _build(self, depth):
+        pb_id = self._next_id()
+        sequence = self._sequence
+        company = {
+            "pb_id": pb_id,
+            "name": f"Fixture Company {sequence}",
+            "legal_name": f"Fixture Company {sequence}, Inc.",
+            "website": f"https://www.fixture{sequence}.com/",
+            "year_founded": 1950 + sequence % 70,
+            "industry": INDUSTRIES[sequence % len(INDUSTRIES)],
+            "location": CITIES[sequence % len(CITIES)],
+            "children": [],
+        }
+        self.companies[pb_id] = company
+        if depth < self.depth:
+            company["children"] = [self._build(depth + 1) for _ in range(self.fanout)]
+        return pb_id
+
+    def roots_for_scraping(self):
+        """The roots in the selected_for_scraping.json shape PBTree reads."""
+        return [{"root_company_name": self.companies[pb_id]["name"], "pitchbook_id": pb_id} for pb_id in self.root_ids]
+
+    def table_rows(self, pb_id):
+        """Returns (affiliate_rows, investment_rows) as lists of {header: {text, href, foot_note}} cells."""
+        company = self.companies[pb_id]
+        affiliates, investments = [], []
+        for index, child_id in enumerate(company["children"]):
+            child = self.companies[child_id]
+            link = f"/profile/{child_id}/company/profile"
+            if index % 2 == 0:
+                affiliates.append({
+                    "Name": {"text": child["name"], "href": link},
+                    "Industry": {"text": child["industry"]},
+                    "Location": {"text": child["location"]},
+                    "Year Founded": {"text": str(child["year_founded"])},
+                })
+            else:
+                investments.append(self._investment_row(child["name"], link, "Merger/Acquisition", child["industry"]))
+        if company["children"]:
+            for noise_index in range(self.noise_rows):
+                # Alternate between a non-M&A deal and an exited deal, both skipped by the crawler
+                if noise_index % 2 == 0:
+                    investments.append(self._investment_row(f"{company['name']} VC Target {noise_index}", None, "Later Stage VC", "Software"))
+                else:
+                    investments.append(self._investment_row(f"{company['name']} Exited Target {noise_index}", None, "Merger/Acquisition", "Media", exited=True))
+        return affiliates, investments
+
+    def _investment_row(self, name, link, deal_type, industry, exited=False):
+        return {
+            "Company Name": {"text": name, "href": link, "foot_note": "x" if exited else None},
+            "Deal Date": {"text": "15-Mar-2019"},
+            "Deal Type": {"text": deal_type},
+            "Deal Size": {"text": "12.50"},
+            "Industry": {"text": industry},
+        }
+
+
+PAGE_SCRIPT = """
+const TABLES = %(tables)s;
+const PAGE_SIZE = %(page_size)d;
+const RENDER_DELAY_MS = %(render_delay_ms)d;
+
+function cellHtml(cell) {
+    if (!cell) { return "<td></td>"; }
+    let inner = escapeHtml(cell.text || "");
+    if (cell.href) {
+        inner = '<span class="entity-hover"><a href="' + cell.href + '">' + inner + '</a></span>';
+    }
+    if (cell.foot_note) {
+        inner += ' <span class="foot-note">' + cell.foot_note + '</span>';
+    }
+    return "<td>" + inner + "</td>";
+}
+
+function escapeHtml(text) {
+    return text.replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;");
+}
+
+function renderTable(sectionId, page) {
+    const table = TABLES[sectionId];
+    const section = document.getElementById(sectionId);
+    const pageCount = Math.max(1, Math.ceil(table.rows.length / PAGE_SIZE));
+    const loading = section.querySelector("div.box-loading");
+    loading.style.display = "block";
+    setTimeout(function () {
+        const rows = table.rows.slice((page - 1) * PAGE_SIZE, page * PAGE_SIZE);
+        section.querySelector("tbody").innerHTML = rows.map(function (row) {
+            return '<tr class="table__row">' + table.headers.map(function (header) { return cellHtml(row[header]); }).join("") + "</tr>";
+        }).join("");
+
+        let nav = '<button class="pagination__navigation-button" aria-label="Go to previous page" aria-disabled="' + (page <= 1) + '" data-page="' + (page - 1) + '">&lsaquo;</button>';
+        for (let i = 1; i <= pageCount; i++) {
+            nav += '<button class="pagination__page"' + (i === page ? ' aria-current="page"' : '') + ' data-page="' + i + '"><span class="button__caption">' + i + '</span></button>';
+        }
+        nav += '<button class="pagination__navigation-button" aria-label="Go to next page" aria-disabled="' + (page >= pageCount) + '" data-page="' + (page + 1) + '">&rsaquo;</button>';
+        section.querySelector('nav[aria-label="Pagination"]').innerHTML = nav;
+        loading.style.display = "none";
+    }, RENDER_DELAY_MS);
+}
+
+document.addEventListener("click", function (event) {
+    const button = event.target.closest('nav[aria-label="Pagination"] button');
+    if (!button || button.getAttribute("aria-disabled") === "true") { return; }
+    const sectionId = button.closest("section").id;
+    renderTable(sectionId, parseInt(button.getAttribute("data-page"), 10));
+});
+
+Object.keys(TABLES).forEach(function (sectionId) { renderTable(sectionId, 1); });
+"""
+
+
+def _general_info_row(label, value_html):
+    return (
+        '<div class="table-list__row">'
+        f'<div class="table-list__cell table-list__cell_caption"><label><span>{label}</span></label></div>'
+        f'<div class="table-list__cell">{value_html}</div>'
+        '</div>'
+    )
+
+
+def _table_section(section_id, headers, tab_html=""):
+    header_html = "".join(f"<th>{html.escape(header)}</th>" for header in headers)
+    return (
+        f'<section id="{section_id}">{tab_html}'
+        '<div class="box-loading" style="display:block">Loading...</div>'
+        f'<table><thead><tr>{header_html}</tr></thead><tbody></tbody></table>'
+        '<nav aria-label="Pagination"></nav>'
+        '</section>'
+    )
+
+
+def render_profile_page(graph, pb_id, page_size=10, render_delay_ms=0):
+    """Renders a profile page with the DOM structure pb_tree_crawler.py scrapes."""
+    company = graph.companies[pb_id]
+    affiliates, investments = graph.table_rows(pb_id)
+    sequence = pb_id.split("-")[0]
+
+    general_info = "".join([
+        _general_info_row("Website", f'<a href="{company["website"]}">{company["website"]}</a>'),
+        _general_info_row("Legal Name", f'<div>{html.escape(company["legal_name"])}</div>'),
+        _general_info_row("Formerly Known As", f'<div>{html.escape(company["name"])} Holdings</div>'),
+        _general_info_row("Also Known As", f'<div>FC{sequence}</div>'),
+    ])
+    primary_contact = (
+        '<div class="grid__cell grid__cell_4"><span>Primary Contact</span><ul class="contact-info">'
+        f'<li><span class="entity-hover"><a href="/profile/{sequence}-99/person/profile">Pat Contact {sequence}</a></span></li>'
+        '<li>Chief Executive Officer</li>'
+        f'<li><a href="mailto:pat{sequence}@fixture.test">pat{sequence}@fixture.test</a></li>'
+        '<li>Business: +1 (312) 555-0100</li>'
+        '</ul></div>'
+    )
+    office_address = (
+        '<div class="element-group element-group_vertical element-group_s"><div class="element-group__item"><ul class="contact-info">'
+        f'<li>{sequence} Main Street</li><li>{html.escape(company["location"])}</li>'
+        f'<li><a href="mailto:info{sequence}@fixture.test">info{sequence}@fixture.test</a></li>'
+        '<li>Business: +1 (312) 555-0199</li>'
+        '</ul></div></div>'
+    )
+
+    # Like PitchBook, sections without rows are not rendered at all
+    tables = {}
+    sections = []
+    if affiliates:
+        tables["affiliates"] = {"headers": AFFILIATE_HEADERS, "rows": affiliates}
+        sections.append(_table_section(
+            "affiliates", AFFILIATE_HEADERS,
+            '<a id="undefined-affiliates/SUBSIDIARY" aria-selected="true">Subsidiaries</a>'
+        ))
+    if investments:
+        tables["investments"] = {"headers": INVESTMENT_HEADERS, "rows": investments}
+        sections.append(_table_section("investments", INVESTMENT_HEADERS))
+
+    script = PAGE_SCRIPT % {
+        "tables": json.dumps(tables).replace("</", "<\\/"),
+        "page_size": page_size,
+        "render_delay_ms": render_delay_ms,
+    }
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(company['name'])} | PitchBook Fixture</title></head><body>"
+        f"<h1>{html.escape(company['name'])}</h1>"
+        f'<section id="general-info"><div class="table-list">{general_info}</div></section>'
+        f"{primary_contact}{office_address}{''.join(sections)}"
+        f"<script>{script}</script>"
+        "</body></html>"
+    )
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serves /profile/<id>/<type>/profile pages from the server's FixtureGraph."""
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?", 1)[0].split("#", 1)[0]
+        match = PROFILE_PATH_PATTERN.match(path)
+        if server.latency_seconds:
+            time.sleep(server.latency_seconds)
+
+        body = None
+        if match:
+            pb_id = match.group(1).upper()
+            if pb_id in server.graph.companies:
+                body = server.render_page(pb_id)
+        elif path in ("", "/"):
+            links = "".join(
+                f'<li><a href="/profile/{root["pitchbook_id"]}/company/profile">{html.escape(root["root_company_name"])}</a></li>'
+                for root in server.graph.roots_for_scraping()
+            )
+            body = f"<!DOCTYPE html><html><body><ul>{links}</ul></body></html>"
+
+        if body is None:
+            self.send_error(404, "Unknown fixture profile")
+            return
+        with server.stats_lock:
+            server.pages_served += 1
+        encoded = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output readable
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Local HTTP server for PitchBook-shaped fixture pages.
+
+    Args:
+        graph (FixtureGraph): Companies to serve.
+        latency_ms (int): Delay added before every page response, simulating network time.
+        render_delay_ms (int): Delay before a table page renders after load or a pagination click.
+        page_size (int): Rows per table page.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, graph, host="127.0.0.1", port=0, latency_ms=0, render_delay_ms=0, page_size=10):
+        super().__init__((host, port), FixtureRequestHandler)
+        self.graph = graph
+        self.latency_seconds = latency_ms / 1000.0
+        self.render_delay_ms = render_delay_ms
+        self.page_size = page_size
+        self.pages_served = 0
+        self.stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def render_page(self, pb_id):
+        return render_profile_page(self.graph, pb_id, self.page_size, self.render_delay_ms)
+
+    def start(self):
+        """Serves in a background thread and returns immediately."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic PitchBook profile pages for offline crawler runs.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--roots", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--render-delay-ms", type=int, default=0)
+    parser.add_argument("--cross-link-ratio", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    graph = FixtureGraph(roots=args.roots, depth=args.depth, fanout=args.fanout, cross_link_ratio=args.cross_link_ratio)
+    server = FixtureServer(graph, port=args.port, latency_ms=args.latency_ms,
+                           render_delay_ms=args.render_delay_ms, page_size=args.page_size)
+    print(f"{COLOR_BLUE}Serving {len(graph.companies)} fixture profiles at {server.base_url}{COLOR_RESET}")
+    for root in graph.roots_for_scraping():
+        print(f"{COLOR_BLUE}  Root: {root['root_company_name']} -> {server.base_url}/profile/{root['pitchbook_id']}/company/profile{COLOR_RESET}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
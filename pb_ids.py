@@ -0,0 +1,95 @@
+import re
+from urllib.parse import urljoin, urlsplit
+
+PITCHBOOK_BASE_URL = "https://my.pitchbook.com"
+
+# Matches the ID segment of any PitchBook profile link, e.g. /profile/58598-74/company/profile
+PB_ID_URL_PATTERN = re.compile(r'/profile/([A-Za-z0-9]+-[A-Za-z0-9]+)(?=[/?#]|$)')
+# A bare PitchBook ID as it appears in the cleanup queue or selected_for_scraping.json
+PB_ID_PATTERN = re.compile(r'^\s*([0-9]+-[0-9]+[A-Za-z]?)\s*$')
+# The entity type segment that follows the ID (company, investor, person, ...)
+PB_ENTITY_TYPE_PATTERN = re.compile(r'/profile/[A-Za-z0-9-]+/([a-z]+)(?=[/?#]|$)', re.IGNORECASE)
+
+
+def normalize_pb_id(pb_id):
+    """Returns a PitchBook ID in its canonical form (trimmed, upper-case suffix), or None."""
+    if not pb_id:
+        return None
+    match = PB_ID_PATTERN.match(str(pb_id))
+    if not match:
+        return None
+    return match.group(1).upper()
+
+
+def extract_pb_id(value):
+    """
+    Maps any PitchBook link (relative, absolute, trailing slash, query string, fragment,
+    post-redirect current_url) or a bare PitchBook ID to its canonical PB ID.
+    Returns None if no ID can be found.
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+
+    bare_id = normalize_pb_id(value)
+    if bare_id:
+        return bare_id
+
+    path = urlsplit(value).path if "://" in value else value.split("?", 1)[0].split("#", 1)[0]
+    match = PB_ID_URL_PATTERN.search(path)
+    if match:
+        return match.group(1).upper()
+    return None
+
+
+def extract_entity_type(url, default="company"):
+    """Returns the entity type segment of a profile link (company, investor, person...)."""
+    if not url:
+        return default
+    match = PB_ENTITY_TYPE_PATTERN.search(str(url))
+    if match:
+        return match.group(1).lower()
+    return default
+
+
+def canonical_profile_url(value, base_url=PITCHBOOK_BASE_URL):
+    """
+    Rebuilds a clean, absolute profile URL for a PitchBook link or ID so that every variant
+    of the same profile maps to a single string. Returns the absolute input URL unchanged
+    if it does not contain a PitchBook ID.
+    """
+    if not value:
+        return None
+    pb_id = extract_pb_id(value)
+    if not pb_id:
+        return urljoin(base_url + "/", str(value).strip())
+    entity_type = extract_entity_type(value)
+    return f"{base_url}/profile/{pb_id}/{entity_type}/profile"
+
+
+def node_pb_id(node):
+    """
+    Returns the PB ID for a scraped company node. Prefers the stored 'pb_id' field and
+    falls back to parsing the node's profile links for data scraped before it existed.
+    """
+    if not isinstance(node, dict):
+        return None
+    stored_id = normalize_pb_id(node.get("pb_id"))
+    if stored_id:
+        return stored_id
+    for field in ("profile_url", "Name_link"):
+        pb_id = extract_pb_id(node.get(field))
+        if pb_id:
+            return pb_id
+    return None
+
+
+def visited_key(url):
+    """Key used for dedupe: the PB ID when available, otherwise the normalized URL."""
+    pb_id = extract_pb_id(url)
+    if pb_id:
+        return pb_id
+    if not url:
+        return None
+    parts = urlsplit(str(url).strip())
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
@@ -1,7 +1,7 @@
 import os
 import time
 import json
-import csv
+import argparse
 from urllib.parse import urljoin
 from dotenv import load_dotenv
 import glob
@@ -15,20 +15,43 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException
 from selenium.webdriver.chrome.options import Options
 
-# ANSI escape codes for colors
-COLOR_BLUE = "\033[96m" # Main profile, important headers
-COLOR_GREEN = "\033[92m" # Data points
-COLOR_YELLOW = "\033[93m" # Links
-COLOR_ORANGE = "\033[33m" # Warnings, empty data
-COLOR_RED = "\033[91m"   # Errors
-COLOR_RESET = "\033[0m"
+from pb_ids import extract_pb_id, canonical_profile_url, visited_key, PITCHBOOK_BASE_URL
+from crawl_output import StreamingJSONArrayWriter, StreamingCSVWriter
+from crawl_snapshot import (CrawlSnapshot, compute_table_fingerprint, diff_edges, collect_subtree_pb_ids, reset_change_markers,
+                            CHANGE_STATUS_NEW, CHANGE_STATUS_CHANGED, CHANGE_STATUS_UNCHANGED,
+                            EDGE_STATUS_ADDED, INCREMENTAL_FIELDS)
+from crawl_budget import CrawlBudget, prioritize_children, BUDGET_FANOUT
+from crawl_coordinator import CrawlCoordinator
+from crawl_replay import ReplayRecorder
+from failure_artifacts import FailureArtifacts, ARTIFACT_MODES, ARTIFACT_MODE_DOM
+from adaptive_timeouts import AdaptiveTimeouts, PBTREE_TIMEOUTS_FILE
+from bot_logging import get_logger, add_logging_arguments, configure_logging_from_args, COLOR_YELLOW
+
+logger = get_logger("pbtree")
+
+# Scalar profile fields copied from a scraped child profile onto its related company entry
+PROFILE_DETAIL_FIELDS = [
+    "website_link", "former_names", "also_known_as", "legal_name",
+    "contact_name", "contact_profile_link", "contact_title", "contact_email",
+    "contact_email_link", "contact_business_phone", "contact_mobile_phone",
+    "office_address_line1", "office_address_line2", "office_address_line3",
+    "office_email", "office_phone"
+]
+
+# Output files shared with RetoolBot and the viewer
+PITCHBOOK_OUTPUT_JSON = 'multi_company_pitchbook_data.json'
+PITCHBOOK_OUTPUT_CSV = 'all_companies_pitchbook_related_data.csv'
+CRAWL_CHANGES_JSON = 'crawl_changes.json'
+
+CHROMEDRIVER_PATH = "C:/Users/QLindse25/Downloads/chromedriver-win64/chromedriver-win64/chromedriver.exe"
 
 load_dotenv()
 
 class WebScraper:
     
-    def __init__(self, headless=False):
-        """Initialize the web scraper with Chrome driver"""
+    def __init__(self, headless=False, profile_dir=None, chromedriver_path=CHROMEDRIVER_PATH, artifact_mode=ARTIFACT_MODE_DOM,
+                 timeouts_path=PBTREE_TIMEOUTS_FILE):
+        """Initialize the web scraper with Chrome driver. Parallel workers each need their own profile_dir."""
         self.options = Options()
 
         if headless:
@@ -44,31 +67,47 @@ class WebScraper:
         self.options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
         
         # --- REVISED: Very Explicit and Simple Profile Path ---
-        self.scraper_profile_dir = r"C:\temp\chrome_scraper_data" # Using raw string for backslashes
+        self.scraper_profile_dir = profile_dir or r"C:\temp\chrome_scraper_data" # Using raw string for backslashes
 
         # Ensure the directory exists
         if not os.path.exists(self.scraper_profile_dir):
             try:
                 os.makedirs(self.scraper_profile_dir, exist_ok=True)
-                print(f"{COLOR_BLUE}Created new scraper profile directory: {self.scraper_profile_dir}{COLOR_RESET}")
+                logger.info(f"Created new scraper profile directory: {self.scraper_profile_dir}")
             except Exception as e:
-                print(f"{COLOR_RED}ERROR: Could not create scraper profile directory {self.scraper_profile_dir}. Check permissions. Error: {e}{COLOR_RESET}")
+                logger.error(f"ERROR: Could not create scraper profile directory {self.scraper_profile_dir}. Check permissions. Error: {e}")
                 raise # Re-raise to stop if directory cannot be created
 
         self.options.add_argument(f"--user-data-dir={self.scraper_profile_dir}")
         # --------------------------------------------------------------------------
 
-        chromedriver_path = "C:/Users/QLindse25/Downloads/chromedriver-win64/chromedriver-win64/chromedriver.exe"
         service = Service(chromedriver_path)
 
         self.driver = webdriver.Chrome(service=service, options=self.options)
         self.wait = WebDriverWait(self.driver, 5) # Default main wait time set to 5 seconds
         self.long_wait = WebDriverWait(self.driver, 10) # Longer wait for specific elements
+        self.failure_artifacts = FailureArtifacts(self.driver, mode=artifact_mode) # Throttled diagnostics instead of a screenshot per failure
+        self.timeouts = AdaptiveTimeouts(timeouts_path) # Page waits use timeouts learned from observed latencies
         self.logged_in = False
         self.base_url = None
+        self.profile_base_url = PITCHBOOK_BASE_URL # Host profile URLs are canonicalized against; the benchmark points this at the fixture server
         
         # New attributes for recursive scraping
-        self.visited_urls = set()
+        self.visited_pb_ids = set() # Canonical PB IDs (or normalized URLs for non-PitchBook links)
+        self.profile_cache = {} # {pb_id: scalar profile details} for companies already scraped
+
+        # Incremental re-crawl: previous CrawlSnapshot to compare against, and the edge changes found
+        self.previous_snapshot = None
+        self.edge_changes = []
+
+        # Optional ReplayRecorder that snapshots every scraped page state for offline replay
+        self.replay_recorder = None
+
+        # Optional CrawlBudget for the root currently being crawled (None means unbounded)
+        self.crawl_budget = None
+
+        # Optional callable run as each profile page or table page is scraped; coordinated workers use it to renew their lease
+        self.lease_keeper = None
     
     def login(self, login_url, username, password, 
               username_selector="input[name='email']", 
@@ -88,7 +127,7 @@ class WebScraper:
             success_indicator: CSS selector to confirm successful login
         """
         try:
-            print(f"{COLOR_BLUE}Navigating to login page: {login_url}{COLOR_RESET}")
+            logger.info(f"Navigating to login page: {login_url}")
             self.driver.get(login_url)
             self.base_url = login_url # Capture base URL during login
             
@@ -114,7 +153,7 @@ class WebScraper:
                 password_field.send_keys(Keys.RETURN)
             
             # Wait for page to load after login
-            print(f"{COLOR_BLUE}Waiting for post-login redirect...{COLOR_RESET}")
+            logger.info("Waiting for post-login redirect...")
             time.sleep(10) # Give extra time for redirects and JS to load
             
             # Check for successful login (using main wait)
@@ -123,48 +162,48 @@ class WebScraper:
                     self.wait.until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, success_indicator))
                     )
-                    print(f"{COLOR_BLUE}Login successful! Success indicator found.{COLOR_RESET}")
+                    logger.info("Login successful! Success indicator found.")
                     self.logged_in = True
                     return True
                 except TimeoutException:
-                    print(f"{COLOR_ORANGE}Login may have failed - success indicator not found after full login.{COLOR_RESET}")
+                    logger.warning("Login may have failed - success indicator not found after full login.")
                     return False
             else:
                 # Fallback: Check if we're redirected away from login page
                 current_url = self.driver.current_url
                 if current_url != login_url and "login" not in current_url: # Added check for "login" in URL
-                    print(f"{COLOR_BLUE}Login appears successful (redirected from login page).{COLOR_RESET}")
+                    logger.info("Login appears successful (redirected from login page).")
                     self.logged_in = True
                     return True
                 else:
-                    print(f"{COLOR_ORANGE}Login may have failed - still on login page or redirected back to login.{COLOR_RESET}")
+                    logger.warning("Login may have failed - still on login page or redirected back to login.")
                     return False
                     
         except TimeoutException:
-            print(f"{COLOR_RED}Timeout waiting for login form to load.{COLOR_RESET}")
+            logger.error("Timeout waiting for login form to load.")
             return False
         except Exception as e:
-            print(f"{COLOR_RED}Error during login: {e}{COLOR_RESET}")
+            logger.error(f"Error during login: {e}")
             return False
     
     def check_login_status(self, logged_in_indicator=None):
         """Check if still logged in by looking for a specific element."""
         if logged_in_indicator:
-            print(f"{COLOR_BLUE}Checking login status using indicator: {logged_in_indicator}{COLOR_RESET}")
+            logger.info(f"Checking login status using indicator: {logged_in_indicator}")
             try:
                 # Use a short wait to quickly check for the indicator's presence
                 WebDriverWait(self.driver, 5).until( # Shorter wait for just a check
                     EC.presence_of_element_located((By.CSS_SELECTOR, logged_in_indicator))
                 )
-                print(f"{COLOR_BLUE}Login indicator '{logged_in_indicator}' found. User appears logged in.{COLOR_RESET}")
+                logger.info(f"Login indicator '{logged_in_indicator}' found. User appears logged in.")
                 self.logged_in = True
                 return True
             except TimeoutException:
-                print(f"{COLOR_ORANGE}Login indicator '{logged_in_indicator}' NOT found. User does NOT appear logged in.{COLOR_RESET}")
+                logger.warning(f"Login indicator '{logged_in_indicator}' NOT found. User does NOT appear logged in.")
                 self.logged_in = False
                 return False
         # If no specific indicator is provided, we can't definitively check, assume not logged in.
-        print(f"{COLOR_ORANGE}No specific logged-in indicator provided for status check. Assuming not logged in.{COLOR_RESET}")
+        logger.warning("No specific logged-in indicator provided for status check. Assuming not logged in.")
         self.logged_in = False
         return False
     
@@ -178,31 +217,31 @@ class WebScraper:
                 logout_element.click()
             
             self.logged_in = False
-            print(f"{COLOR_BLUE}Logged out successfully{COLOR_RESET}")
+            logger.info("Logged out successfully")
             return True
             
         except Exception as e:
-            print(f"{COLOR_RED}Error during logout: {e}{COLOR_RESET}")
+            logger.error(f"Error during logout: {e}")
             return False
     
     def scrape_protected_content(self, url, content_selector=".content", logged_in_indicator=None):
         """Scrape content that requires login"""
-        print(f"{COLOR_BLUE}Navigating to protected URL: {url}{COLOR_RESET}")
+        logger.info(f"Navigating to protected URL: {url}")
         self.driver.get(url)
         time.sleep(.4) # Give page time to load after navigation
 
         # Crucial check: Verify login status *after* navigating to the protected page
         if logged_in_indicator:
             if not self.check_login_status(logged_in_indicator):
-                print(f"{COLOR_ORANGE}Session expired or invalid after navigating to protected content. Cannot scrape.{COLOR_RESET}")
+                logger.warning("Session expired or invalid after navigating to protected content. Cannot scrape.")
                 self.logged_in = False # Reset login status if check fails
                 return []
         elif not self.logged_in: # Fallback if no specific indicator, but internal state is false
-            print(f"{COLOR_ORANGE}Not logged in (internal state). Please login first to scrape protected content.{COLOR_RESET}")
+            logger.warning("Not logged in (internal state). Please login first to scrape protected content.")
             return []
         
         try:
-            print(f"{COLOR_BLUE}Waiting for content element with selector: {content_selector}{COLOR_RESET}")
+            logger.info(f"Waiting for content element with selector: {content_selector}")
             # Use presence_of_element_located to get the main container element
             main_content_element = self.wait.until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, content_selector))
@@ -215,14 +254,14 @@ class WebScraper:
                 'url': url
             })
             
-            print(f"{COLOR_BLUE}Scraped content from '{content_selector}'.{COLOR_RESET}")
+            logger.info(f"Scraped content from '{content_selector}'.")
             return content_data
             
         except TimeoutException:
-            print(f"{COLOR_ORANGE}Timeout waiting for element with selector '{content_selector}' on {url}.{COLOR_RESET}")
+            logger.warning(f"Timeout waiting for element with selector '{content_selector}' on {url}.")
             return []
         except Exception as e:
-            print(f"{COLOR_RED}Error during protected content scraping: {e}{COLOR_RESET}")
+            logger.error(f"Error during protected content scraping: {e}")
             return []
             
     def scrape_quotes(self, url="https://my.pitchbook.com/profile/97149-88/investor/profile"):
@@ -232,7 +271,7 @@ class WebScraper:
             self.driver.get(url)
             page_num = 1
             
-            print(f"{COLOR_BLUE}Scraping page {page_num}...{COLOR_RESET}")
+            logger.info(f"Scraping page {page_num}...")
             
             quotes = self.wait.until(
                 EC.presence_of_all_elements_located((By.CLASS_NAME, "quote"))
@@ -251,12 +290,12 @@ class WebScraper:
                         'page': page_num
                     })
                 except NoSuchElementException as e:
-                    print(f"{COLOR_ORANGE}Error extracting quote details (text/author/tags): {e}{COLOR_RESET}")
+                    logger.warning(f"Error extracting quote details (text/author/tags): {e}")
                     continue
         except TimeoutException:
-            print(f"{COLOR_ORANGE}Timeout waiting for page to load or quotes to appear.{COLOR_RESET}")
+            logger.warning("Timeout waiting for page to load or quotes to appear.")
         except Exception as e:
-            print(f"{COLOR_RED}Error during scraping quotes: {e}{COLOR_RESET}")
+            logger.error(f"Error during scraping quotes: {e}")
         
         return quotes_data
     
@@ -305,7 +344,7 @@ class WebScraper:
 
         prepared_list = []
         if raw_data:
-            print(f"{COLOR_BLUE}Processing {len(raw_data)} {source_type_name} rows.{COLOR_RESET}")
+            logger.info(f"Processing {len(raw_data)} {source_type_name} rows.")
             for row in raw_data:
                 processed_row = row.copy()
                 
@@ -319,16 +358,17 @@ class WebScraper:
                     if required_deal_type:
                         deal_type = processed_row.get("Deal Type") 
                         if deal_type != required_deal_type:
-                            print(f"{COLOR_YELLOW}Skipping investment '{processed_row.get('Name', 'N/A')}' because Deal Type is '{deal_type}', not '{required_deal_type}'.{COLOR_RESET}")
+                            logger.info(f"Skipping investment '{processed_row.get('Name', 'N/A')}' because Deal Type is '{deal_type}', not '{required_deal_type}'.", color=COLOR_YELLOW)
                             continue # Skip this row
 
          
                     if processed_row.get('_is_exited_deal', False):
-                        print(f"{COLOR_YELLOW}Skipping investment '{processed_row.get('Name')}' due to 'x' footnote (exited deal).{COLOR_RESET}")
+                        logger.info(f"Skipping investment '{processed_row.get('Name')}' due to 'x' footnote (exited deal).", color=COLOR_YELLOW)
                         continue
                 
                 processed_row['Source_Type'] = source_type_name
-                
+                processed_row['pb_id'] = extract_pb_id(processed_row.get('Name_link'))
+
                 processed_row["nested_related_companies"] = []
 
                 processed_row.pop('_is_exited_deal', None) 
@@ -336,7 +376,7 @@ class WebScraper:
                 prepared_list.append(processed_row)
         return prepared_list
 
-    def _scrape_affiliate_table_old_logic(self, main_section_selector, table_selector, tab_selector_a_tag=None, initial_section_wait=10):
+    def _scrape_affiliate_table_old_logic(self, main_section_selector, table_selector, tab_selector_a_tag=None, initial_section_wait=10, max_pages=None, first_page_rows=None):
 
         page_scraped_rows_data = []
         headers = [] 
@@ -346,159 +386,173 @@ class WebScraper:
         prev_button_selector = f'{main_section_selector} nav[aria-label="Pagination"] button.pagination__navigation-button[aria-label="Go to previous page"]'
 
         try:
-            print(f"{COLOR_BLUE}Waiting for main section ({main_section_selector}) to be visible (up to {initial_section_wait}s)...{COLOR_RESET}")
-            WebDriverWait(self.driver, initial_section_wait).until(EC.visibility_of_element_located((By.CSS_SELECTOR, main_section_selector)))
-            print(f"{COLOR_BLUE}Main section ({main_section_selector}) found and visible.{COLOR_RESET}")
+            logger.info(f"Waiting for main section ({main_section_selector}) to be visible...")
+            self.timeouts.wait(self.driver, f"section_visible:{main_section_selector}", initial_section_wait).until(EC.visibility_of_element_located((By.CSS_SELECTOR, main_section_selector)))
+            logger.info(f"Main section ({main_section_selector}) found and visible.")
 
             # 2. If a specific tab is required, find and activate it
             if tab_selector_a_tag:
-                print(f"{COLOR_BLUE}Checking tab status ({tab_selector_a_tag}) (up to 10s for visibility)...{COLOR_RESET}")
-                target_tab_element = WebDriverWait(self.driver, 3).until(EC.visibility_of_element_located((By.CSS_SELECTOR, tab_selector_a_tag)))
-                print(f"{COLOR_BLUE}Tab ({tab_selector_a_tag}) found and visible.{COLOR_RESET}")
+                logger.info(f"Checking tab status ({tab_selector_a_tag}) (up to 10s for visibility)...")
+                target_tab_element = self.timeouts.wait(self.driver, "tab_visible", 3, optional=True).until(EC.visibility_of_element_located((By.CSS_SELECTOR, tab_selector_a_tag)))
+                logger.info(f"Tab ({tab_selector_a_tag}) found and visible.")
 
                 if target_tab_element.get_attribute("aria-selected") != "true":
-                    print(f"{COLOR_BLUE}Tab ({tab_selector_a_tag}) is not active. Clicking to activate...{COLOR_RESET}")
+                    logger.info(f"Tab ({tab_selector_a_tag}) is not active. Clicking to activate...")
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target_tab_element)
                     time.sleep(0.5)
                     self.driver.execute_script("arguments[0].click();", target_tab_element)
                     
-                    WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, tab_selector_a_tag + '[aria-selected="true"]')))
-                    print(f"{COLOR_BLUE}Tab ({tab_selector_a_tag}) activated.{COLOR_RESET}")
+                    self.timeouts.wait(self.driver, "tab_activated", 10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, tab_selector_a_tag + '[aria-selected="true"]')))
+                    logger.info(f"Tab ({tab_selector_a_tag}) activated.")
                 else:
-                    print(f"{COLOR_BLUE}Tab ({tab_selector_a_tag}) is already active.{COLOR_RESET}")
+                    logger.info(f"Tab ({tab_selector_a_tag}) is already active.")
                 time.sleep(0.5)
 
             # 3. Wait for the table and its content to be ready
-            print(f"{COLOR_BLUE}Waiting for table '{table_selector}' to be visible (up to 10s)...{COLOR_RESET}")
-            table = WebDriverWait(self.driver, 10).until(
+            logger.info(f"Waiting for table '{table_selector}' to be visible (up to 10s)...")
+            table = self.timeouts.wait(self.driver, f"table_visible:{main_section_selector}", 10).until(
                 EC.visibility_of_element_located((By.CSS_SELECTOR, table_selector))
             )
-            print(f"{COLOR_BLUE}Table is visible.{COLOR_RESET}")
+            logger.info("Table is visible.")
 
             # Wait for any potential loading overlay to disappear within the section
             loading_box_selector = f'{main_section_selector} div.box-loading'
             try:
-                print(f"{COLOR_BLUE}Waiting for loading box '{loading_box_selector}' to disappear (up to 5s)...{COLOR_RESET}")
-                WebDriverWait(self.driver, 5).until(
+                logger.info(f"Waiting for loading box '{loading_box_selector}' to disappear (up to 5s)...")
+                self.timeouts.wait(self.driver, "loading_box_gone", 5, optional=True).until(
                     EC.invisibility_of_element_located((By.CSS_SELECTOR, loading_box_selector))
                 )
-                print(f"{COLOR_BLUE}Loading box disappeared (or was not present).{COLOR_RESET}")
+                logger.info("Loading box disappeared (or was not present).")
             except TimeoutException:
-                print(f"{COLOR_ORANGE}Warning: Loading box '{loading_box_selector}' did not disappear within 5s. Proceeding anyway.{COLOR_RESET}")
+                logger.warning(f"Warning: Loading box '{loading_box_selector}' did not disappear within 5s. Proceeding anyway.")
 
             # Now, wait for the table body to be present
-            print(f"{COLOR_BLUE}Waiting for table body ('{table_selector} tbody') to be present (up to 10s)...{COLOR_RESET}")
-            table_body_element = WebDriverWait(self.driver, 10).until(
+            logger.info(f"Waiting for table body ('{table_selector} tbody') to be present (up to 10s)...")
+            table_body_element = self.timeouts.wait(self.driver, "table_body", 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody"))
             )
-            print(f"{COLOR_BLUE}Table body is present.{COLOR_RESET}")
+            logger.info("Table body is present.")
 
             # NEW: Wait for at least one row (tr) to be present within the table body
-            print(f"{COLOR_BLUE}Waiting for at least one row ('{table_selector} tbody tr') to be present (up to 10s)...{COLOR_RESET}")
-            WebDriverWait(self.driver, 10).until(
+            logger.info(f"Waiting for at least one row ('{table_selector} tbody tr') to be present (up to 10s)...")
+            self.timeouts.wait(self.driver, f"table_rows:{main_section_selector}", 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody tr"))
             )
-            print(f"{COLOR_BLUE}At least one row is present in table body. Content loaded.{COLOR_RESET}")
+            logger.info("At least one row is present in table body. Content loaded.")
 
         except TimeoutException as e:
-            screenshot_name = f"error_table_load_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_name)
-            print(f"{COLOR_ORANGE}Warning: Timeout waiting for main section, tab, or table structure within {main_section_selector}. This might mean the table is empty or failed to load within the given time. Error: {type(e).__name__}: {e}. Proceeding but returning potentially empty data.{COLOR_RESET}")
+            self.failure_artifacts.capture("error_table_load", selector=main_section_selector)
+            logger.warning(f"Warning: Timeout waiting for main section, tab, or table structure within {main_section_selector}. This might mean the table is empty or failed to load within the given time. Error: {type(e).__name__}: {e}. Proceeding but returning potentially empty data.")
             return []
         except Exception as e:
-            screenshot_name = f"error_table_scrape_unexpected_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_name)
-            print(f"{COLOR_RED}An unexpected error occurred during table setup for {main_section_selector}. Screenshot saved to {screenshot_name}. Error: {type(e).__name__}: {e}{COLOR_RESET}")
+            artifact_path = self.failure_artifacts.capture("error_table_scrape_unexpected", selector=main_section_selector, context={"error": str(e)})
+            logger.error(f"An unexpected error occurred during table setup for {main_section_selector}. Diagnostics: {artifact_path or 'not captured (throttled)'}. Error: {type(e).__name__}: {e}")
             return []
 
 
         current_page_num = 1
         try:
-            initial_active_page_text = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, active_page_selector))).text
+            initial_active_page_text = self.timeouts.wait(self.driver, "active_page", 5, optional=True).until(EC.presence_of_element_located((By.CSS_SELECTOR, active_page_selector))).text
             current_page_num = int(initial_active_page_text)
         except (TimeoutException, ValueError):
-            print(f"{COLOR_ORANGE}Could not determine initial active page number, assuming 1.{COLOR_RESET}")
+            logger.warning("Could not determine initial active page number, assuming 1.")
             current_page_num = 1
 
   
         if current_page_num != 1:
-            print(f"{COLOR_ORANGE}Table not on page 1 ({current_page_num}). Attempting to navigate back to page 1 using 'Prev' button.{COLOR_RESET}")
+            logger.warning(f"Table not on page 1 ({current_page_num}). Attempting to navigate back to page 1 using 'Prev' button.")
             
             while current_page_num > 1:
                 try:
-                    prev_button = WebDriverWait(self.driver, 5).until( # Shorter wait for prev button
+                    prev_button = self.timeouts.wait(self.driver, "prev_button", 5).until( # Shorter wait for prev button
                         EC.element_to_be_clickable((By.CSS_SELECTOR, prev_button_selector))
                     )
                     
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", prev_button)
                     time.sleep(0.2) 
 
-                    print(f"{COLOR_BLUE}Clicking 'Prev' button to go from page {current_page_num}...{COLOR_RESET}")
+                    logger.info(f"Clicking 'Prev' button to go from page {current_page_num}...")
                     self.driver.execute_script("arguments[0].click();", prev_button)
                     
                     old_page_num_for_wait = current_page_num
-                    print(f"{COLOR_BLUE}Waiting for page to change from {old_page_num_for_wait}...{COLOR_RESET}")
-                    WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
+                    logger.info(f"Waiting for page to change from {old_page_num_for_wait}...")
+                    self.timeouts.wait(self.driver, "page_change", 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
                     
                     new_active_page_text = self.driver.find_element(By.CSS_SELECTOR, active_page_selector).text
                     try:
                         new_page_number = int(new_active_page_text)
-                        print(f"{COLOR_BLUE}Successfully moved back to page {new_page_number}.{COLOR_RESET}")
+                        logger.info(f"Successfully moved back to page {new_page_number}.")
                         current_page_num = new_page_number
                         time.sleep(.2) 
                     except ValueError:
-                        print(f"{COLOR_ORANGE}Warning: Could not parse new active page number '{new_active_page_text}'. Ending 'Prev' navigation.{COLOR_RESET}")
+                        logger.warning(f"Warning: Could not parse new active page number '{new_active_page_text}'. Ending 'Prev' navigation.")
                         break 
                     
                 except (TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException) as e:
-                    print(f"{COLOR_ORANGE}Error navigating back using 'Prev' button. Error: {type(e).__name__}: {e}.{COLOR_RESET}")
-                    print(f"{COLOR_ORANGE}Skipping scraping for this table as initial state cannot be guaranteed.{COLOR_RESET}")
+                    logger.warning(f"Error navigating back using 'Prev' button. Error: {type(e).__name__}: {e}.")
+                    logger.warning("Skipping scraping for this table as initial state cannot be guaranteed.")
                     return [] 
             
             if current_page_num != 1:
-                print(f"{COLOR_ORANGE}Failed to reach page 1. Currently on page {current_page_num}. Exiting table scraping.{COLOR_RESET}")
+                logger.warning(f"Failed to reach page 1. Currently on page {current_page_num}. Exiting table scraping.")
                 return [] 
 
-        print(f"{COLOR_BLUE}Successfully positioned on page 1 of the table.{COLOR_RESET}")
+        logger.info("Successfully positioned on page 1 of the table.")
 
         while True:
-            print(f"{COLOR_BLUE}--- Scraping data from page {current_page_num} of {main_section_selector} ---{COLOR_RESET}")
+            logger.info(f"--- Scraping data from page {current_page_num} of {main_section_selector} ---")
             
             try:
-                # Re-find table to avoid stale elements
-                table_body = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody")))
+                if current_page_num == 1 and first_page_rows:
+                    # Page 1 was already read by the incremental fingerprint pass
+                    logger.info(f"Reusing the {len(first_page_rows)} rows of page 1 read for the table fingerprint.")
+                    page_scraped_rows_data.extend(first_page_rows)
+                else:
+                    # Re-find table to avoid stale elements
+                    table_body = self.timeouts.wait(self.driver, "table_body", 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody")))
                 
-                # Scrape headers only once
-                if not headers: 
-                    header_elements = table_body.find_elements(By.XPATH, "./preceding-sibling::thead/tr/th") # Adjusted to find headers relative to tbody
-                    headers = [header_el.text for header_el in header_elements]
-                    if not headers:
-                        print(f"{COLOR_RED}Error: No table headers found for {table_selector}. Cannot proceed.{COLOR_RESET}")
-                        break 
-                    print(f"{COLOR_BLUE}Headers found: {headers}{COLOR_RESET}")
+                    # Scrape headers only once
+                    if not headers: 
+                        header_elements = table_body.find_elements(By.XPATH, "./preceding-sibling::thead/tr/th") # Adjusted to find headers relative to tbody
+                        headers = [header_el.text for header_el in header_elements]
+                        if not headers:
+                            logger.error(f"Error: No table headers found for {table_selector}. Cannot proceed.")
+                            break 
+                        logger.info(f"Headers found: {headers}")
                 
-                row_elements = table_body.find_elements(By.TAG_NAME, "tr")
-                if not row_elements: 
-                    print(f"{COLOR_BLUE}No more rows found. Ending scraping for this table.{COLOR_RESET}")
-                    break 
+                    row_elements = table_body.find_elements(By.TAG_NAME, "tr")
+                    if not row_elements: 
+                        logger.info("No more rows found. Ending scraping for this table.")
+                        break 
 
-                print(f"{COLOR_BLUE}Found {len(row_elements)} rows on page {current_page_num}.{COLOR_RESET}")
-                for row in row_elements:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    row_data = {}
-                    for i, cell in enumerate(cells):
-                        if i < len(headers):
-                            col_header = headers[i]
-                            # Use the new helper to extract cell content, including the exited deal flag
-                            extracted_data = self._extract_cell_content(cell, col_header)
-                            row_data.update(extracted_data)
+                    logger.info(f"Found {len(row_elements)} rows on page {current_page_num}.")
+                    for row in row_elements:
+                        cells = row.find_elements(By.TAG_NAME, "td")
+                        row_data = {}
+                        for i, cell in enumerate(cells):
+                            if i < len(headers):
+                                col_header = headers[i]
+                                # Use the new helper to extract cell content, including the exited deal flag
+                                extracted_data = self._extract_cell_content(cell, col_header)
+                                row_data.update(extracted_data)
                                 
-                    page_scraped_rows_data.append(row_data) 
+                        page_scraped_rows_data.append(row_data) 
+
+                    if self.replay_recorder is not None:
+                        self.replay_recorder.record_table_page(
+                            main_section_selector, current_page_num,
+                            self.driver.find_element(By.CSS_SELECTOR, main_section_selector).get_attribute("outerHTML")
+                        )
+                self._keep_lease_alive()
                 
+                if max_pages and current_page_num >= max_pages:
+                    logger.info(f"Scraped the first {max_pages} page(s) of {main_section_selector} as requested. Stopping pagination.")
+                    break
+
                 # Pagination Logic
-                next_button_to_click = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_arrow_button_selector)))
+                next_button_to_click = self.timeouts.wait(self.driver, "next_button", 5, optional=True).until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_arrow_button_selector)))
                 if next_button_to_click.get_attribute("aria-disabled") == "true":
-                    print(f"{COLOR_BLUE}Next button is disabled (last page). Ending pagination.{COLOR_RESET}")
+                    logger.info("Next button is disabled (last page). Ending pagination.")
                     break
 
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button_to_click) 
@@ -506,19 +560,19 @@ class WebScraper:
                 self.driver.execute_script("arguments[0].click();", next_button_to_click)
 
                 old_page_num_for_wait = current_page_num
-                print(f"{COLOR_BLUE}Waiting for page to change from {old_page_num_for_wait}...{COLOR_RESET}")
-                WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
+                logger.info(f"Waiting for page to change from {old_page_num_for_wait}...")
+                self.timeouts.wait(self.driver, "page_change", 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
                 
                 new_active_page_text = self.driver.find_element(By.CSS_SELECTOR, active_page_selector).text
                 current_page_num = int(new_active_page_text)
-                print(f"{COLOR_BLUE}Successfully moved to page {current_page_num}.{COLOR_RESET}")
+                logger.info(f"Successfully moved to page {current_page_num}.")
                 time.sleep(0.2)
 
             except (TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException) as e:
-                print(f"{COLOR_ORANGE}No more 'Next' button found or content did not update as expected. Ending pagination for {main_section_selector}. Error: {type(e).__name__}: {e}{COLOR_RESET}")
+                logger.warning(f"No more 'Next' button found or content did not update as expected. Ending pagination for {main_section_selector}. Error: {type(e).__name__}: {e}")
                 break 
             except Exception as e: 
-                print(f"{COLOR_RED}An unexpected error occurred during table scraping and pagination: {type(e).__name__}: {e}{COLOR_RESET}")
+                logger.error(f"An unexpected error occurred during table scraping and pagination: {type(e).__name__}: {e}")
                 break
         
         return page_scraped_rows_data
@@ -543,12 +597,12 @@ class WebScraper:
             xpath_main_section_base = '//' + xpath_main_section_base
 
         try:
-            print(f"{COLOR_BLUE}Waiting for main section ({main_section_selector}) to be visible (up to {initial_section_wait}s)...{COLOR_RESET}")
+            logger.info(f"Waiting for main section ({main_section_selector}) to be visible...")
             WebDriverWait(self.driver, initial_section_wait).until(EC.visibility_of_element_located((By.CSS_SELECTOR, main_section_selector)))
-            print(f"{COLOR_BLUE}Main section ({main_section_selector}) found and visible.{COLOR_RESET}")
+            logger.info(f"Main section ({main_section_selector}) found and visible.")
 
             if tab_text_to_find:
-                print(f"{COLOR_BLUE}Attempting to find and activate tab with text '{tab_text_to_find}' within {main_section_selector} (up to 10s)...{COLOR_RESET}")
+                logger.info(f"Attempting to find and activate tab with text '{tab_text_to_find}' within {main_section_selector} (up to 10s)...")
                 tab_xpath = (
                     f"{xpath_main_section_base}//a[.//span[normalize-space(text())='{tab_text_to_find}']] | "
                     f"{xpath_main_section_base}//a[normalize-space(text())='{tab_text_to_find}']"
@@ -556,43 +610,43 @@ class WebScraper:
                 
                 try:
                     target_tab_element = WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.XPATH, tab_xpath)))
-                    print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' found and visible.{COLOR_RESET}")
+                    logger.info(f"Tab with text '{tab_text_to_find}' found and visible.")
 
                     if target_tab_element.get_attribute("aria-selected") != "true":
-                        print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' is not active. Clicking to activate...{COLOR_RESET}")
+                        logger.info(f"Tab with text '{tab_text_to_find}' is not active. Clicking to activate...")
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target_tab_element)
                         time.sleep(0.5)
                         self.driver.execute_script("arguments[0].click();", target_tab_element)
                         
                         WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.XPATH, tab_xpath + '[@aria-selected="true"]')))
-                        print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' activated.{COLOR_RESET}")
+                        logger.info(f"Tab with text '{tab_text_to_find}' activated.")
                     else:
-                        print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' is already active.{COLOR_RESET}")
+                        logger.info(f"Tab with text '{tab_text_to_find}' is already active.")
                     time.sleep(0.5)
                 except (TimeoutException, NoSuchElementException, ElementClickInterceptedException) as e:
-                    print(f"{COLOR_ORANGE}Warning: Specific tab '{tab_text_to_find}' not found or could not be activated within {main_section_selector}. Error: {type(e).__name__}: {e}. Proceeding to scrape the default visible table.{COLOR_RESET}")
+                    logger.warning(f"Warning: Specific tab '{tab_text_to_find}' not found or could not be activated within {main_section_selector}. Error: {type(e).__name__}: {e}. Proceeding to scrape the default visible table.")
 
-            print(f"{COLOR_BLUE}Waiting for table '{table_selector}' to be visible (up to 10s)...{COLOR_RESET}")
+            logger.info(f"Waiting for table '{table_selector}' to be visible (up to 10s)...")
             table = WebDriverWait(self.driver, 10).until(
                 EC.visibility_of_element_located((By.CSS_SELECTOR, table_selector))
             )
-            print(f"{COLOR_BLUE}Table is visible.{COLOR_RESET}")
+            logger.info("Table is visible.")
 
             loading_box_selector = f'{main_section_selector} div.box-loading'
             try:
-                print(f"{COLOR_BLUE}Waiting for loading box '{loading_box_selector}' to disappear (up to 5s)...{COLOR_RESET}")
+                logger.info(f"Waiting for loading box '{loading_box_selector}' to disappear (up to 5s)...")
                 WebDriverWait(self.driver, 5).until(
                     EC.invisibility_of_element_located((By.CSS_SELECTOR, loading_box_selector))
                 )
-                print(f"{COLOR_BLUE}Loading box disappeared (or was not present).{COLOR_RESET}")
+                logger.info("Loading box disappeared (or was not present).")
             except TimeoutException:
-                print(f"{COLOR_ORANGE}Warning: Loading box '{loading_box_selector}' did not disappear within 5s. Proceeding anyway.{COLOR_RESET}")
+                logger.warning(f"Warning: Loading box '{loading_box_selector}' did not disappear within 5s. Proceeding anyway.")
 
-            print(f"{COLOR_BLUE}Waiting for table body ('{table_selector} tbody') to be present (up to 10s)...{COLOR_RESET}")
+            logger.info(f"Waiting for table body ('{table_selector} tbody') to be present (up to 10s)...")
             table_body_element = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody"))
             )
-            print(f"{COLOR_BLUE}Table body is present.{COLOR_RESET}")
+            logger.info("Table body is present.")
 
             max_retries = 3
             current_retry = 0
@@ -600,10 +654,10 @@ class WebScraper:
             while current_retry < max_retries:
                 rows_in_table = table_body_element.find_elements(By.CSS_SELECTOR, "tr.table__row")
                 if rows_in_table:
-                    print(f"{COLOR_BLUE}Found {len(rows_in_table)} rows (tr.table__row) in table body. Content loaded.{COLOR_RESET}")
+                    logger.info(f"Found {len(rows_in_table)} rows (tr.table__row) in table body. Content loaded.")
                     break
                 else:
-                    print(f"{COLOR_ORANGE}No tr.table__row elements found yet in {main_section_selector}. Retrying in 2 seconds... (Attempt {current_retry + 1}/{max_retries}){COLOR_RESET}")
+                    logger.warning(f"No tr.table__row elements found yet in {main_section_selector}. Retrying in 2 seconds... (Attempt {current_retry + 1}/{max_retries})")
                     time.sleep(2)
                     table_body_element = WebDriverWait(self.driver, 5).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody"))
@@ -611,18 +665,16 @@ class WebScraper:
                 current_retry += 1
             
             if not rows_in_table:
-                print(f"{COLOR_ORANGE}Warning: No visible data rows (tr.table__row) found within table {main_section_selector} after multiple retries. Table is empty or failed to load data.{COLOR_RESET}")
+                logger.warning(f"Warning: No visible data rows (tr.table__row) found within table {main_section_selector} after multiple retries. Table is empty or failed to load data.")
                 return []
 
         except TimeoutException as e:
-            screenshot_name = f"error_table_load_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_name)
-            print(f"{COLOR_ORANGE}Warning: Timeout waiting for main section or table structure within {main_section_selector}. This might mean the table is empty or failed to load within the given time. Error: {type(e).__name__}: {e}. Proceeding but returning potentially empty data.{COLOR_RESET}")
+            self.failure_artifacts.capture("error_table_load", selector=main_section_selector)
+            logger.warning(f"Warning: Timeout waiting for main section or table structure within {main_section_selector}. This might mean the table is empty or failed to load within the given time. Error: {type(e).__name__}: {e}. Proceeding but returning potentially empty data.")
             return []
         except Exception as e:
-            screenshot_name = f"error_table_scrape_unexpected_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_name)
-            print(f"{COLOR_RED}An unexpected error occurred during table setup for {main_section_selector}. Screenshot saved to {screenshot_name}. Error: {type(e).__name__}: {e}{COLOR_RESET}")
+            artifact_path = self.failure_artifacts.capture("error_table_scrape_unexpected", selector=main_section_selector, context={"error": str(e)})
+            logger.error(f"An unexpected error occurred during table setup for {main_section_selector}. Diagnostics: {artifact_path or 'not captured (throttled)'}. Error: {type(e).__name__}: {e}")
             return []
 
         current_page_num = 1
@@ -630,11 +682,11 @@ class WebScraper:
             initial_active_page_text = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, active_page_selector))).text
             current_page_num = int(initial_active_page_text)
         except (TimeoutException, ValueError):
-            print(f"{COLOR_ORANGE}Could not determine initial active page number, assuming 1.{COLOR_RESET}")
+            logger.warning("Could not determine initial active page number, assuming 1.")
             current_page_num = 1
 
         if current_page_num != 1:
-            print(f"{COLOR_ORANGE}Table not on page 1 ({current_page_num}). Attempting to navigate back to page 1 using 'Prev' button.{COLOR_RESET}")
+            logger.warning(f"Table not on page 1 ({current_page_num}). Attempting to navigate back to page 1 using 'Prev' button.")
             
             while current_page_num > 1:
                 try:
@@ -646,32 +698,32 @@ class WebScraper:
                     self.driver.execute_script("arguments[0].click();", prev_button)
                     
                     old_page_num_for_wait = current_page_num
-                    print(f"{COLOR_BLUE}Waiting for page to change from {old_page_num_for_wait}...{COLOR_RESET}")
+                    logger.info(f"Waiting for page to change from {old_page_num_for_wait}...")
                     WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
                     
                     new_active_page_text = self.driver.find_element(By.CSS_SELECTOR, active_page_selector).text
                     try:
                         new_page_number = int(new_active_page_text)
-                        print(f"{COLOR_BLUE}Successfully moved back to page {new_page_number}.{COLOR_RESET}")
+                        logger.info(f"Successfully moved back to page {new_page_number}.")
                         current_page_num = new_page_number
                         time.sleep(.2)
                     except ValueError:
-                        print(f"{COLOR_ORANGE}Warning: Could not parse new active page number '{new_active_page_text}'. Ending 'Prev' navigation.{COLOR_RESET}")
+                        logger.warning(f"Warning: Could not parse new active page number '{new_active_page_text}'. Ending 'Prev' navigation.")
                         break
                     
                 except (TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException) as e:
-                    print(f"{COLOR_ORANGE}Error navigating back using 'Prev' button. Error: {type(e).__name__}: {e}.{COLOR_RESET}")
-                    print(f"{COLOR_ORANGE}Skipping scraping for this table as initial state cannot be guaranteed.{COLOR_RESET}")
+                    logger.warning(f"Error navigating back using 'Prev' button. Error: {type(e).__name__}: {e}.")
+                    logger.warning("Skipping scraping for this table as initial state cannot be guaranteed.")
                     return []
             
             if current_page_num != 1:
-                print(f"{COLOR_ORANGE}Failed to reach page 1. Currently on page {current_page_num}. Exiting table scraping.{COLOR_RESET}")
+                logger.warning(f"Failed to reach page 1. Currently on page {current_page_num}. Exiting table scraping.")
                 return []
 
-        print(f"{COLOR_BLUE}Successfully positioned on page 1 of the table.{COLOR_RESET}")
+        logger.info("Successfully positioned on page 1 of the table.")
 
         while True:
-            print(f"{COLOR_BLUE}--- Scraping data from page {current_page_num} of {main_section_selector} ---{COLOR_RESET}")
+            logger.info(f"--- Scraping data from page {current_page_num} of {main_section_selector} ---")
             
             try:
                 table_body = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody")))
@@ -680,16 +732,16 @@ class WebScraper:
                     header_elements = table_body.find_elements(By.XPATH, "./preceding-sibling::thead/tr/th")
                     headers = [header_el.text for header_el in header_elements]
                     if not headers:
-                        print(f"{COLOR_RED}Error: No table headers found for {table_selector}. Cannot proceed.{COLOR_RESET}")
+                        logger.error(f"Error: No table headers found for {table_selector}. Cannot proceed.")
                         break
-                    print(f"{COLOR_BLUE}Headers found: {headers}{COLOR_RESET}")
+                    logger.info(f"Headers found: {headers}")
                 
                 row_elements = table_body.find_elements(By.TAG_NAME, "tr")
                 if not row_elements:
-                    print(f"{COLOR_BLUE}No more rows found. Ending scraping for this table.{COLOR_RESET}")
+                    logger.info("No more rows found. Ending scraping for this table.")
                     break
 
-                print(f"{COLOR_BLUE}Found {len(row_elements)} rows on page {current_page_num}.{COLOR_RESET}")
+                logger.info(f"Found {len(row_elements)} rows on page {current_page_num}.")
                 for row in row_elements:
                     cells = row.find_elements(By.TAG_NAME, "td")
                     row_data = {}
@@ -703,7 +755,7 @@ class WebScraper:
                 
                 next_button_to_click = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_arrow_button_selector)))
                 if next_button_to_click.get_attribute("aria-disabled") == "true":
-                    print(f"{COLOR_BLUE}Next button is disabled (last page). Ending pagination.{COLOR_RESET}")
+                    logger.info("Next button is disabled (last page). Ending pagination.")
                     break
 
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button_to_click)
@@ -711,24 +763,48 @@ class WebScraper:
                 self.driver.execute_script("arguments[0].click();", next_button_to_click)
 
                 old_page_num_for_wait = current_page_num
-                print(f"{COLOR_BLUE}Waiting for page to change from {old_page_num_for_wait}...{COLOR_RESET}")
+                logger.info(f"Waiting for page to change from {old_page_num_for_wait}...")
                 WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
                 
                 new_active_page_text = self.driver.find_element(By.CSS_SELECTOR, active_page_selector).text
                 current_page_num = int(new_active_page_text)
-                print(f"{COLOR_BLUE}Successfully moved to page {current_page_num}.{COLOR_RESET}")
+                logger.info(f"Successfully moved to page {current_page_num}.")
                 time.sleep(0.2)
 
             except (TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException) as e:
-                print(f"{COLOR_ORANGE}No more 'Next' button found or content did not update as expected. Ending pagination for {main_section_selector}. Error: {type(e).__name__}: {e}{COLOR_RESET}")
+                logger.warning(f"No more 'Next' button found or content did not update as expected. Ending pagination for {main_section_selector}. Error: {type(e).__name__}: {e}")
                 break
             except Exception as e:
-                print(f"{COLOR_RED}An unexpected error occurred during table scraping and pagination: {type(e).__name__}: {e}{COLOR_RESET}")
+                logger.error(f"An unexpected error occurred during table scraping and pagination: {type(e).__name__}: {e}")
                 break
         
         return page_scraped_rows_data
 
 
+    def _keep_lease_alive(self):
+        if self.lease_keeper is None:
+            return
+        try:
+            self.lease_keeper()
+        except Exception as e:
+            logger.warning(f"Could not renew the crawl lease: {e}")
+
+    def _get_table_page_count(self, main_section_selector):
+        """
+        Reads the number of pages from a table's pagination bar without paginating.
+        Returns 1 when the table has no pagination.
+        """
+        caption_selector = f'{main_section_selector} nav[aria-label="Pagination"] button span.button__caption'
+        page_numbers = []
+        try:
+            for caption in self.driver.find_elements(By.CSS_SELECTOR, caption_selector):
+                text = caption.text.strip()
+                if text.isdigit():
+                    page_numbers.append(int(text))
+        except StaleElementReferenceException:
+            pass
+        return max(page_numbers) if page_numbers else 1
+
     def _get_also_known_as(self):
         """
         Extracts the "Also Known As" value from the profile information section.
@@ -760,23 +836,23 @@ class WebScraper:
             "contact_mobile_phone": None,
         }
         
-        print(f"{COLOR_BLUE}Attempting to scrape primary contact information...{COLOR_RESET}")
+        logger.info("Attempting to scrape primary contact information...")
         
         try:
             contact_section_xpath = "//span[normalize-space(text())='Primary Contact']/ancestor::div[contains(@class, 'grid__cell') and contains(@class, 'grid__cell_4')]"
             
             start_time_contact_section = time.time()
-            contact_section_element = WebDriverWait(self.driver, 5).until( 
+            contact_section_element = self.timeouts.wait(self.driver, "contact_section", 5, optional=True).until( 
                 EC.presence_of_element_located((By.XPATH, contact_section_xpath))
             )
             elapsed_time_contact_section = time.time() - start_time_contact_section
-            print(f"{COLOR_BLUE}Primary Contact section found in {elapsed_time_contact_section:.2f} seconds.{COLOR_RESET}")
+            logger.info(f"Primary Contact section found in {elapsed_time_contact_section:.2f} seconds.")
 
             ul_contact_info = contact_section_element.find_element(By.CSS_SELECTOR, "ul.contact-info")
             list_items = ul_contact_info.find_elements(By.TAG_NAME, "li")
             
             if not list_items:
-                print(f"{COLOR_ORANGE}No list items found in primary contact info section.{COLOR_RESET}")
+                logger.warning("No list items found in primary contact info section.")
                 return result
 
             if len(list_items) > 0:
@@ -785,7 +861,7 @@ class WebScraper:
                     result["contact_name"] = name_element.text.strip()
                     result["contact_profile_link"] = urljoin(self.driver.current_url, name_element.get_attribute("href"))
                 except NoSuchElementException:
-                    print(f"{COLOR_ORANGE}Contact name/profile link not found in the first list item.{COLOR_RESET}")
+                    logger.warning("Contact name/profile link not found in the first list item.")
 
             if len(list_items) > 1:
                 result["contact_title"] = list_items[1].text.strip()
@@ -804,15 +880,15 @@ class WebScraper:
                 elif text.startswith("Mobile:"):
                     result["contact_mobile_phone"] = text.replace("Mobile:", "").strip()
                 
-            print(f"{COLOR_BLUE}Successfully scraped primary contact information.{COLOR_RESET}")
+            logger.info("Successfully scraped primary contact information.")
             return result
 
         except TimeoutException:
-            print(f"{COLOR_ORANGE}Timeout waiting for primary contact information section. Skipping primary contact info.{COLOR_RESET}")
+            logger.warning("Timeout waiting for primary contact information section. Skipping primary contact info.")
         except NoSuchElementException:
-            print(f"{COLOR_ORANGE}Primary contact information section or elements within not found. Skipping primary contact info.{COLOR_RESET}")
+            logger.warning("Primary contact information section or elements within not found. Skipping primary contact info.")
         except Exception as e:
-            print(f"{COLOR_RED}Error scraping primary contact information: {e}{COLOR_RESET}")
+            logger.error(f"Error scraping primary contact information: {e}")
         
         return result 
 
@@ -830,7 +906,7 @@ class WebScraper:
             "office_phone": None
         }
 
-        print(f"{COLOR_BLUE}Attempting to scrape office address information...{COLOR_RESET}")
+        logger.info("Attempting to scrape office address information...")
 
         # REFINED SELECTOR: Target the ul.contact-info that is a direct child of
         # div.element-group__item, which is a direct child of a div with
@@ -840,16 +916,16 @@ class WebScraper:
         start_time_address_section = time.time()
         try:
             # Use presence_of_element_located to ensure the element is in the DOM
-            ul_address_info = WebDriverWait(self.driver, 5).until( 
+            ul_address_info = self.timeouts.wait(self.driver, "office_address", 5, optional=True).until( 
                 EC.presence_of_element_located((By.CSS_SELECTOR, address_section_selector))
             )
             elapsed_time_address_section = time.time() - start_time_address_section
-            print(f"{COLOR_BLUE}Office address section found in {elapsed_time_address_section:.2f} seconds.{COLOR_RESET}")
+            logger.info(f"Office address section found in {elapsed_time_address_section:.2f} seconds.")
 
             list_items = ul_address_info.find_elements(By.TAG_NAME, "li")
 
             if not list_items:
-                print(f"{COLOR_ORANGE}No list items found in office address section.{COLOR_RESET}")
+                logger.warning("No list items found in office address section.")
                 return result
 
             address_lines_found = []
@@ -869,15 +945,15 @@ class WebScraper:
                 elif text.startswith("Mobile:"):
                     result["contact_mobile_phone"] = text.replace("Mobile:", "").strip()
                 
-            print(f"{COLOR_BLUE}Successfully scraped office address information.{COLOR_RESET}")
+            logger.info("Successfully scraped office address information.")
             return result
 
         except TimeoutException:
-            print(f"{COLOR_ORANGE}Timeout waiting for office address information section. Skipping primary contact info.{COLOR_RESET}")
+            logger.warning("Timeout waiting for office address information section. Skipping primary contact info.")
         except NoSuchElementException:
-            print(f"{COLOR_ORANGE}Office address section or elements within not found. Skipping primary contact info.{COLOR_RESET}")
+            logger.warning("Office address section or elements within not found. Skipping primary contact info.")
         except Exception as e:
-            print(f"{COLOR_RED}Error scraping office address information: {e}{COLOR_RESET}")
+            logger.error(f"Error scraping office address information: {e}")
         
         return result
 
@@ -890,7 +966,7 @@ class WebScraper:
         value = None
         # Use a shorter, dedicated wait for quickly checking if an element exists
         # This will fail faster if the element is not found.
-        quick_wait = WebDriverWait(self.driver, 2) # Set a shorter timeout, e.g., 2 seconds
+        quick_wait = self.timeouts.wait(self.driver, f"profile_field:{label_text}", 2) # Learned timeout; 2 seconds until the field has samples, backs off after a timeout
 
         xpath_selector = (
             f"//div[contains(@class, 'table-list__cell_caption')]//label/span[normalize-space(text())='{label_text}']"
@@ -900,7 +976,7 @@ class WebScraper:
         
         start_time = time.time() # Record start time
         try:
-            print(f"{COLOR_BLUE}Attempting to find '{label_text}' using XPath: {xpath_selector} with a quick wait...{COLOR_RESET}")
+            logger.info(f"Attempting to find '{label_text}' using XPath: {xpath_selector} with a quick wait...")
             element = quick_wait.until( # Use the quick_wait here
                 EC.presence_of_element_located((By.XPATH, xpath_selector))
             )
@@ -911,22 +987,23 @@ class WebScraper:
             
             end_time = time.time() # Record end time
             elapsed_time = end_time - start_time
-            print(f"{COLOR_BLUE}Found '{label_text}': {value} in {elapsed_time:.2f} seconds.{COLOR_RESET}")
+            logger.info(f"Found '{label_text}': {value} in {elapsed_time:.2f} seconds.")
         except TimeoutException:
             end_time = time.time() # Record end time even on timeout
             elapsed_time = end_time - start_time
-            print(f"{COLOR_ORANGE}Field '{label_text}' not found on page within quick timeout ({elapsed_time:.2f} seconds). Skipping.{COLOR_RESET}")
+            logger.warning(f"Field '{label_text}' not found on page within quick timeout ({elapsed_time:.2f} seconds). Skipping.")
         except NoSuchElementException:
             end_time = time.time() # Record end time
             elapsed_time = end_time - start_time
-            print(f"{COLOR_ORANGE}Field '{label_text}' element not found ({elapsed_time:.2f} seconds). Skipping.{COLOR_RESET}")
+            logger.warning(f"Field '{label_text}' element not found ({elapsed_time:.2f} seconds). Skipping.")
         except Exception as e:
             end_time = time.time() # Record end time
             elapsed_time = time.time() - start_time
-            print(f"{COLOR_RED}Error extracting '{label_text}' ({elapsed_time:.2f} seconds): {e}{COLOR_RESET}")
+            logger.error(f"Error extracting '{label_text}' ({elapsed_time:.2f} seconds): {e}")
         return value
 
-    def _clean_url(self, url):
+    @staticmethod
+    def _clean_url(url):
         """Removes http/https and trailing slashes from a URL, preserving www. if present."""
         if not url:
             return None
@@ -940,7 +1017,7 @@ class WebScraper:
             
         return cleaned_url
 
-    def _scrape_investments_table(self, main_section_selector, table_selector, tab_text_to_find=None, initial_section_wait=10):
+    def _scrape_investments_table(self, main_section_selector, table_selector, tab_text_to_find=None, initial_section_wait=10, max_pages=None, first_page_rows=None):
         page_scraped_rows_data = []
         headers = []
         
@@ -955,56 +1032,56 @@ class WebScraper:
             xpath_main_section_base = '//' + xpath_main_section_base
 
         try:
-            print(f"{COLOR_BLUE}Waiting for main section ({main_section_selector}) to be visible (up to {initial_section_wait}s)...{COLOR_RESET}")
-            WebDriverWait(self.driver, initial_section_wait).until(EC.visibility_of_element_located((By.CSS_SELECTOR, main_section_selector)))
-            print(f"{COLOR_BLUE}Main section ({main_section_selector}) found and visible.{COLOR_RESET}")
+            logger.info(f"Waiting for main section ({main_section_selector}) to be visible...")
+            self.timeouts.wait(self.driver, f"section_visible:{main_section_selector}", initial_section_wait).until(EC.visibility_of_element_located((By.CSS_SELECTOR, main_section_selector)))
+            logger.info(f"Main section ({main_section_selector}) found and visible.")
 
             if tab_text_to_find:
-                print(f"{COLOR_BLUE}Attempting to find and activate tab with text '{tab_text_to_find}' within {main_section_selector} (up to 10s)...{COLOR_RESET}")
+                logger.info(f"Attempting to find and activate tab with text '{tab_text_to_find}' within {main_section_selector} (up to 10s)...")
                 tab_xpath = (
                     f"{xpath_main_section_base}//a[.//span[normalize-space(text())='{tab_text_to_find}']] | "
                     f"{xpath_main_section_base}//a[normalize-space(text())='{tab_text_to_find}']"
                 )
                 
                 try:
-                    target_tab_element = WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located((By.XPATH, tab_xpath)))
-                    print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' found and visible.{COLOR_RESET}")
+                    target_tab_element = self.timeouts.wait(self.driver, "tab_visible", 10, optional=True).until(EC.visibility_of_element_located((By.XPATH, tab_xpath)))
+                    logger.info(f"Tab with text '{tab_text_to_find}' found and visible.")
 
                     if target_tab_element.get_attribute("aria-selected") != "true":
-                        print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' is not active. Clicking to activate...{COLOR_RESET}")
+                        logger.info(f"Tab with text '{tab_text_to_find}' is not active. Clicking to activate...")
                         self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target_tab_element)
                         time.sleep(0.5)
                         self.driver.execute_script("arguments[0].click();", target_tab_element)
                         
-                        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.XPATH, tab_xpath + '[@aria-selected="true"]')))
-                        print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' activated.{COLOR_RESET}")
+                        self.timeouts.wait(self.driver, "tab_activated", 10).until(EC.element_to_be_clickable((By.XPATH, tab_xpath + '[@aria-selected="true"]')))
+                        logger.info(f"Tab with text '{tab_text_to_find}' activated.")
                     else:
-                        print(f"{COLOR_BLUE}Tab with text '{tab_text_to_find}' is already active.{COLOR_RESET}")
+                        logger.info(f"Tab with text '{tab_text_to_find}' is already active.")
                     time.sleep(0.5)
                 except (TimeoutException, NoSuchElementException, ElementClickInterceptedException) as e:
-                    print(f"{COLOR_ORANGE}Warning: Specific tab '{tab_text_to_find}' not found or could not be activated within {main_section_selector}. Error: {type(e).__name__}: {e}. Proceeding to scrape the default visible table.{COLOR_RESET}")
+                    logger.warning(f"Warning: Specific tab '{tab_text_to_find}' not found or could not be activated within {main_section_selector}. Error: {type(e).__name__}: {e}. Proceeding to scrape the default visible table.")
 
-            print(f"{COLOR_BLUE}Waiting for table '{table_selector}' to be visible (up to 10s)...{COLOR_RESET}")
-            table = WebDriverWait(self.driver, 10).until(
+            logger.info(f"Waiting for table '{table_selector}' to be visible (up to 10s)...")
+            table = self.timeouts.wait(self.driver, f"table_visible:{main_section_selector}", 10).until(
                 EC.visibility_of_element_located((By.CSS_SELECTOR, table_selector))
             )
-            print(f"{COLOR_BLUE}Table is visible.{COLOR_RESET}")
+            logger.info("Table is visible.")
 
             loading_box_selector = f'{main_section_selector} div.box-loading'
             try:
-                print(f"{COLOR_BLUE}Waiting for loading box '{loading_box_selector}' to disappear (up to 5s)...{COLOR_RESET}")
-                WebDriverWait(self.driver, 5).until(
+                logger.info(f"Waiting for loading box '{loading_box_selector}' to disappear (up to 5s)...")
+                self.timeouts.wait(self.driver, "loading_box_gone", 5, optional=True).until(
                     EC.invisibility_of_element_located((By.CSS_SELECTOR, loading_box_selector))
                 )
-                print(f"{COLOR_BLUE}Loading box disappeared (or was not present).{COLOR_RESET}")
+                logger.info("Loading box disappeared (or was not present).")
             except TimeoutException:
-                print(f"{COLOR_ORANGE}Warning: Loading box '{loading_box_selector}' did not disappear within 5s. Proceeding anyway.{COLOR_RESET}")
+                logger.warning(f"Warning: Loading box '{loading_box_selector}' did not disappear within 5s. Proceeding anyway.")
 
-            print(f"{COLOR_BLUE}Waiting for table body ('{table_selector} tbody') to be present (up to 10s)...{COLOR_RESET}")
-            table_body_element = WebDriverWait(self.driver, 10).until(
+            logger.info(f"Waiting for table body ('{table_selector} tbody') to be present (up to 10s)...")
+            table_body_element = self.timeouts.wait(self.driver, "table_body", 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody"))
             )
-            print(f"{COLOR_BLUE}Table body is present.{COLOR_RESET}")
+            logger.info("Table body is present.")
 
             max_retries = 3
             current_retry = 0
@@ -1012,45 +1089,43 @@ class WebScraper:
             while current_retry < max_retries:
                 rows_in_table = table_body_element.find_elements(By.CSS_SELECTOR, "tr.table__row")
                 if rows_in_table:
-                    print(f"{COLOR_BLUE}Found {len(rows_in_table)} rows (tr.table__row) in table body. Content loaded.{COLOR_RESET}")
+                    logger.info(f"Found {len(rows_in_table)} rows (tr.table__row) in table body. Content loaded.")
                     break
                 else:
-                    print(f"{COLOR_ORANGE}No tr.table__row elements found yet in {main_section_selector}. Retrying in 2 seconds... (Attempt {current_retry + 1}/{max_retries}){COLOR_RESET}")
+                    logger.warning(f"No tr.table__row elements found yet in {main_section_selector}. Retrying in 2 seconds... (Attempt {current_retry + 1}/{max_retries})")
                     time.sleep(2)
-                    table_body_element = WebDriverWait(self.driver, 5).until(
+                    table_body_element = self.timeouts.wait(self.driver, "table_body", 5).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody"))
                     )
                 current_retry += 1
             
             if not rows_in_table:
-                print(f"{COLOR_ORANGE}Warning: No visible data rows (tr.table__row) found within table {main_section_selector} after multiple retries. Table is empty or failed to load data.{COLOR_RESET}")
+                logger.warning(f"Warning: No visible data rows (tr.table__row) found within table {main_section_selector} after multiple retries. Table is empty or failed to load data.")
                 return []
 
         except TimeoutException as e:
-            screenshot_name = f"error_table_load_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_name)
-            print(f"{COLOR_ORANGE}Warning: Timeout waiting for main section or table structure within {main_section_selector}. This might mean the table is empty or failed to load within the given time. Error: {type(e).__name__}: {e}. Proceeding but returning potentially empty data.{COLOR_RESET}")
+            self.failure_artifacts.capture("error_table_load", selector=main_section_selector)
+            logger.warning(f"Warning: Timeout waiting for main section or table structure within {main_section_selector}. This might mean the table is empty or failed to load within the given time. Error: {type(e).__name__}: {e}. Proceeding but returning potentially empty data.")
             return []
         except Exception as e:
-            screenshot_name = f"error_table_scrape_unexpected_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_name)
-            print(f"{COLOR_RED}An unexpected error occurred during table setup for {main_section_selector}. Screenshot saved to {screenshot_name}. Error: {type(e).__name__}: {e}{COLOR_RESET}")
+            artifact_path = self.failure_artifacts.capture("error_table_scrape_unexpected", selector=main_section_selector, context={"error": str(e)})
+            logger.error(f"An unexpected error occurred during table setup for {main_section_selector}. Diagnostics: {artifact_path or 'not captured (throttled)'}. Error: {type(e).__name__}: {e}")
             return []
 
         current_page_num = 1
         try:
-            initial_active_page_text = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, active_page_selector))).text
+            initial_active_page_text = self.timeouts.wait(self.driver, "active_page", 5, optional=True).until(EC.presence_of_element_located((By.CSS_SELECTOR, active_page_selector))).text
             current_page_num = int(initial_active_page_text)
         except (TimeoutException, ValueError):
-            print(f"{COLOR_ORANGE}Could not determine initial active page number, assuming 1.{COLOR_RESET}")
+            logger.warning("Could not determine initial active page number, assuming 1.")
             current_page_num = 1
 
         if current_page_num != 1:
-            print(f"{COLOR_ORANGE}Table not on page 1 ({current_page_num}). Attempting to navigate back to page 1 using 'Prev' button.{COLOR_RESET}")
+            logger.warning(f"Table not on page 1 ({current_page_num}). Attempting to navigate back to page 1 using 'Prev' button.")
             
             while current_page_num > 1:
                 try:
-                    prev_button = WebDriverWait(self.driver, 5).until(
+                    prev_button = self.timeouts.wait(self.driver, "prev_button", 5).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, prev_button_selector))
                     )
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", prev_button)
@@ -1058,64 +1133,79 @@ class WebScraper:
                     self.driver.execute_script("arguments[0].click();", prev_button)
                     
                     old_page_num_for_wait = current_page_num
-                    print(f"{COLOR_BLUE}Waiting for page to change from {old_page_num_for_wait}...{COLOR_RESET}")
-                    WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
+                    logger.info(f"Waiting for page to change from {old_page_num_for_wait}...")
+                    self.timeouts.wait(self.driver, "page_change", 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
                     
                     new_active_page_text = self.driver.find_element(By.CSS_SELECTOR, active_page_selector).text
                     try:
                         new_page_number = int(new_active_page_text)
-                        print(f"{COLOR_BLUE}Successfully moved back to page {new_page_number}.{COLOR_RESET}")
+                        logger.info(f"Successfully moved back to page {new_page_number}.")
                         current_page_num = new_page_number
                         time.sleep(.2)
                     except ValueError:
-                        print(f"{COLOR_ORANGE}Warning: Could not parse new active page number '{new_active_page_text}'. Ending 'Prev' navigation.{COLOR_RESET}")
+                        logger.warning(f"Warning: Could not parse new active page number '{new_active_page_text}'. Ending 'Prev' navigation.")
                         break
                     
                 except (TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException) as e:
-                    print(f"{COLOR_ORANGE}Error navigating back using 'Prev' button. Error: {type(e).__name__}: {e}.{COLOR_RESET}")
-                    print(f"{COLOR_ORANGE}Skipping scraping for this table as initial state cannot be guaranteed.{COLOR_RESET}")
+                    logger.warning(f"Error navigating back using 'Prev' button. Error: {type(e).__name__}: {e}.")
+                    logger.warning("Skipping scraping for this table as initial state cannot be guaranteed.")
                     return []
             
             if current_page_num != 1:
-                print(f"{COLOR_ORANGE}Failed to reach page 1. Currently on page {current_page_num}. Exiting table scraping.{COLOR_RESET}")
+                logger.warning(f"Failed to reach page 1. Currently on page {current_page_num}. Exiting table scraping.")
                 return []
 
-        print(f"{COLOR_BLUE}Successfully positioned on page 1 of the table.{COLOR_RESET}")
+        logger.info("Successfully positioned on page 1 of the table.")
 
         while True:
-            print(f"{COLOR_BLUE}--- Scraping data from page {current_page_num} of {main_section_selector} ---{COLOR_RESET}")
+            logger.info(f"--- Scraping data from page {current_page_num} of {main_section_selector} ---")
             
             try:
-                table_body = WebDriverWait(self.driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody")))
+                if current_page_num == 1 and first_page_rows:
+                    # Page 1 was already read by the incremental fingerprint pass
+                    logger.info(f"Reusing the {len(first_page_rows)} rows of page 1 read for the table fingerprint.")
+                    page_scraped_rows_data.extend(first_page_rows)
+                else:
+                    table_body = self.timeouts.wait(self.driver, "table_body", 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, f"{table_selector} tbody")))
                 
-                if not headers:
-                    header_elements = table_body.find_elements(By.XPATH, "./preceding-sibling::thead/tr/th")
-                    headers = [header_el.text for header_el in header_elements]
                     if not headers:
-                        print(f"{COLOR_RED}Error: No table headers found for {table_selector}. Cannot proceed.{COLOR_RESET}")
-                        break
-                    print(f"{COLOR_BLUE}Headers found: {headers}{COLOR_RESET}")
+                        header_elements = table_body.find_elements(By.XPATH, "./preceding-sibling::thead/tr/th")
+                        headers = [header_el.text for header_el in header_elements]
+                        if not headers:
+                            logger.error(f"Error: No table headers found for {table_selector}. Cannot proceed.")
+                            break
+                        logger.info(f"Headers found: {headers}")
                 
-                row_elements = table_body.find_elements(By.TAG_NAME, "tr")
-                if not row_elements:
-                    print(f"{COLOR_BLUE}No more rows found. Ending scraping for this table.{COLOR_RESET}")
-                    break
+                    row_elements = table_body.find_elements(By.TAG_NAME, "tr")
+                    if not row_elements:
+                        logger.info("No more rows found. Ending scraping for this table.")
+                        break
 
-                print(f"{COLOR_BLUE}Found {len(row_elements)} rows on page {current_page_num}.{COLOR_RESET}")
-                for row in row_elements:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    row_data = {}
-                    for i, cell in enumerate(cells):
-                        if i < len(headers):
-                            col_header = headers[i]
-                            extracted_data = self._extract_cell_content(cell, col_header)
-                            row_data.update(extracted_data)
+                    logger.info(f"Found {len(row_elements)} rows on page {current_page_num}.")
+                    for row in row_elements:
+                        cells = row.find_elements(By.TAG_NAME, "td")
+                        row_data = {}
+                        for i, cell in enumerate(cells):
+                            if i < len(headers):
+                                col_header = headers[i]
+                                extracted_data = self._extract_cell_content(cell, col_header)
+                                row_data.update(extracted_data)
                                 
-                    page_scraped_rows_data.append(row_data)
+                        page_scraped_rows_data.append(row_data)
+
+                    if self.replay_recorder is not None:
+                        self.replay_recorder.record_table_page(
+                            main_section_selector, current_page_num,
+                            self.driver.find_element(By.CSS_SELECTOR, main_section_selector).get_attribute("outerHTML")
+                        )
+                self._keep_lease_alive()
                 
-                next_button_to_click = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_arrow_button_selector)))
+                if max_pages and current_page_num >= max_pages:
+                    logger.info(f"Scraped the first {max_pages} page(s) of {main_section_selector} as requested. Stopping pagination.")
+                    break
+                next_button_to_click = self.timeouts.wait(self.driver, "next_button", 5, optional=True).until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_arrow_button_selector)))
                 if next_button_to_click.get_attribute("aria-disabled") == "true":
-                    print(f"{COLOR_BLUE}Next button is disabled (last page). Ending pagination.{COLOR_RESET}")
+                    logger.info("Next button is disabled (last page). Ending pagination.")
                     break
 
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button_to_click)
@@ -1123,29 +1213,110 @@ class WebScraper:
                 self.driver.execute_script("arguments[0].click();", next_button_to_click)
 
                 old_page_num_for_wait = current_page_num
-                print(f"{COLOR_BLUE}Waiting for page to change from {old_page_num_for_wait}...{COLOR_RESET}")
-                WebDriverWait(self.driver, 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
+                logger.info(f"Waiting for page to change from {old_page_num_for_wait}...")
+                self.timeouts.wait(self.driver, "page_change", 10).until(lambda driver: driver.find_element(By.CSS_SELECTOR, active_page_selector).text != str(old_page_num_for_wait))
                 
                 new_active_page_text = self.driver.find_element(By.CSS_SELECTOR, active_page_selector).text
                 current_page_num = int(new_active_page_text)
-                print(f"{COLOR_BLUE}Successfully moved to page {current_page_num}.{COLOR_RESET}")
+                logger.info(f"Successfully moved to page {current_page_num}.")
                 time.sleep(0.2)
 
             except (TimeoutException, NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException) as e:
-                print(f"{COLOR_ORANGE}No more 'Next' button found or content did not update as expected. Ending pagination for {main_section_selector}. Error: {type(e).__name__}: {e}{COLOR_RESET}")
+                logger.warning(f"No more 'Next' button found or content did not update as expected. Ending pagination for {main_section_selector}. Error: {type(e).__name__}: {e}")
                 break
             except Exception as e:
-                print(f"{COLOR_RED}An unexpected error occurred during table scraping and pagination: {type(e).__name__}: {e}{COLOR_RESET}")
+                logger.error(f"An unexpected error occurred during table scraping and pagination: {type(e).__name__}: {e}")
                 break
         
         return page_scraped_rows_data
 
 
-    def scrape_profile_and_affiliates(self, profile_url, current_depth=0, max_depth=5):
-        
+    def _fingerprint_related_tables(self):
+        """
+        Scrapes only the first page of the affiliates and investments tables plus their page
+        counts, and returns the table fingerprint used by the incremental crawl along with
+        the first-page rows, so a re-crawl does not have to read page 1 again.
+        """
+        first_page_affiliates = self._scrape_affiliate_table_old_logic(
+            main_section_selector="section#affiliates",
+            tab_selector_a_tag='a#undefined-affiliates\\/SUBSIDIARY',
+            table_selector="section#affiliates table",
+            initial_section_wait=3,
+            max_pages=1
+        )
+        affiliates_page_count = self._get_table_page_count("section#affiliates") if first_page_affiliates else 0
+        first_page_investments = self._scrape_investments_table(
+            main_section_selector="section#investments",
+            tab_text_to_find=None,
+            table_selector="section#investments table",
+            initial_section_wait=3,
+            max_pages=1
+        )
+        investments_page_count = self._get_table_page_count("section#investments") if first_page_investments else 0
+        fingerprint = compute_table_fingerprint({
+            "affiliates": (first_page_affiliates, affiliates_page_count),
+            "investments": (first_page_investments, investments_page_count),
+        })
+        return fingerprint, {"affiliates": first_page_affiliates, "investments": first_page_investments}
+
+    def _record_edge_changes(self, profile_data, previous_children):
+        """Flags added/removed related companies against the previous snapshot for this profile."""
+        added, removed = diff_edges(previous_children, profile_data["related_companies"])
+        profile_data["added_edges"] = added
+        profile_data["removed_edges"] = removed
+
+        added_pb_ids = {edge["pb_id"] for edge in added}
+        added_names = {edge["Name"] for edge in added if not edge["pb_id"]}
+        for related_company_entry in profile_data["related_companies"]:
+            if related_company_entry.get("pb_id") in added_pb_ids or (not related_company_entry.get("pb_id") and related_company_entry.get("Name") in added_names):
+                related_company_entry["edge_status"] = EDGE_STATUS_ADDED
+
+        for change, edges in (("added", added), ("removed", removed)):
+            for edge in edges:
+                self.edge_changes.append({
+                    "parent_pb_id": profile_data.get("pb_id"),
+                    "parent_name": profile_data.get("legal_name"),
+                    "child_pb_id": edge["pb_id"],
+                    "child_name": edge["Name"],
+                    "change": change,
+                })
+        if added or removed:
+            logger.info(f"Edge changes for {profile_data.get('profile_url')}: {len(added)} added, {len(removed)} removed.")
+
+    @staticmethod
+    def _apply_child_details(related_company_entry, child_details):
+        """
+        Copies a child profile's scalar details onto its related company entry.
+        Passing None blanks the details and the nested list for children that were not scraped.
+        """
+        for key in PROFILE_DETAIL_FIELDS:
+            related_company_entry[key] = child_details.get(key) if child_details else None
+        if child_details:
+            related_company_entry["website_link"] = WebScraper._clean_url(child_details.get("website_link"))
+            for key in INCREMENTAL_FIELDS:
+                if key in child_details:
+                    related_company_entry[key] = child_details[key]
+        else:
+            related_company_entry["nested_related_companies"] = []
+
+    def scrape_profile_and_affiliates(self, profile_url, current_depth=0, max_depth=5, recurse=True):
+        """
+        Scrapes a profile and its related-company tables, then recurses into each related company.
+        With recurse=False only this profile is scraped and its related companies are returned
+        as found in the tables, which is what coordinated workers use: the coordinator owns the
+        frontier and hands the children out to whichever worker claims them.
+        """
+        # Ensure the profile_url is absolute and canonical before checking the visited set, so
+        # trailing-slash, query-string and relative variants of the same profile collapse together
+        if not profile_url.startswith('http') and not extract_pb_id(profile_url):
+            profile_url = urljoin(self.base_url, profile_url)
+        profile_url = canonical_profile_url(profile_url, self.profile_base_url)
+        pb_id = extract_pb_id(profile_url)
+
         # Initialize the profile_data dictionary
         profile_data = {
             "profile_url": profile_url,
+            "pb_id": pb_id,
             "depth": current_depth,
             "website_link": None,
             "former_names": None,
@@ -1167,39 +1338,64 @@ class WebScraper:
             "status": "scraped" # Default status
         }
 
-        # Ensure the profile_url is absolute before checking visited set
-        if not profile_url.startswith('http'):
-            profile_url = urljoin(self.base_url, profile_url) 
-        
-        if profile_url in self.visited_urls:
-            print(f"{COLOR_BLUE}Already visited: {profile_url}. Skipping.{COLOR_RESET}")
+        profile_key = visited_key(profile_url)
+        if profile_key in self.visited_pb_ids:
+            logger.info(f"Already visited: {profile_url} (PB ID: {pb_id}). Skipping.")
             profile_data["status"] = "already_visited"
             return profile_data # Return a minimal structure for already visited URLs to avoid re-scraping and infinite loops
         
         if current_depth > max_depth:
-            print(f"{COLOR_ORANGE}Max depth ({max_depth}) reached for {profile_url}. Skipping deeper recursion.{COLOR_RESET}")
+            logger.warning(f"Max depth ({max_depth}) reached for {profile_url}. Skipping deeper recursion.")
             return None # Return None if max depth reached to stop recursion for this branch
         
-        print(f"\n{COLOR_BLUE}--- Scraping Profile: {profile_url} (Depth: {current_depth}) ---{COLOR_RESET}")
-        self.visited_urls.add(profile_url) # Mark as visited
+        if self.crawl_budget is not None:
+            budget_reason = self.crawl_budget.check()
+            if budget_reason:
+                logger.warning(f"Crawl budget exhausted ({budget_reason}). Not scraping {profile_url}.")
+                profile_data["status"] = "budget_exhausted"
+                profile_data["truncated"] = budget_reason
+                return profile_data
+            self.crawl_budget.consume_node()
+
+        logger.progress(f"\n--- Scraping Profile: {profile_url} (Depth: {current_depth}) ---")
+        self.visited_pb_ids.add(profile_key) # Mark as visited
 
         # Navigate to the profile URL once for scraping all sections
-        print(f"{COLOR_BLUE}Navigating to: {profile_url}{COLOR_RESET}")
+        logger.info(f"Navigating to: {profile_url}")
         self.driver.get(profile_url)
         # Removed hardcoded sleep, relying on waits below
 
         # Get additional data for the current profile page (website, former names, legal name) first
         # Wait for general info tab to be visible as a proxy for main page content load
         try:
-            print(f"{COLOR_BLUE}Waiting for General Information section to be visible (up to 10s)...{COLOR_RESET}")
-            WebDriverWait(self.driver, 10).until(
+            logger.info("Waiting for General Information section to be visible (up to 10s)...")
+            self.timeouts.wait(self.driver, "general_info", 10).until(
                 EC.visibility_of_element_located((By.CSS_SELECTOR, "section#general-info"))
             )
-            print(f"{COLOR_BLUE}General Information section found.{COLOR_RESET}")
+            logger.info("General Information section found.")
         except TimeoutException as e:
-            print(f"{COLOR_ORANGE}Warning: General Information section not found or not visible for {profile_url}. Assuming basic profile page did not load correctly. Error: {e}. Skipping.{COLOR_RESET}")
+            logger.warning(f"Warning: General Information section not found or not visible for {profile_url}. Assuming basic profile page did not load correctly. Error: {e}. Skipping.")
             return profile_data # Return empty if general info doesn't load
 
+        # PitchBook redirects merged/renamed profiles to their surviving ID; dedupe on the final ID too
+        redirected_key = visited_key(self.driver.current_url)
+        if redirected_key and redirected_key != profile_key:
+            redirected_pb_id = extract_pb_id(self.driver.current_url)
+            if redirected_key in self.visited_pb_ids:
+                logger.info(f"{profile_url} redirected to already visited profile {redirected_pb_id}. Skipping.")
+                profile_data["pb_id"] = redirected_pb_id
+                profile_data["status"] = "already_visited"
+                return profile_data
+            if redirected_pb_id:
+                logger.info(f"{profile_url} redirected to PB ID {redirected_pb_id}.")
+                self.visited_pb_ids.add(redirected_key)
+                profile_data["pb_id"] = redirected_pb_id
+                profile_data["profile_url"] = canonical_profile_url(self.driver.current_url, self.profile_base_url)
+
+        if self.replay_recorder is not None:
+            self.replay_recorder.record_profile(profile_url, self.driver.page_source) # Keyed by the requested URL so replays need no redirect
+        self._keep_lease_alive()
+
         profile_data["website_link"] = self._clean_url(self._get_profile_website())
         profile_data["former_names"] = self._get_former_names()
         profile_data["also_known_as"] = self._get_also_known_as() # NEW: Get "Also Known As"
@@ -1216,13 +1412,41 @@ class WebScraper:
             profile_data[key] = value
 
 
+        # Incremental mode: fingerprint the first page of each table and reuse the previous
+        # snapshot's subtree if nothing changed, instead of paginating and descending again
+        previous_children = None
+        first_page_rows = {}
+        if self.previous_snapshot is not None:
+            profile_data["table_fingerprint"], first_page_rows = self._fingerprint_related_tables()
+            previous_node = self.previous_snapshot.get(profile_data["pb_id"])
+            if previous_node is None:
+                profile_data["change_status"] = CHANGE_STATUS_NEW
+            elif self.previous_snapshot.fingerprint_of(profile_data["pb_id"]) == profile_data["table_fingerprint"]:
+                reused_children = self.previous_snapshot.children_of(profile_data["pb_id"])
+                logger.info(f"Fingerprint unchanged for {profile_url}. Reusing {len(reused_children)} related companies from the previous snapshot.")
+                for reused_pb_id in collect_subtree_pb_ids(reused_children):
+                    self.visited_pb_ids.add(reused_pb_id)
+                reset_change_markers(reused_children)
+                profile_data["related_companies"] = reused_children
+                profile_data["change_status"] = CHANGE_STATUS_UNCHANGED
+                profile_data["added_edges"] = []
+                profile_data["removed_edges"] = []
+                if profile_data["pb_id"]:
+                    self.profile_cache[profile_data["pb_id"]] = {key: profile_data.get(key) for key in PROFILE_DETAIL_FIELDS}
+                return profile_data
+            else:
+                logger.info(f"Fingerprint changed for {profile_url}. Re-crawling its subtree.")
+                profile_data["change_status"] = CHANGE_STATUS_CHANGED
+                previous_children = self.previous_snapshot.children_of(profile_data["pb_id"])
+
         # Scrape Affiliates table using the old logic (tab_selector_a_tag)
         # Use a short initial_section_wait here, as general info is loaded
         raw_affiliates_data = self._scrape_affiliate_table_old_logic(
             main_section_selector="section#affiliates",
             tab_selector_a_tag='a#undefined-affiliates\\/SUBSIDIARY', # Use the old, specific tab selector
             table_selector="section#affiliates table",
-            initial_section_wait=3 # Short wait, assume not present if not there quickly
+            initial_section_wait=3, # Short wait, assume not present if not there quickly
+            first_page_rows=first_page_rows.get("affiliates")
         )
         prepared_affiliates = self._prepare_related_companies_for_recursion(
             raw_affiliates_data, "Name", "Affiliate"
@@ -1234,7 +1458,8 @@ class WebScraper:
             main_section_selector="section#investments", 
             tab_text_to_find=None, # Scrape the default visible table in investments, no specific tab activation
             table_selector="section#investments table",
-            initial_section_wait=3 # Short wait, assume not present if not there quickly
+            initial_section_wait=3, # Short wait, assume not present if not there quickly
+            first_page_rows=first_page_rows.get("investments")
         )
         prepared_investments = self._prepare_related_companies_for_recursion(
             raw_investments_data, "Company Name", "Investment (Buy-Side)", required_deal_type="Merger/Acquisition"
@@ -1244,190 +1469,219 @@ class WebScraper:
         all_related_companies_at_this_level = prepared_affiliates + prepared_investments
         profile_data["related_companies"] = all_related_companies_at_this_level # Assign to profile_data
 
+        if previous_children is not None:
+            self._record_edge_changes(profile_data, previous_children)
+
         # Add a small delay to ensure all dynamic content for the profile details loads
         time.sleep(1) 
 
+        # Cache this profile's scalar details so later references to the same PB ID can reuse them
+        if profile_data["pb_id"]:
+            self.profile_cache[profile_data["pb_id"]] = {key: profile_data.get(key) for key in PROFILE_DETAIL_FIELDS}
+
+        if not recurse:
+            return profile_data
+
         # Now, recurse through the combined list of related companies
         if profile_data["related_companies"]:
-            print(f"{COLOR_BLUE}Initiating recursive scraping for {len(profile_data['related_companies'])} related companies.{COLOR_RESET}")
-            for related_company_entry in profile_data["related_companies"]:
+            logger.info(f"Initiating recursive scraping for {len(profile_data['related_companies'])} related companies.")
+            children_to_descend = profile_data["related_companies"]
+            if self.crawl_budget is not None:
+                # Under a budget, descend in a deterministic priority order and cap the fanout
+                children_to_descend, children_over_fanout = prioritize_children(
+                    profile_data["related_companies"], self.crawl_budget.fanout_limit()
+                )
+                if children_over_fanout:
+                    logger.warning(f"Fanout limit reached for {profile_url}: descending into {len(children_to_descend)} of {len(profile_data['related_companies'])} related companies.")
+                    profile_data["truncated"] = BUDGET_FANOUT
+                    self.crawl_budget.record_truncation(BUDGET_FANOUT)
+                for related_company_entry in children_over_fanout:
+                    self._apply_child_details(related_company_entry, None)
+                    related_company_entry["truncated"] = BUDGET_FANOUT
+
+            for related_company_entry in children_to_descend:
                 related_company_profile_link = related_company_entry.get('Name_link')
                 if related_company_profile_link and current_depth < max_depth:
-                    if "/profile/" in related_company_profile_link and related_company_profile_link.count('/') >= 4: 
-                        print(f"{COLOR_BLUE}Found nested related company link: {related_company_profile_link} (Source: {related_company_entry['Source_Type']}). Recursing...{COLOR_RESET}")
+                    if extract_pb_id(related_company_profile_link):
+                        logger.info(f"Found nested related company link: {related_company_profile_link} (Source: {related_company_entry['Source_Type']}). Recursing...")
                         child_profile_data = self.scrape_profile_and_affiliates(
                             related_company_profile_link, current_depth + 1, max_depth
                         )
+                        if child_profile_data and child_profile_data.get("pb_id"):
+                            related_company_entry["pb_id"] = child_profile_data["pb_id"]
                         
-                        if child_profile_data and child_profile_data.get("status") != "already_visited": 
+                        if child_profile_data and child_profile_data.get("status") == "budget_exhausted":
+                            logger.warning(f"Crawl budget exhausted before {related_company_profile_link} ({child_profile_data.get('truncated')}). Not recursing.")
+                            self._apply_child_details(related_company_entry, None)
+                            related_company_entry["truncated"] = child_profile_data.get("truncated")
+                        elif child_profile_data and child_profile_data.get("status") != "already_visited": 
                             # Merge child's direct scraped data into the current related_company_entry
-                            related_company_entry["website_link"] = self._clean_url(child_profile_data.get("website_link"))
-                            related_company_entry["former_names"] = child_profile_data.get("former_names")
-                            related_company_entry["also_known_as"] = child_profile_data.get("also_known_as") # NEW: Add to nested
-                            related_company_entry["legal_name"] = child_profile_data.get("legal_name")
-                            
-                            for key in ["contact_name", "contact_profile_link", "contact_title", 
-                                        "contact_email", "contact_email_link", "contact_business_phone", "contact_mobile_phone"]:
-                                related_company_entry[key] = child_profile_data.get(key)
-                            
-                            for key in ["office_address_line1", "office_address_line2", "office_address_line3",
-                                        "office_email", "office_phone"]:
-                                related_company_entry[key] = child_profile_data.get(key)
+                            self._apply_child_details(related_company_entry, child_profile_data)
 
                             # Attach the child's own related companies list to the current entry
                             related_company_entry["nested_related_companies"] = child_profile_data.get("related_companies", [])
+                        elif child_profile_data and child_profile_data.get("pb_id") in self.profile_cache:
+                            # Already scraped elsewhere in this run: reuse its details, but don't duplicate its subtree
+                            logger.info(f"Child profile {related_company_profile_link} already visited. Reusing cached details for PB ID {child_profile_data['pb_id']}.")
+                            self._apply_child_details(related_company_entry, self.profile_cache[child_profile_data["pb_id"]])
+                            related_company_entry["nested_related_companies"] = []
                         else:
                             # If child was not successfully scraped or already visited, assign None/empty
-                            print(f"{COLOR_ORANGE}Child profile {related_company_profile_link} not scraped or already visited.{COLOR_RESET}")
-                            related_company_entry["website_link"] = None
-                            related_company_entry["former_names"] = None
-                            related_company_entry["also_known_as"] = None
-                            related_company_entry["legal_name"] = None
-                            for key in ["contact_name", "contact_profile_link", "contact_title", 
-                                        "contact_email", "contact_email_link", "contact_business_phone", "contact_mobile_phone",
-                                        "office_address_line1", "office_address_line2", "office_address_line3",
-                                        "office_email", "office_phone"]:
-                                related_company_entry[key] = None
-                            related_company_entry["nested_related_companies"] = [] 
+                            logger.warning(f"Child profile {related_company_profile_link} not scraped or already visited.")
+                            self._apply_child_details(related_company_entry, None)
                     else:
-                        print(f"{COLOR_ORANGE}Link is not a valid PitchBook profile link (or malformed): {related_company_profile_link}. Not recursing.{COLOR_RESET}")
-                        related_company_entry["website_link"] = None
-                        related_company_entry["former_names"] = None
-                        related_company_entry["also_known_as"] = None 
-                        related_company_entry["legal_name"] = None
-                        for key in ["contact_name", "contact_profile_link", "contact_title", 
-                                    "contact_email", "contact_email_link", "contact_business_phone", "contact_mobile_phone",
-                                    "office_address_line1", "office_address_line2", "office_address_line3",
-                                    "office_email", "office_phone"]:
-                                related_company_entry[key] = None
-                        related_company_entry["nested_related_companies"] = []
+                        logger.warning(f"Link is not a valid PitchBook profile link (or malformed): {related_company_profile_link}. Not recursing.")
+                        self._apply_child_details(related_company_entry, None)
                 elif not related_company_profile_link:
-                    print(f"{COLOR_ORANGE}No profile link found for related company: {related_company_entry.get('Name', 'N/A')}{COLOR_RESET}")
-                    related_company_entry["website_link"] = None
-                    related_company_entry["former_names"] = None
-                    related_company_entry["also_known_as"] = None # NEW: Add to nested
-                    related_company_entry["legal_name"] = None
-                    for key in ["contact_name", "contact_profile_link", "contact_title", 
-                                "contact_email", "contact_email_link", "contact_business_phone", "contact_mobile_phone",
-                                "office_address_line1", "office_address_line2", "office_address_line3",
-                                "office_email", "office_phone"]:
-                        related_company_entry[key] = None
-                    related_company_entry["nested_related_companies"] = [] 
+                    logger.warning(f"No profile link found for related company: {related_company_entry.get('Name', 'N/A')}")
+                    self._apply_child_details(related_company_entry, None)
                 elif current_depth >= max_depth:
-                    print(f"{COLOR_ORANGE}Max depth reached for {profile_url}'s related company. Not recursing further.{COLOR_RESET}")
-                    related_company_entry["website_link"] = None
-                    related_company_entry["former_names"] = None
-                    related_company_entry["also_known_as"] = None # NEW: Add to nested
-                    related_company_entry["legal_name"] = None
-                    for key in ["contact_name", "contact_profile_link", "contact_title", 
-                                "contact_email", "contact_email_link", "contact_business_phone", "contact_mobile_phone",
-                                "office_address_line1", "office_address_line2", "office_address_line3",
-                                "office_email", "office_phone"]:
-                        related_company_entry[key] = None
-                    related_company_entry["nested_related_companies"] = [] 
+                    logger.warning(f"Max depth reached for {profile_url}'s related company. Not recursing further.")
+                    self._apply_child_details(related_company_entry, None)
 
         else:
-            print(f"{COLOR_BLUE}No related companies (affiliates or investments) found or scraped from {profile_url}.{COLOR_RESET}")
+            logger.info(f"No related companies (affiliates or investments) found or scraped from {profile_url}.")
             
         return profile_data
 
 
     def save_to_csv(self, data, filename):
-        
+        """Save one or more scraped trees to CSV using the fixed streaming schema."""
         if not data:
-            print(f"{COLOR_ORANGE}No data to save to CSV.{COLOR_RESET}")
+            logger.warning("No data to save to CSV.")
             return
 
-        flattened_data = []
-
-        def get_company_name_for_csv(profile_data):
-            return profile_data.get("root_name") or \
-                   profile_data.get("legal_name") or \
-                   profile_data.get("profile_url")
+        if isinstance(data, dict):
+            data = [data]
 
-        def flatten_recursive(company_node, parent_name=None, parent_url=None):
-            node_data = {k: v for k, v in company_node.items() if k not in ["related_companies", "nested_related_companies", "status", "depth"]}
-            
-            if parent_name:
-                node_data["source_company_name"] = parent_name
-            if parent_url:
-                node_data["source_profile_url"] = parent_url
-            
-            # Add to flattened list
-            flattened_data.append(node_data)
-            
-            # Recurse for related companies
-            for related_company in company_node.get("related_companies", []):
-                flatten_recursive(related_company, node_data.get("Name"), node_data.get("profile_url"))
-            
-            # Recurse for nested related companies (from recursive calls)
-            for nested_related_company in company_node.get("nested_related_companies", []):
-                flatten_recursive(nested_related_company, node_data.get("Name"), node_data.get("profile_url"))
-
-
-        # Determine if data is a single profile or a list of profiles
-        if isinstance(data, dict) and "profile_url" in data:
-            flatten_recursive(data)
-        elif isinstance(data, list) and data and isinstance(data[0], dict) and "profile_url" in data[0]:
+        with StreamingCSVWriter(filename) as csv_writer:
             for company_profile in data:
-                flatten_recursive(company_profile)
-        else:
-            print(f"{COLOR_ORANGE}Warning: CSV save function received data not in expected single or multiple profile format. Attempting to save as-is (may not be well-formatted).{COLOR_RESET}")
-            flattened_data = data
-            
-
-        if not flattened_data:
-            print(f"{COLOR_ORANGE}No flattened data to save to CSV.{COLOR_RESET}")
-            return
-
-        # Dynamically collect all possible keys from all dictionaries to ensure complete headers
-        all_keys = set()
-        for row in flattened_data:
-            all_keys.update(row.keys())
-
-        preferred_order_start = ["root_name", "Type", "Source_Type", "Name", "profile_url", "legal_name", "also_known_as", "website_link", "source_company_name", "source_profile_url"]
-        remaining_keys = sorted(list(all_keys - set(preferred_order_start)))
-        fieldnames = [key for key in preferred_order_start + remaining_keys if key in all_keys] # Ensure only existing keys are in fieldnames
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore') # Ignore extra keys not in fieldnames
-            writer.writeheader()
-            writer.writerows(flattened_data)
-        
-        print(f"{COLOR_BLUE}Data saved to {filename}{COLOR_RESET}")
+                csv_writer.write_tree(company_profile)
     
     def save_to_json(self, data, filename):
         """Save scraped data to JSON file"""
         with open(filename, 'w', encoding='utf-8') as jsonfile:
             json.dump(data, jsonfile, indent=2, ensure_ascii=False)
         
-        print(f"{COLOR_BLUE}Data saved to {filename}{COLOR_RESET}")
+        logger.info(f"Data saved to {filename}")
     
     def close(self):
         """Close the browser"""
-        print(f"{COLOR_BLUE}Closing browser...{COLOR_RESET}")
+        logger.info("Closing browser...")
+        self.failure_artifacts.close()
+        self.timeouts.close()
         if self.driver:
             self.driver.quit()
-        print(f"{COLOR_BLUE}Browser closed.{COLOR_RESET}")
+        logger.info("Browser closed.")
 
 def load_companies_from_json(filepath):
     """Loads a list of companies from a JSON file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             companies = json.load(f)
-        print(f"{COLOR_BLUE}Successfully loaded {len(companies)} companies from {filepath}{COLOR_RESET}")
+        logger.info(f"Successfully loaded {len(companies)} companies from {filepath}")
         return companies
     except FileNotFoundError:
-        print(f"{COLOR_RED}Error: JSON file not found at {filepath}{COLOR_RESET}")
+        logger.error(f"Error: JSON file not found at {filepath}")
         return []
     except json.JSONDecodeError as e:
-        print(f"{COLOR_RED}Error decoding JSON from {filepath}: {e}{COLOR_RESET}")
+        logger.error(f"Error decoding JSON from {filepath}: {e}")
         return []
     except Exception as e:
-        print(f"{COLOR_RED}An unexpected error occurred while loading JSON: {e}{COLOR_RESET}")
+        logger.error(f"An unexpected error occurred while loading JSON: {e}")
         return []
 
-def main():
+def run_coordinated_worker(scraper, coordinator, poll_seconds=5):
+    """
+    Claims profiles from the shared coordinator until the frontier is drained, scraping each one
+    without recursion and handing its related companies back to the coordinator.
+
+    Returns:
+        int: Number of profiles this worker scraped.
+    """
+    max_depth = coordinator.max_depth
+    scraped_count = 0
+    while True:
+        claim = coordinator.claim()
+        if claim is None:
+            if coordinator.is_finished():
+                break
+            # Other workers still hold leases; their children may land in the frontier shortly
+            time.sleep(poll_seconds)
+            continue
+
+        # The coordinator is the visited set across workers; this worker's own set would only
+        # block a re-claim after an expired lease, so start every claim from a clean slate
+        scraper.visited_pb_ids = set()
+        scraper.lease_keeper = lambda pb_id=claim["pb_id"]: coordinator.renew_lease(pb_id)
+        try:
+            profile_data = scraper.scrape_profile_and_affiliates(claim["url"], claim["depth"], max_depth, recurse=False)
+            if profile_data is None:
+                coordinator.fail(claim, "No data returned")
+                continue
+            enqueued = coordinator.complete(claim, profile_data)
+            if enqueued is None:
+                continue
+            scraped_count += 1
+            logger.progress(f"[{coordinator.worker_id}] Completed {claim['pb_id']} (depth {claim['depth']}), {enqueued} new profiles queued. Frontier: {coordinator.counts()}")
+        except Exception as e:
+            new_state = coordinator.fail(claim, e)
+            logger.error(f"[{coordinator.worker_id}] Error scraping {claim['url']}: {e}. Marked {new_state}.")
+        finally:
+            scraper.lease_keeper = None
+    logger.progress(f"[{coordinator.worker_id}] Frontier drained. This worker scraped {scraped_count} profiles.")
+    return scraped_count
+
+def assemble_from_coordinator(coordinator):
+    """Builds the per-root trees from a coordinator database and writes the usual PBTree outputs."""
+    counts = coordinator.counts()
+    if not coordinator.is_finished():
+        logger.warning(f"Warning: crawl is not finished yet ({counts}). Assembling what has been scraped so far.")
+    with StreamingJSONArrayWriter(PITCHBOOK_OUTPUT_JSON) as json_writer, StreamingCSVWriter(PITCHBOOK_OUTPUT_CSV) as csv_writer:
+        for root_tree in coordinator.assemble(WebScraper._apply_child_details):
+            json_writer.write(root_tree)
+            csv_writer.write_tree(root_tree)
+            logger.progress(f"Assembled root '{root_tree.get('root_name')}'.")
+
+def parse_args(argv=None):
+    """Parses the PBTree command line. Running without arguments keeps the default full crawl."""
+    parser = argparse.ArgumentParser(description="Recursively crawl PitchBook affiliate trees for the selected companies.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Compare each profile against the previous snapshot and only descend into subtrees that changed.")
+    parser.add_argument("--previous-snapshot", default=PITCHBOOK_OUTPUT_JSON,
+                        help="PBTree JSON from the previous run to compare against (default: %(default)s).")
+    parser.add_argument("--max-depth", type=int, default=5,
+                        help="Maximum recursion depth below each root (default: %(default)s).")
+    parser.add_argument("--max-nodes-per-root", type=int, default=None,
+                        help="Stop descending a root after this many profiles have been scraped for it.")
+    parser.add_argument("--max-minutes-per-root", type=float, default=None,
+                        help="Stop descending a root after this many minutes.")
+    parser.add_argument("--max-fanout", type=int, default=None,
+                        help="Descend into at most this many related companies per profile (affiliates first, then oldest).")
+    parser.add_argument("--max-total-nodes", type=int, default=None,
+                        help="Global cap on profiles scraped across all roots.")
+    parser.add_argument("--max-total-minutes", type=float, default=None,
+                        help="Global wall-clock budget across all roots.")
+    parser.add_argument("--coordinator-db", default=None,
+                        help="SQLite database shared by parallel workers. Each process started with it claims profiles from the shared frontier.")
+    parser.add_argument("--profile-dir", default=None,
+                        help="Chrome user data directory for this process. Required to be distinct per worker when running several at once.")
+    parser.add_argument("--lease-minutes", type=float, default=10,
+                        help="How long a worker may hold a claimed profile before others may take it over (default: %(default)s).")
+    parser.add_argument("--record-replay", default=None, metavar="DIR",
+                        help="Snapshot every scraped profile and table page into this replay archive (see crawl_replay.py).")
+    parser.add_argument("--failure-artifacts", choices=ARTIFACT_MODES, default=ARTIFACT_MODE_DOM,
+                        help="Diagnostics captured on timeouts and errors (default: %(default)s, a DOM snippet per failure, rate limited).")
+    parser.add_argument("--assemble", action="store_true",
+                        help="Build the output JSON/CSV from the coordinator database without opening a browser.")
+    parser.add_argument("--timeouts-file", default=PBTREE_TIMEOUTS_FILE,
+                        help="Where learned wait timeouts are kept between runs (default: %(default)s). Parallel workers may share it.")
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging_from_args(args)
     login_url = "https://login-prod.morningstar.com/login?state=hKFo2SBzSDF4WXFqakpSNF9INFcxN0hjb011ZXliV1dFUUV2LaFupWxvZ2luo3RpZNkgOGxUUDJsYm1OZ09YOVJSZW5SWlphYzBycFV3bDZJSESjY2lk2SByWUMwT1V4SDRpV05jbXzPanVwQjh6UnN0dWtlZXZyUg&client=rYC0OUxH4iWNcmzOjupB8zRstukeevrR&protocol=oauth2&redirect_uri=https%3A%2F%2Fmy.pitchbook.com%2Fauth0%2Fcallback&source=bus0155&response_type=code&ext-source=bus0155"
     
     # Path to your JSON file containing company details
@@ -1438,9 +1692,22 @@ def main():
 
     LOGIN_SUCCESS_INDICATOR = "#embedded-messaging" 
 
+    coordinator = None
+    if args.coordinator_db:
+        coordinator = CrawlCoordinator(args.coordinator_db, lease_seconds=args.lease_minutes * 60)
+        if args.assemble:
+            assemble_from_coordinator(coordinator)
+            coordinator.close()
+            return
+    elif args.assemble:
+        logger.error("--assemble requires --coordinator-db.")
+        return
+
     scraper = None 
     try:
-        scraper = WebScraper(headless=False) 
+        scraper = WebScraper(headless=False, profile_dir=args.profile_dir, artifact_mode=args.failure_artifacts, timeouts_path=args.timeouts_file) 
+        if args.record_replay:
+            scraper.replay_recorder = ReplayRecorder(args.record_replay)
         
         scraper.driver.get("chrome://version")
         time.sleep(2) # Give it a moment to load
@@ -1450,16 +1717,16 @@ def main():
                 EC.presence_of_element_located((By.XPATH, "//td[text()='Profile Path']/following-sibling::td"))
             )
             actual_profile_path = profile_path_element.text
-            print(f"{COLOR_BLUE}Chrome reports actual Profile Path: {actual_profile_path}{COLOR_RESET}")
+            logger.info(f"Chrome reports actual Profile Path: {actual_profile_path}")
             actual_user_data_dir = os.path.dirname(actual_profile_path)
-            print(f"{COLOR_BLUE}Chrome reports actual User Data Directory: {actual_user_data_dir}{COLOR_RESET}")
+            logger.info(f"Chrome reports actual User Data Directory: {actual_user_data_dir}")
             
             if os.path.normpath(actual_user_data_dir) != os.path.normpath(scraper.scraper_profile_dir):
-                print(f"{COLOR_ORANGE}WARNING: User Data Directory mismatch! Expected: {os.path.normpath(scraper.scraper_profile_dir)}, Actual: {os.path.normpath(actual_user_data_dir)}{COLOR_RESET}")
+                logger.warning(f"WARNING: User Data Directory mismatch! Expected: {os.path.normpath(scraper.scraper_profile_dir)}, Actual: {os.path.normpath(actual_user_data_dir)}")
         except Exception as e:
-            print(f"{COLOR_ORANGE}Could not retrieve Chrome's actual profile path from chrome://version. Error: {e}{COLOR_RESET}")
+            logger.warning(f"Could not retrieve Chrome's actual profile path from chrome://version. Error: {e}")
 
-        print(f"{COLOR_BLUE}=== Attempting full login ==={COLOR_RESET}")
+        logger.progress("=== Attempting full login ===")
         login_success = scraper.login(
             login_url=login_url,
             username=YOUR_USERNAME,  
@@ -1472,89 +1739,163 @@ def main():
         
         logged_in_successfully = False 
         if login_success:
-            print(f"{COLOR_BLUE}Full login successful!{COLOR_RESET}")
+            logger.info("Full login successful!")
             logged_in_successfully = True
         else:
-            print(f"{COLOR_RED}Full login failed.{COLOR_RESET}")
+            logger.error("Full login failed.")
             logged_in_successfully = False
         
-        if logged_in_successfully:
-            print(f"\n{COLOR_BLUE}=== Initiating Recursive Scraping of Companies from JSON file ==={COLOR_RESET}")
+        if logged_in_successfully and coordinator is not None:
+            logger.progress(f"\n=== Joining coordinated crawl {args.coordinator_db} as {coordinator.worker_id} ===")
+            # Seeding is idempotent, so every worker can seed; only the first one adds anything
+            added_roots = coordinator.seed_roots(load_companies_from_json(json_filepath), args.max_depth)
+            if added_roots:
+                logger.info(f"Seeded {added_roots} root companies into the shared frontier.")
+            if scraper.replay_recorder is not None:
+                # Every worker records the shared roots, so each worker's archive can be replayed on its own
+                for root in coordinator.roots():
+                    scraper.replay_recorder.record_root(root["root_company_name"], root["pitchbook_id"])
+            run_coordinated_worker(scraper, coordinator)
+            if coordinator.is_finished():
+                logger.info(f"Crawl finished. Run with --coordinator-db {args.coordinator_db} --assemble to write the output files.")
+        elif logged_in_successfully:
+            logger.progress("\n=== Initiating Recursive Scraping of Companies from JSON file ===")
             
             companies_to_scrape = load_companies_from_json(json_filepath)
-            all_scraped_companies_data = [] 
+            scraped_roots_count = 0
+            first_company_sample = None # Small copy of the first root kept for the sample printout
 
             if companies_to_scrape:
-                for company_info in companies_to_scrape:
-                    root_company_name = company_info.get("root_company_name")
-                    pitchbook_id = company_info.get("pitchbook_id")
-
-                    if pitchbook_id:
-                        profile_url = f"https://my.pitchbook.com/profile/{pitchbook_id}/company/profile"
-                        print(f"\n{COLOR_BLUE}--- Scraping Root Company: {root_company_name} (ID: {pitchbook_id}) ---{COLOR_RESET}")
-                        
-                        scraped_tree_data = scraper.scrape_profile_and_affiliates(profile_url, max_depth=5) 
-                        
-                        if scraped_tree_data:
-                            scraped_tree_data["root_name"] = root_company_name # Add original name for context under 'root_name'
-                            all_scraped_companies_data.append(scraped_tree_data)
+                if args.incremental:
+                    # Load the previous snapshot before the streaming writer truncates the output file
+                    scraper.previous_snapshot = CrawlSnapshot.load(args.previous_snapshot)
+
+                # Stream each finished root to disk so memory stays flat regardless of the number of roots
+                json_writer = StreamingJSONArrayWriter(PITCHBOOK_OUTPUT_JSON)
+                csv_writer = StreamingCSVWriter(PITCHBOOK_OUTPUT_CSV)
+
+                # Budgets are optional; with no limits given the crawl is bounded only by --max-depth
+                global_budget = None
+                if args.max_total_nodes is not None or args.max_total_minutes is not None:
+                    global_budget = CrawlBudget(
+                        max_nodes=args.max_total_nodes,
+                        max_seconds=args.max_total_minutes * 60 if args.max_total_minutes is not None else None,
+                    )
+                use_root_budgets = global_budget is not None or any(
+                    limit is not None for limit in (args.max_nodes_per_root, args.max_minutes_per_root, args.max_fanout)
+                )
+                try:
+                    for company_info in companies_to_scrape:
+                        root_company_name = company_info.get("root_company_name")
+                        pitchbook_id = extract_pb_id(company_info.get("pitchbook_id"))
+
+                        if pitchbook_id:
+                            if global_budget is not None and global_budget.check():
+                                logger.warning(f"Global crawl budget exhausted ({global_budget.exhausted_reason}). Skipping '{root_company_name}' and the remaining roots.")
+                                break
+
+                            profile_url = canonical_profile_url(pitchbook_id)
+                            logger.progress(f"\n--- Scraping Root Company: {root_company_name} (ID: {pitchbook_id}) ---")
+                            if scraper.replay_recorder is not None:
+                                scraper.replay_recorder.record_root(root_company_name, pitchbook_id)
+
+                            root_budget = None
+                            if use_root_budgets:
+                                root_budget = CrawlBudget(
+                                    max_nodes=args.max_nodes_per_root,
+                                    max_seconds=args.max_minutes_per_root * 60 if args.max_minutes_per_root is not None else None,
+                                    max_fanout=args.max_fanout,
+                                    parent=global_budget,
+                                )
+                            scraper.crawl_budget = root_budget
+                            
+                            scraped_tree_data = scraper.scrape_profile_and_affiliates(profile_url, max_depth=args.max_depth) 
+                            scraper.crawl_budget = None
+                            
+                            if scraped_tree_data:
+                                scraped_tree_data["root_name"] = root_company_name # Add original name for context under 'root_name'
+                                if root_budget is not None:
+                                    scraped_tree_data["partial"] = root_budget.is_partial()
+                                    scraped_tree_data["budget"] = root_budget.summary()
+                                    if root_budget.is_partial():
+                                        logger.warning(f"Root '{root_company_name}' was only partially crawled ({', '.join(sorted(root_budget.truncation_reasons))}).")
+                                json_writer.write(scraped_tree_data)
+                                csv_writer.write_tree(scraped_tree_data)
+                                logger.progress(f"Saved root '{root_company_name}' to output files.")
+                                if first_company_sample is None:
+                                    first_company_sample = {
+                                        "root_name": scraped_tree_data.get("root_name"),
+                                        "profile_url": scraped_tree_data.get("profile_url"),
+                                        # Scalar fields only: nested subtrees would keep the whole root's tree alive
+                                        "related_companies": [
+                                            {key: value for key, value in row.items() if not isinstance(value, (dict, list))}
+                                            for row in scraped_tree_data.get("related_companies", [])[:5]
+                                        ],
+                                    }
+                                scraped_roots_count += 1
+                                del scraped_tree_data # Release this root's tree now that it is on disk
+                            else:
+                                logger.warning(f"No data scraped for {root_company_name} ({profile_url}).")
                         else:
-                            print(f"{COLOR_ORANGE}No data scraped for {root_company_name} ({profile_url}).{COLOR_RESET}")
-                    else:
-                        print(f"{COLOR_ORANGE}Skipping '{root_company_name}' due to missing or null PitchBook ID.{COLOR_RESET}")
+                            logger.warning(f"Skipping '{root_company_name}' due to missing or null PitchBook ID.")
+                finally:
+                    json_writer.close()
+                    csv_writer.close()
+
+                if args.incremental:
+                    scraper.save_to_json(scraper.edge_changes, CRAWL_CHANGES_JSON)
+                    logger.info(f"Incremental crawl found {len(scraper.edge_changes)} edge changes.")
             else:
-                print(f"{COLOR_ORANGE}No companies found in the JSON file to scrape or file could not be loaded.{COLOR_RESET}")
+                logger.warning("No companies found in the JSON file to scrape or file could not be loaded.")
 
 
-            if all_scraped_companies_data:
-                print(f"\n{COLOR_BLUE}Completed scraping all companies. Saving aggregated structured data.{COLOR_RESET}")
-
-                scraper.save_to_json(all_scraped_companies_data, 'multi_company_pitchbook_data.json')
-        
-                scraper.save_to_csv(all_scraped_companies_data, 'all_companies_pitchbook_related_data.csv')
+            if scraped_roots_count:
+                logger.progress(f"\nCompleted scraping all companies. {scraped_roots_count} roots were streamed to disk.")
                 
-                print(f"\n{COLOR_BLUE}--- Sample of Scraped Data (first company's top level) ---{COLOR_RESET}")
-                if all_scraped_companies_data and all_scraped_companies_data[0].get("related_companies"):
-                    first_company_data = all_scraped_companies_data[0]
-                    print(f"\n{COLOR_BLUE}Root Company Name (from JSON): {first_company_data.get('root_name', 'N/A')}{COLOR_RESET}")
-                    print(f"{COLOR_BLUE}Root Company URL: {first_company_data.get('profile_url', 'N/A')}{COLOR_RESET}")
+                logger.info("\n--- Sample of Scraped Data (first company's top level) ---")
+                if first_company_sample and first_company_sample.get("related_companies"):
+                    first_company_data = first_company_sample
+                    logger.info(f"\nRoot Company Name (from JSON): {first_company_data.get('root_name', 'N/A')}")
+                    logger.info(f"Root Company URL: {first_company_data.get('profile_url', 'N/A')}")
                     
-                    print(f"\n{COLOR_BLUE}--- Sample of Related Companies for {first_company_data.get('root_name')} ---{COLOR_RESET}")
+                    logger.info(f"\n--- Sample of Related Companies for {first_company_data.get('root_name')} ---")
                     for i, row in enumerate(first_company_data["related_companies"][:5]): 
-                        print(f"{COLOR_BLUE}Item {i+1}:{COLOR_RESET}")
+                        logger.info(f"Item {i+1}:")
                         for key, value in row.items():
                             if isinstance(value, str) and len(value) > 100:
-                                print(f"  {COLOR_BLUE}{key}: {value[:97]}...{COLOR_RESET}")
+                                logger.info(f"  {key}: {value[:97]}...")
                             else:
-                                print(f"  {COLOR_BLUE}{key}: {value}{COLOR_RESET}")
-                    print(f"{COLOR_BLUE}--- End Sample ---{COLOR_RESET}")
+                                logger.info(f"  {key}: {value}")
+                    logger.info("--- End Sample ---")
                 else:
-                    print(f"{COLOR_ORANGE}No top-level related companies data found to sample for the first company.{COLOR_RESET}")
+                    logger.warning("No top-level related companies data found to sample for the first company.")
 
             else:
-                print(f"{COLOR_ORANGE}No data scraped from any of the provided URLs.{COLOR_RESET}")
+                logger.warning("No data scraped from any of the provided URLs.")
         else:
-            print(f"{COLOR_RED}Failed to log in, cannot initiate recursive scraping.{COLOR_RESET}")
+            logger.error("Failed to log in, cannot initiate recursive scraping.")
         
-        print(f"{COLOR_BLUE}--------------------------------------------------{COLOR_RESET}")
+        logger.info("--------------------------------------------------")
 
-        print(f"{COLOR_BLUE}Keeping browser open for 15 seconds for observation...{COLOR_RESET}")
+        logger.info("Keeping browser open for 15 seconds for observation...")
         time.sleep(15) 
 
     except Exception as e:
-        print(f"{COLOR_RED}An unexpected error occurred in main: {e}{COLOR_RESET}")
+        logger.error(f"An unexpected error occurred in main: {e}")
     
     finally:
         if scraper:
-            print(f"{COLOR_BLUE}Ensuring browser is closed in finally block.{COLOR_RESET}")
+            logger.info("Ensuring browser is closed in finally block.")
             try:
-                print(f"\n{COLOR_BLUE}--- BROWSER CONSOLE LOGS ---{COLOR_RESET}")
+                logger.info("\n--- BROWSER CONSOLE LOGS ---")
                 for entry in scraper.driver.get_log("browser"):
-                    print(f"{COLOR_BLUE}LOG: {entry}{COLOR_RESET}")
-                print(f"{COLOR_BLUE}----------------------------{COLOR_RESET}")
+                    logger.info(f"LOG: {entry}")
+                logger.info("----------------------------")
             except Exception as log_e:
-                print(f"{COLOR_ORANGE}Could not retrieve browser logs: {log_e}{COLOR_RESET}")
+                logger.warning(f"Could not retrieve browser logs: {log_e}")
             scraper.close()
+        if coordinator is not None:
+            coordinator.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
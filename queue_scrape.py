@@ -1,7 +1,19 @@
 # In a new file, e.g., run_scraper.py
+import argparse
+
 from retool_bot import WebScraper # Replace 'your_main_script_file' with the name of your script file
+from bot_logging import get_logger, add_logging_arguments, configure_logging_from_args
+
+logger = get_logger("queue_scrape")
+
+def parse_args(argv=None):
+    """Parses the queue scrape command line. Only the shared logging flags are configurable."""
+    parser = argparse.ArgumentParser(description="Scrape the Retool Cleanup Queue names into cleanup_queue_names.json.")
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
 
-def scrape_queue():
+def scrape_queue(argv=None):
+    configure_logging_from_args(parse_args(argv))
     # ... inside your main() function or run_cleanup_scraper.py's main function ...
 
 # Define the output JSON file path
@@ -20,7 +32,7 @@ def scrape_queue():
     scraper = WebScraper(headless=False, profile_name="retool_sso_profile")
     
     try:
-        print("=== Attempting to log into Retool for Cleanup Queue Scraping ===")
+        logger.progress("=== Attempting to log into Retool for Cleanup Queue Scraping ===")
         
         # Check if already logged in
         if not scraper.check_login_status(RETOOL_DASHBOARD_URL, LOGIN_SUCCESS_INDICATOR, check_timeout=CHECK_LOGIN_TIMEOUT):
@@ -34,7 +46,7 @@ def scrape_queue():
             
         # ... (after successful login) ...
 
-        # To run the new click-scrape-navigate-back process for the Cleanup Queue:
+        # Reads the Cleanup Queue list in one pass; only entries without a PB ID are clicked into:
             scraped_data = scraper.scrape_cleanup_queue_names(
             retool_dashboard_url=RETOOL_DASHBOARD_URL, # Pass the dashboard URL here
             output_json_file=OUTPUT_CLEANUP_QUEUE_JSON
@@ -42,16 +54,16 @@ def scrape_queue():
             """
             This function specifically logs into Retool and scrapes the Cleanup Queue.
             """
-            print("\nSession is active. Proceeding to scrape Cleanup Queue...")
+            logger.info("\nSession is active. Proceeding to scrape Cleanup Queue...")
             
             # Call the scraping function and save the results
-            print(f"\nScraping complete. Total of {len(scraped_data)} unique entries found.")
+            logger.milestone(f"\nScraping complete. Total of {len(scraped_data)} unique entries found.")
             
         else:
-            print("Could not establish a session. Exiting.")
+            logger.error("Could not establish a session. Exiting.")
 
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        logger.error(f"An unexpected error occurred: {e}")
     finally:
         if scraper:
             scraper.close()
@@ -1,8 +1,9 @@
 import os
 import time
 import json
-import string 
-import re 
+import argparse
+import threading
+import uuid
 from urllib.parse import urljoin 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -13,12 +14,20 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException
 from selenium.webdriver.chrome.options import Options
 
-COLOR_BLUE = "\033[94m"
-COLOR_GREEN = "\033[92m"
-COLOR_RED = "\033[91m"
-COLOR_ORANGE = "\033[33m"
-COLOR_YELLOW = "\033[93m"
-COLOR_RESET = "\033[0m"
+from pb_ids import normalize_pb_id, node_pb_id
+from crawl_snapshot import CHANGE_STATUS_NEW, CHANGE_STATUS_CHANGED, CHANGE_STATUS_UNCHANGED, EDGE_STATUS_ADDED
+from failure_artifacts import FailureArtifacts, ARTIFACT_MODES, ARTIFACT_MODE_DOM
+from adaptive_timeouts import AdaptiveTimeouts, RETOOL_TIMEOUTS_FILE
+from search_cache import SearchResultCache, SEARCH_CACHE_FILE, DEFAULT_SEARCH_CACHE_TTL_HOURS
+from search_planner import SearchPlanner, SEARCH_STATS_FILE, HIGH_CONFIDENCE_FIELDS
+from name_index import NameTokenIndex
+from name_normalization import normalize_name
+from name_matching import score_table, node_name_set, DECISION_ACCEPT, DECISION_REVIEW
+from bot_logging import get_logger, add_logging_arguments, configure_logging_from_args, COLOR_YELLOW
+
+COLOR_BLUE = "\033[94m" # RetoolBot's info lines have always used the darker blue
+
+logger = get_logger("retool", info_color=COLOR_BLUE)
 
 
 ADD_ACCOUNT_TABLE_NAME_COLUMN_ID = "7689c" 
@@ -31,16 +40,263 @@ DETAILS_PAGE_ROOT_COMPANY_NAME_SELECTOR = "div[role='gridcell'][data-column-id='
 DETAILS_PAGE_PITCHBOOK_ID_SELECTOR = "div[role='gridcell'][data-column-id='49266'] span[data-is-cell-contents='true']"
 CLEANUP_QUEUE_NAMES_JSON_FILE = 'cleanup_queue_names.json'
 
-COMMON_SUFFIXES = [
-    "inc", "llc", "corp", "ltd", "co", "gmbh", "as", "ag", "sarl", "nv", "sa",
-    "bv", "oy", "ab", "kft", "plc", "pvt", "pte", "pty", "s.a.", "s.a.r.l.", "n.v.", "s.p.a.",
-    "company", "group", "holding", "holdings", "system", "systems", "products", "solutions",
-    "technologies", "technology", "inc.", "llc.", "corp.", "ltd.", "co.", "gmbh.", "as.", "ag.",
-    "sarl.", "nv.", "sa.", "bv.", "oy.", "ab.", "kft.", "plc.", "pvt.", "pte.", "pty.",
-    "limited", "unlimited", "and", "&"
-]
-
-SUFFIX_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(s) for s in COMMON_SUFFIXES) + r')\b', re.IGNORECASE)
+CLEANUP_QUEUE_TABLE_ID = "CleanupQueueEntryTable--0"
+CLEANUP_QUEUE_NAME_COLUMN_ID = "787e6"
+CLEANUP_QUEUE_PB_ID_COLUMN_ID = "49266"
+
+# Reads every rendered row of the Add Account results table in one call: its index, name, Account ID
+# and whether it is already selected.
+SNAPSHOT_RESULT_ROWS_SCRIPT = """
+const table = document.getElementById(arguments[0]);
+if (!table) { return []; }
+const nameColumn = arguments[1];
+const accountIdColumn = arguments[2];
+const rows = [];
+table.querySelectorAll("div[role='rowgroup'] div[role='row'][data-item-index]").forEach(function (row) {
+    const nameCell = row.querySelector("div[role='gridcell'][data-column-id='" + nameColumn + "'] span[data-is-cell-contents='true']");
+    const accountIdLink = row.querySelector("div[role='gridcell'][data-column-id='" + accountIdColumn + "'] a");
+    rows.push({
+        index: parseInt(row.getAttribute("data-item-index"), 10),
+        name: nameCell ? nameCell.innerText.trim() : null,
+        account_id: accountIdLink ? (accountIdLink.innerText.trim() || null) : null,
+        selected: row.getAttribute("aria-selected") === "true"
+    });
+});
+return rows;
+"""
+
+# Clicks the selection checkbox of each given row index of a table in one call. Returns the indices clicked.
+SELECT_RESULT_ROWS_SCRIPT = """
+const table = document.getElementById(arguments[0]);
+const clicked = [];
+if (!table) { return clicked; }
+arguments[1].forEach(function (index) {
+    const cell = table.querySelector("div[role='row'][data-item-index='" + index + "'] div[role='gridcell'][data-is-row-selection='true']");
+    if (cell) { cell.click(); clicked.push(index); }
+});
+return clicked;
+"""
+
+# Reads the complete dataset of a Retool table widget from its React props, keyed by the same
+# column ids as the rendered cells' data-column-id. Only displayedData is used: it is sorted and
+# filtered the way the table renders it, so a record's position is its row's data-item-index. The
+# rows on screen are checked against it (each must share at least one cell text with the record at
+# its index). Returns a JSON string, or null when displayedData can't be found or doesn't line up
+# with the rendered rows (the caller then falls back to HARVEST_TABLE_ROWS_SCRIPT).
+READ_TABLE_MODEL_SCRIPT = """
+const table = document.getElementById(arguments[0]);
+if (!table) { return null; }
+function fiberOf(node) {
+    const key = Object.keys(node).find(function (k) { return k.startsWith("__reactFiber$") || k.startsWith("__reactInternalInstance$"); });
+    return key ? node[key] : null;
+}
+function columnKey(column) {
+    return column.dataKey || column.key || column.field || column.accessorKey || column.name;
+}
+let fiber = fiberOf(table.querySelector("[data-testid='TableWrapper::ScrollableContainer']") || table);
+for (let depth = 0; fiber && depth < 60; depth++, fiber = fiber.return) {
+    const props = fiber.memoizedProps;
+    const data = props && props.displayedData;
+    if (!Array.isArray(data) || !Array.isArray(props.columns)) { continue; }
+    const columns = props.columns.filter(function (column) { return column && column.id && columnKey(column) !== undefined; });
+    if (!columns.length) { continue; }
+    const headers = {};
+    columns.forEach(function (column) { headers[column.id] = String(column.label || column.header || column.name || column.id); });
+    const rows = data.map(function (record) {
+        const cells = {};
+        columns.forEach(function (column) {
+            const value = record == null ? null : record[columnKey(column)];
+            cells[column.id] = value == null ? "" : String(value).trim();
+        });
+        return cells;
+    });
+    const rendered = table.querySelectorAll("div[role='rowgroup'] div[role='row'][data-item-index]");
+    for (const row of rendered) {
+        const cells = rows[parseInt(row.getAttribute("data-item-index"), 10)];
+        if (!cells) { return null; }
+        let comparable = false;
+        let matched = false;
+        row.querySelectorAll("div[role='gridcell'][data-column-id]").forEach(function (cell) {
+            const expected = cells[cell.getAttribute("data-column-id")];
+            const text = cell.innerText.trim();
+            if (expected && text) {
+                comparable = true;
+                matched = matched || text === expected;
+            }
+        });
+        if (comparable && !matched) { return null; }
+    }
+    return JSON.stringify({headers: headers, rows: rows});
+}
+return null;
+"""
+
+# Scrolls a virtualized table straight to a row index: the offset comes from any rendered row's
+# position and the measured row height. Returns false if no row is rendered to measure from.
+SCROLL_TO_ROW_SCRIPT = """
+const scroller = document.querySelector(arguments[0]);
+const table = document.getElementById(arguments[1]);
+const target = arguments[2];
+if (!scroller || !table) { return false; }
+const rows = table.querySelectorAll("div[role='rowgroup'] div[role='row'][data-item-index]");
+if (!rows.length) { return false; }
+const anchor = rows[0];
+const rowHeight = anchor.getBoundingClientRect().height;
+if (!rowHeight) { return false; }
+const anchorOffset = anchor.getBoundingClientRect().top - scroller.getBoundingClientRect().top + scroller.scrollTop;
+const targetOffset = anchorOffset + (target - parseInt(anchor.getAttribute("data-item-index"), 10)) * rowHeight;
+scroller.scrollTop = Math.max(0, targetOffset - scroller.clientHeight / 2 + rowHeight / 2);
+return true;
+"""
+
+# Async: calls back with true as soon as an element matching the selector is in the DOM (watching
+# DOM mutations rather than polling), or false after the timeout in milliseconds.
+WAIT_FOR_SELECTOR_SCRIPT = """
+const selector = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+if (document.querySelector(selector)) { done(true); return; }
+const observer = new MutationObserver(function () {
+    if (document.querySelector(selector)) { observer.disconnect(); clearTimeout(timer); done(true); }
+});
+const timer = setTimeout(function () { observer.disconnect(); done(false); }, timeoutMs);
+observer.observe(document.body, {childList: true, subtree: true});
+"""
+
+# Marks the queue's history entry before an entry is opened, so the way back can be recognized.
+# The app's own history state is kept; only the marker is added.
+STAMP_QUEUE_HISTORY_SCRIPT = """
+const scroller = document.querySelector(arguments[0]);
+history.replaceState(Object.assign({}, history.state, {retoolBotQueue: arguments[1]}), "");
+return scroller ? scroller.scrollTop : 0;
+"""
+
+# Goes back one history entry and reports "stamped" once the queue's marked entry is current,
+# "moved" for any other entry, or "timeout" if the history didn't move (nothing to go back to).
+HISTORY_BACK_TO_STAMP_SCRIPT = """
+const stamp = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const stamped = function () { return !!(history.state && history.state.retoolBotQueue === stamp); };
+if (stamped()) { done("stamped"); return; }
+const onPopState = function () { clearTimeout(timer); window.removeEventListener("popstate", onPopState); done(stamped() ? "stamped" : "moved"); };
+const timer = setTimeout(function () { window.removeEventListener("popstate", onPopState); done("timeout"); }, timeoutMs);
+window.addEventListener("popstate", onPopState);
+history.back();
+"""
+MAX_QUEUE_HISTORY_STEPS = 10 # An entry pushes a few history entries; more than this and a reload is quicker
+
+SEARCH_FETCHING_MASK_SELECTOR = "div[data-testid='FetchingMask::WidgetFetchingMask']"
+RESULTS_FIRST_ROW_SELECTOR = "div[data-testid^='RetoolWidget:TableWidget'] div[role='row'][data-item-index='0']:not([data-is-header='true'])"
+RESULTS_EMPTY_STATE_SELECTOR = "div[data-testid='TableEmptyState::Container']"
+SEARCH_SETTLE_MS = 250 # A fetch that restarts within this window (debounced auto-search, then RETURN) is the same search
+SEARCH_DETECTOR_MAX_SECONDS = 25 # Stays under Selenium's 30 s default script timeout
+SEARCH_CLEAR_MAX_SECONDS = 2 # A clear's fetch still running after this is waited out when the next search arms the detector
+
+# Installs (once per page) a MutationObserver that detects when a Retool search has finished, and
+# arms it for the next search. Once armed, the search is complete when the fetching mask has come
+# and gone, or the results table's first row / empty state changed, and nothing refetched for
+# SEARCH_SETTLE_MS. Returns "busy" without arming if a fetch is still running, otherwise "armed".
+INSTALL_SEARCH_DETECTOR_SCRIPT = """
+const maskSelector = arguments[0];
+const rowSelector = arguments[1];
+const emptySelector = arguments[2];
+const settleMs = arguments[3];
+function visible(selector) {
+    const element = document.querySelector(selector);
+    return !!element && element.getClientRects().length > 0;
+}
+if (!window.__retoolBotSearch) {
+    const state = {armed: false, maskSeen: false, baseline: null, outcome: null, timer: null, callbacks: []};
+    const signature = function () {
+        const row = document.querySelector(rowSelector);
+        return (row ? row.innerText : "") + "|" + visible(emptySelector);
+    };
+    const outcomeNow = function () {
+        if (visible(rowSelector)) { return "data_found"; }
+        if (visible(emptySelector)) { return "no_results"; }
+        return null;
+    };
+    const check = function () {
+        if (!state.armed) { return; }
+        if (visible(maskSelector)) {
+            state.maskSeen = true;
+            clearTimeout(state.timer);
+            state.timer = null;
+            return;
+        }
+        if (state.timer || (!state.maskSeen && signature() === state.baseline)) { return; }
+        state.timer = setTimeout(function () {
+            state.timer = null;
+            const outcome = visible(maskSelector) ? null : outcomeNow();
+            if (!state.armed || !outcome) { return; } // Table not rendered yet; the next mutation checks again
+            state.armed = false;
+            state.outcome = outcome;
+            state.callbacks.splice(0).forEach(function (callback) { callback(outcome); });
+        }, settleMs);
+    };
+    state.arm = function () {
+        clearTimeout(state.timer);
+        state.timer = null;
+        state.armed = true;
+        state.maskSeen = false;
+        state.outcome = null;
+        state.baseline = signature();
+    };
+    new MutationObserver(check).observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+    window.__retoolBotSearch = state;
+}
+if (visible(maskSelector)) { return "busy"; }
+window.__retoolBotSearch.arm();
+return "armed";
+"""
+
+# Async: calls back with the armed search's outcome ("data_found" or "no_results") as soon as the
+# detector above resolves it, or null after the timeout in milliseconds or if no detector is armed.
+WAIT_FOR_SEARCH_RESULT_SCRIPT = """
+const timeoutMs = arguments[0];
+const done = arguments[arguments.length - 1];
+const state = window.__retoolBotSearch;
+if (!state) { done(null); return; }
+if (state.outcome) { done(state.outcome); return; }
+if (!state.armed) { done(null); return; }
+let finished = false;
+const finish = function (outcome) { if (!finished) { finished = true; clearTimeout(timer); done(outcome); } };
+const timer = setTimeout(function () { finish(null); }, timeoutMs);
+state.callbacks.push(finish);
+"""
+
+# Reads every rendered row of a virtualized Retool table (all columns), then scrolls it by one
+# viewport, in a single round trip. Returns null if the table is not on the page.
+HARVEST_TABLE_ROWS_SCRIPT = """
+const table = document.getElementById(arguments[0]);
+if (!table) { return null; }
+const scroller = table.querySelector("[data-testid='TableWrapper::ScrollableContainer']");
+const headers = {};
+table.querySelectorAll("[data-is-header='true'] [data-column-id]").forEach(function (cell) {
+    headers[cell.getAttribute("data-column-id")] = cell.innerText.trim();
+});
+const rows = [];
+table.querySelectorAll("div[role='rowgroup'] div[role='row'][data-item-index]").forEach(function (row) {
+    const cells = {};
+    row.querySelectorAll("div[role='gridcell'][data-column-id]").forEach(function (cell) {
+        const contents = cell.querySelector("[data-is-cell-contents='true']") || cell;
+        cells[cell.getAttribute("data-column-id")] = contents.innerText.trim();
+    });
+    rows.push({index: parseInt(row.getAttribute("data-item-index"), 10), cells: cells});
+});
+let scrolled = false;
+if (scroller) {
+    const before = scroller.scrollTop;
+    scroller.scrollTop += scroller.clientHeight;
+    scrolled = scroller.scrollTop !== before;
+}
+return {headers: headers, rows: rows, scrolled: scrolled};
+"""
+
+def review_key(entry):
+    """One fuzzy-match review per company, result and reason, however often the match comes up."""
+    return (entry.get("pb_id"), entry.get("legal_name") or entry.get("Name"), entry.get("review_reason"))
 
 def write_companies_to_review_json(companies_for_review, output_file='companies_to_review.json'):
     """
@@ -48,7 +304,7 @@ def write_companies_to_review_json(companies_for_review, output_file='companies_
     Appends to the file if it exists, otherwise creates a new one.
     """
     if not companies_for_review:
-        print(f"{COLOR_BLUE}No companies to review. Skipping creation of '{output_file}'.{COLOR_RESET}")
+        logger.info(f"No companies to review. Skipping creation of '{output_file}'.")
         return
 
     try:
@@ -60,28 +316,90 @@ def write_companies_to_review_json(companies_for_review, output_file='companies_
                     existing_data = json.load(f)
                     if not isinstance(existing_data, list): # Handle cases where file is malformed
                         existing_data = []
-                        print(f"{COLOR_ORANGE}Warning: '{output_file}' exists but is not a list. Overwriting.{COLOR_RESET}")
+                        logger.warning(f"Warning: '{output_file}' exists but is not a list. Overwriting.")
                 except json.JSONDecodeError:
-                    print(f"{COLOR_ORANGE}Warning: '{output_file}' exists but is invalid JSON. Overwriting.{COLOR_RESET}")
+                    logger.warning(f"Warning: '{output_file}' exists but is invalid JSON. Overwriting.")
                     existing_data = []
 
-        # Add new companies to the existing data, ensuring uniqueness if desired (not implemented for simplicity here)
-        existing_data.extend(companies_for_review)
+        # The same fuzzy match comes up on every run and for every identifier searched; keep one entry per match
+        seen_reviews = {review_key(entry) for entry in existing_data if isinstance(entry, dict) and entry.get("review_reason")}
+        for entry in companies_for_review:
+            if entry.get("review_reason"):
+                if review_key(entry) in seen_reviews:
+                    continue
+                seen_reviews.add(review_key(entry))
+            existing_data.append(entry)
 
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(existing_data, f, indent=4)
-        print(f"{COLOR_GREEN}Companies for review saved to '{output_file}'. Total entries: {len(existing_data)}.{COLOR_RESET}")
+        logger.milestone(f"Companies for review saved to '{output_file}'. Total entries: {len(existing_data)}.")
     except Exception as e:
-        print(f"{COLOR_RED}Error saving companies for review to '{output_file}': {e}{COLOR_RESET}")
-
-def normalize_name(name):
-    if not name:
-        return ""
-    normalized = name.lower()
-    normalized = normalized.translate(str.maketrans('', '', string.punctuation))
-    normalized = SUFFIX_PATTERN.sub('', normalized)
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    return normalized
+        logger.error(f"Error saving companies for review to '{output_file}': {e}")
+
+def run_batched_searches(scraper_instance, company_nodes, add_account_button_selector, companies_for_review, on_added=None):
+    """
+    Runs the planned Retool searches for several company nodes, grouped by search type, so the
+    search type dropdown only changes when the type does (e.g. every PB ID, then every name,
+    then every website). Type groups run in order of their best planned hit rate, and within a
+    group nodes keep their order. A node whose PB ID or website search added an account skips
+    its remaining searches, as in a per-node run.
+
+    Args:
+        scraper_instance (WebScraper): The WebScraper instance.
+        company_nodes (list): Company node dicts (legal_name, pb_id, etc.).
+        add_account_button_selector (str): Selector for the 'Add Account' button.
+        companies_for_review (list): List to append companies that need manual review.
+        on_added (callable, optional): (node_index, added_ids) -> None, called as soon as a search adds
+                                       accounts, so they are recorded even if a later search fails.
+
+    Returns:
+        list: One list of unique added Account IDs per node, in the order of company_nodes.
+    """
+    planner = scraper_instance.search_planner
+    plans = [planner.plan(company_details) for company_details in company_nodes]
+    added_ids_per_node = [[] for _ in company_nodes]
+    concluded_nodes = set() # Indices of nodes with a high-confidence match
+
+    type_scores = {}
+    for searches in plans:
+        for search in searches:
+            type_scores[search["search_type"]] = max(type_scores.get(search["search_type"], 0), search["score"])
+
+    for search_type in sorted(type_scores, key=type_scores.get, reverse=True):
+        batch = [
+            (node_index, search)
+            for node_index, searches in enumerate(plans)
+            for search in searches
+            if search["search_type"] == search_type
+        ]
+        logger.progress(f"--- Running {len(batch)} '{search_type}' searches for {len(company_nodes)} node(s) ---")
+        for node_index, search in batch:
+            if scraper_instance.stop_event is not None and scraper_instance.stop_event.is_set():
+                raise WorkerStopped()
+            if node_index in concluded_nodes:
+                planner.record_skipped(search["field"])
+                continue
+            company_details = company_nodes[node_index]
+            company_name_for_log = company_details.get('legal_name') or company_details.get('Name')
+            logger.info(f"Attempting to search/add by {search['field']} for '{company_name_for_log}': {search['value']}")
+            ids_from_search = scraper_instance.search_and_add_accounts(
+                search["value"], search["search_type"],
+                add_account_button_selector=add_account_button_selector,
+                source_company_details=company_details if search["validate_name"] else None, # PB ID and website results need no name validation
+                companies_for_review=companies_for_review
+            )
+            planner.record(search["field"], bool(ids_from_search))
+            added_ids_per_node[node_index].extend(ids_from_search)
+            if ids_from_search and on_added is not None:
+                on_added(node_index, ids_from_search)
+
+            if ids_from_search and search["field"] in HIGH_CONFIDENCE_FIELDS:
+                logger.info(f"High-confidence {search['field']} match added {ids_from_search} for '{company_name_for_log}'. Skipping its remaining searches.")
+                concluded_nodes.add(node_index)
+
+    return [list(set(added_ids)) for added_ids in added_ids_per_node]
+
+
 def input_company_data(scraper_instance, company_details, add_account_button_selector, companies_for_review):
     """
     Inputs data for a single company node into the Retool search and add accounts fields.
@@ -97,133 +415,120 @@ def input_company_data(scraper_instance, company_details, add_account_button_sel
         list: A consolidated list of Account IDs added for this company node.
     """
     company_name_for_log = company_details.get('legal_name') or company_details.get('Name')
-    print(f"{COLOR_BLUE}--- Inputting data for node: {company_name_for_log} (PB ID: {company_details.get('pb_id')}) ---{COLOR_RESET}")
-    
-    all_added_ids_for_this_node = []
-
-    # Pitchbook ID
-    if company_details.get("pb_id"):
-        print(f"{COLOR_BLUE}Attempting to search/add by Pitchbook ID: {company_details['pb_id']}{COLOR_RESET}")
-        if scraper_instance.enter_data_into_retool_search(company_details["pb_id"], "Pitchbook ID"):
-            ids_from_pb_search = scraper_instance.check_and_add_accounts(
-                add_account_button_selector=add_account_button_selector,
-                source_company_details=None, # No name validation needed for PB ID search
-                companies_for_review=companies_for_review
-            )
-            all_added_ids_for_this_node.extend(ids_from_pb_search)
-        time.sleep(1) # Small pause after each attempt
-
-    # Legal Name
-    if company_details.get("legal_name"):
-        print(f"{COLOR_BLUE}Attempting to search/add by Legal Name: {company_details['legal_name']}{COLOR_RESET}")
-        if scraper_instance.enter_data_into_retool_search(company_details["legal_name"], "Name"): 
-            ids_from_name_search = scraper_instance.check_and_add_accounts(
-                add_account_button_selector=add_account_button_selector,
-                source_company_details=company_details, # Pass the full details
-                companies_for_review=companies_for_review
-            )
-            all_added_ids_for_this_node.extend(ids_from_name_search)
-        time.sleep(1)
-
-    # Former Names (if exists)
-    if company_details.get("former_names"):
-        print(f"{COLOR_BLUE}Attempting to search/add by Former Names: {company_details['former_names']}{COLOR_RESET}")
-        if scraper_instance.enter_data_into_retool_search(company_details["former_names"], "Name"): 
-            ids_from_former_name_search = scraper_instance.check_and_add_accounts(
-                add_account_button_selector=add_account_button_selector,
-                source_company_details=company_details, # Pass the full details
-                companies_for_review=companies_for_review
-            )
-            all_added_ids_for_this_node.extend(ids_from_former_name_search)
-        time.sleep(1)
-        
-    # Also Known As (if exists)
-    if company_details.get("also_known_as"):
-        print(f"{COLOR_BLUE}Attempting to search/add by Also Known As: {company_details['also_known_as']}{COLOR_RESET}")
-        if scraper_instance.enter_data_into_retool_search(company_details["also_known_as"], "Name"): 
-            ids_from_aka_search = scraper_instance.check_and_add_accounts(
-                add_account_button_selector=add_account_button_selector,
-                source_company_details=company_details, # Pass the full details
-                companies_for_review=companies_for_review
-            )
-            all_added_ids_for_this_node.extend(ids_from_aka_search)
-        time.sleep(1)
-
-    # Website (if exists)
-    if company_details.get("website_link"):
-        print(f"{COLOR_BLUE}Attempting to search/add by Website: {company_details['website_link']}{COLOR_RESET}")
-        if scraper_instance.enter_data_into_retool_search(company_details["website_link"], "Website"):
-            ids_from_website_search = scraper_instance.check_and_add_accounts(
-                add_account_button_selector=add_account_button_selector,
-                source_company_details=None, # No name validation needed for website search
-                companies_for_review=companies_for_review
-            )
-            all_added_ids_for_this_node.extend(ids_from_website_search)
-        time.sleep(1)
-
-    print(f"{COLOR_BLUE}Finished processing all search fields for node: {company_name_for_log}.{COLOR_RESET}")
-    return list(set(all_added_ids_for_this_node)) # Return unique IDs
+    logger.progress(f"--- Inputting data for node: {company_name_for_log} (PB ID: {company_details.get('pb_id')}) ---")
+    added_ids = run_batched_searches(scraper_instance, [company_details], add_account_button_selector, companies_for_review)[0]
+    logger.info(f"Finished processing all search fields for node: {company_name_for_log}.")
+    return added_ids
 
 
-def process_pitchbook_hierarchy(scraper_instance, company_node, add_account_button_selector, companies_for_review, processed_nodes_set):
+def process_pitchbook_hierarchy(scraper_instance, company_node, add_account_button_selector, companies_for_review, processed_nodes_set, changed_only=False):
     """
-    Recursively processes a Pitchbook company node and its affiliates,
-    inputting their data into Retool and embedding the added Account IDs.
-    This version uses a set to prevent re-processing of any node.
+    Inputs a Pitchbook company node and its affiliates into Retool and embeds the added Account
+    IDs in each node. The nodes to process are collected first, then their searches run batched
+    by search type across the whole hierarchy. Each node gets its IDs as soon as the search that
+    added them returns, so an interrupted batch keeps the attribution of accounts already added.
 
     Args:
         scraper_instance (WebScraper): The WebScraper instance.
         company_node (dict): The current company node (can be root or affiliate) from Pitchbook JSON.
         add_account_button_selector (str): Selector for the 'Add Account' button.
         companies_for_review (list): List to append companies that need manual review.
-        processed_nodes_set (set): A set of unique identifiers for nodes already processed in this script run.
+        processed_nodes_set (set or SharedClaimSet): Unique identifiers for nodes already processed in this
+                                                    script run, shared by all workers in --workers mode.
+        changed_only (bool): Only input nodes the incremental crawl flagged as new or newly attached
+                             (and their subtrees), skipping unchanged subtrees entirely.
+    """
+    nodes_to_input = []
+    collect_hierarchy_nodes(company_node, processed_nodes_set, nodes_to_input, changed_only)
+    if not nodes_to_input:
+        return
+
+    # --- Add the IDs to each company node in the dictionary as each search returns ---
+    def embed_added_ids(node_index, added_ids):
+        node = nodes_to_input[node_index]
+        if 'added_account_ids' not in node:
+            node['added_account_ids'] = []
+        node['added_account_ids'].extend(added_ids)
+        node['added_account_ids'] = list(set(node['added_account_ids'])) # Keep it unique
+        logger.milestone(f"Appended Account IDs {added_ids} to node '{node.get('legal_name') or node.get('Name')}'.")
+
+    run_batched_searches(scraper_instance, nodes_to_input, add_account_button_selector, companies_for_review, on_added=embed_added_ids)
+
+
+def collect_hierarchy_nodes(company_node, processed_nodes_set, nodes_to_input, changed_only=False):
+    """
+    Walks a Pitchbook company node and its affiliates depth first and appends every node that
+    still needs its data input to nodes_to_input. Uses processed_nodes_set to prevent
+    re-processing of any node.
     """
     if not isinstance(company_node, dict):
-        print(f"{COLOR_ORANGE}Warning: Skipping non-dictionary company_node in hierarchy: {company_node}{COLOR_RESET}")
+        logger.warning(f"Warning: Skipping non-dictionary company_node in hierarchy: {company_node}")
         return
 
+    if changed_only:
+        node_label = company_node.get('legal_name') or company_node.get('Name')
+        if company_node.get('edge_status') == EDGE_STATUS_ADDED or company_node.get('change_status') == CHANGE_STATUS_NEW:
+            logger.info(f"Node '{node_label}' is new since the previous crawl. Processing it and its subtree.")
+            changed_only = False
+        elif company_node.get('change_status') == CHANGE_STATUS_UNCHANGED:
+            logger.info(f"Node '{node_label}' and its subtree are unchanged since the previous crawl. Skipping.", color=COLOR_YELLOW)
+            return
+        elif company_node.get('change_status') != CHANGE_STATUS_CHANGED:
+            # No marker: nothing says this subtree was handled before, so it is treated as new
+            logger.info(f"Node '{node_label}' has no change marker. Processing it and its subtree as new.")
+            changed_only = False
+        else:
+            # Changed node: its own accounts were handled last cycle, only look for new edges below it
+            for child in (company_node.get('related_companies') or []) + (company_node.get('nested_related_companies') or []):
+                collect_hierarchy_nodes(child, processed_nodes_set, nodes_to_input, changed_only=True)
+            return
+
     # --- Gatekeeper Logic ---
     node_name = company_node.get('legal_name') or company_node.get('Name')
     # Create a unique ID for the node: prefer Pitchbook ID, fall back to normalized name.
-    unique_id = company_node.get('pb_id') or normalize_name(node_name)
+    pb_id = node_pb_id(company_node)
+    if pb_id and not company_node.get('pb_id'):
+        company_node['pb_id'] = pb_id # Older crawl files only carry the PB ID inside profile links
+    unique_id = pb_id or normalize_name(node_name)
 
     if not unique_id:
-        print(f"{COLOR_ORANGE}Warning: Skipping node with no usable identifier: {node_name}{COLOR_RESET}")
+        logger.warning(f"Warning: Skipping node with no usable identifier: {node_name}")
         return
 
-    if unique_id in processed_nodes_set:
-        print(f"{COLOR_YELLOW}Node '{node_name}' (ID: {unique_id}) has already been processed in this run. Skipping.{COLOR_RESET}")
+    if not claim_key(processed_nodes_set, unique_id):
+        logger.info(f"Node '{node_name}' (ID: {unique_id}) has already been processed in this run. Skipping.", color=COLOR_YELLOW)
         return
 
-    print(f"{COLOR_BLUE}Processing node '{node_name}' (ID: {unique_id}). Adding to processed set.{COLOR_RESET}")
-    processed_nodes_set.add(unique_id)
+    logger.info(f"Queueing node '{node_name}' (ID: {unique_id}). Added to processed set.")
+    nodes_to_input.append(company_node)
     # --- End Gatekeeper Logic ---
 
-    # --- Input data for the current company node and get back the added IDs ---
-    added_ids = input_company_data(scraper_instance, company_node, add_account_button_selector, companies_for_review)
-    
-    # --- Add the collected IDs to the current company node in the dictionary ---
-    if 'added_account_ids' not in company_node:
-        company_node['added_account_ids'] = []
-    
-    company_node['added_account_ids'].extend(added_ids)
-    company_node['added_account_ids'] = list(set(company_node['added_account_ids'])) # Keep it unique
-    
-    if added_ids:
-        print(f"{COLOR_GREEN}Appended Account IDs {added_ids} to node '{node_name}'.{COLOR_RESET}")
-
-    # --- Process nested companies ---
+    # --- Collect nested companies ---
     related_companies_list = company_node.get('related_companies')
     if related_companies_list and isinstance(related_companies_list, list):
-        print(f"{COLOR_YELLOW}DEBUG: Found {len(related_companies_list)} entries in 'related_companies'. Processing them.{COLOR_RESET}")
+        logger.debug(f"Found {len(related_companies_list)} entries in 'related_companies'. Processing them.")
         for related_company in related_companies_list:
-            process_pitchbook_hierarchy(scraper_instance, related_company, add_account_button_selector, companies_for_review, processed_nodes_set)
+            collect_hierarchy_nodes(related_company, processed_nodes_set, nodes_to_input, changed_only)
     
     nested_related_companies_list = company_node.get('nested_related_companies')
     if nested_related_companies_list and isinstance(nested_related_companies_list, list):
-        print(f"{COLOR_YELLOW}DEBUG: Found {len(nested_related_companies_list)} entries in 'nested_related_companies'. Processing them.{COLOR_RESET}")
+        logger.debug(f"Found {len(nested_related_companies_list)} entries in 'nested_related_companies'. Processing them.")
         for nested_related_company in nested_related_companies_list:
-            process_pitchbook_hierarchy(scraper_instance, nested_related_company, add_account_button_selector, companies_for_review, processed_nodes_set)
+            collect_hierarchy_nodes(nested_related_company, processed_nodes_set, nodes_to_input, changed_only)
+
+
+def has_change_markers(pitchbook_data):
+    """True if any node in the crawl data carries an incremental crawl change or edge marker."""
+    stack = list(pitchbook_data) if isinstance(pitchbook_data, list) else [pitchbook_data]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if node.get('change_status') or node.get('edge_status'):
+            return True
+        stack.extend(node.get('related_companies') or [])
+        stack.extend(node.get('nested_related_companies') or [])
+    return False
 
 
 def are_names_similar(query_name, result_name):
@@ -252,6 +557,69 @@ def are_names_similar(query_name, result_name):
     
     return False
 
+def create_shared_search_state(timeouts_path=RETOOL_TIMEOUTS_FILE, search_cache_path=SEARCH_CACHE_FILE,
+                               search_cache_ttl_hours=DEFAULT_SEARCH_CACHE_TTL_HOURS, search_stats_path=SEARCH_STATS_FILE,
+                               artifact_mode=ARTIFACT_MODE_DOM):
+    """Learned timeouts, search cache, search planner and failure artifacts, as one tuple that several WebScrapers can share."""
+    return (
+        AdaptiveTimeouts(timeouts_path), # Page waits use timeouts learned from observed latencies
+        SearchResultCache(search_cache_path, ttl_seconds=search_cache_ttl_hours * 3600), # Repeat searches answered without the UI
+        SearchPlanner(search_stats_path, name_normalizer=normalize_name), # Which searches to run per node, best first
+        FailureArtifacts(None, mode=artifact_mode), # One quota and one set of rate limits for the whole run; workers bind their own browser
+    )
+
+def close_shared_search_state(shared_state):
+    for component in shared_state:
+        component.close()
+
+
+class SharedClaimSet:
+    """
+    Set of keys claimed by parallel RetoolBot workers (processed nodes, claimed queue rows).
+    claim() checks and adds under one lock, so two workers can never both claim the same key.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def claim(self, key):
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            return True
+
+    def release(self, key):
+        with self._lock:
+            self._keys.discard(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._keys
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+
+def claim_key(claimed_keys, key):
+    """Adds key to a set or SharedClaimSet unless it is already there. Returns True if this call added it."""
+    if isinstance(claimed_keys, SharedClaimSet):
+        return claimed_keys.claim(key)
+    if key in claimed_keys:
+        return False
+    claimed_keys.add(key)
+    return True
+
+
+class WorkerStopped(BaseException):
+    """
+    Raised in a --workers thread once the pool has asked its workers to stop (Ctrl-C). A
+    BaseException, so the per-entry `except Exception` handlers let it through.
+    """
+
+
 class WebScraper:
 
     # Load indicator: Wait for the first row of the details table/grid to appear.
@@ -264,7 +632,10 @@ class WebScraper:
     DETAILS_PAGE_PITCHBOOK_ID_SELECTOR = "div[role='gridcell'][data-column-id='49266'] span[data-is-cell-contents='true']"
     # Updated load indicator to be an element from the name's container
    
-    def __init__(self, headless=False, profile_name="default_scraper_profile"):
+    def __init__(self, headless=False, profile_name="default_scraper_profile", artifact_mode=ARTIFACT_MODE_DOM,
+                 timeouts_path=RETOOL_TIMEOUTS_FILE, search_cache_path=SEARCH_CACHE_FILE,
+                 search_cache_ttl_hours=DEFAULT_SEARCH_CACHE_TTL_HOURS, search_stats_path=SEARCH_STATS_FILE,
+                 shared_state=None):
         """Initialize the web scraper with Chrome driver."""
         self.options = Options()
 
@@ -282,9 +653,9 @@ class WebScraper:
         if not os.path.exists(self.scraper_profile_dir):
             try:
                 os.makedirs(self.scraper_profile_dir, exist_ok=True)
-                print(f"{COLOR_BLUE}Created new scraper profile directory: {self.scraper_profile_dir}{COLOR_RESET}")
+                logger.info(f"Created new scraper profile directory: {self.scraper_profile_dir}")
             except Exception as e:
-                print(f"{COLOR_RED}ERROR: Could not create scraper profile directory {self.scraper_profile_dir}. Check permissions. Error: {e}{COLOR_RESET}")
+                logger.error(f"ERROR: Could not create scraper profile directory {self.scraper_profile_dir}. Check permissions. Error: {e}")
                 raise
 
         self.options.add_argument(f"--user-data-dir={self.scraper_profile_dir}")
@@ -295,11 +666,152 @@ class WebScraper:
         self.driver = webdriver.Chrome(service=service, options=self.options)
         self.driver.maximize_window() # Maximize window to make manual login easier
         self.wait = WebDriverWait(self.driver, 10) # Default wait time
+        # Parallel workers pass in one (timeouts, search_cache, search_planner, failure_artifacts) tuple so they
+        # learn together and don't overwrite each other's files; whoever created them closes them.
+        self.owns_shared_state = shared_state is None
+        if shared_state is None:
+            shared_state = create_shared_search_state(timeouts_path, search_cache_path, search_cache_ttl_hours, search_stats_path, artifact_mode)
+        self.shared_state = shared_state
+        self.timeouts, self.search_cache, self.search_planner, shared_artifacts = shared_state
+        self.failure_artifacts = shared_artifacts.bind(self.driver) # Throttled diagnostics instead of a screenshot per failure
         self.logged_in = False
+        self.stop_event = None # threading.Event set by run_worker_pool to stop this worker between searches
+        self.last_search_outcome = None # "data_found"/"no_results" once the search completion detector saw the last search finish
+    def remember_queue_position(self, table_id=CLEANUP_QUEUE_TABLE_ID):
+        """
+        Stamps the queue's history entry and returns {"stamp", "scroll_top"}, taken just before
+        opening a queue entry (see return_to_cleanup_queue).
+        """
+        stamp = uuid.uuid4().hex
+        scroll_top = self.driver.execute_script(
+            STAMP_QUEUE_HISTORY_SCRIPT, f"div#{table_id} [data-testid='TableWrapper::ScrollableContainer']", stamp
+        )
+        return {"stamp": stamp, "scroll_top": scroll_top or 0}
+
+    def return_to_cleanup_queue(self, dashboard_url, position=None, table_id=CLEANUP_QUEUE_TABLE_ID):
+        """
+        Returns to the Cleanup Queue after working on an entry. Opening an entry is in-app
+        navigation, so going back one history entry at a time until the queue's stamped entry is
+        current shows the queue again without rebooting the Retool app, and the table's scroll
+        offset is restored. history.length can't be used to count the steps: it includes forward
+        entries and is capped by the browser. Falls back to reloading the dashboard when the
+        stamped entry isn't reached or the queue doesn't reappear. Raises on a failed reload, like
+        the waits it replaces.
+
+        Args:
+            position (dict, optional): remember_queue_position() from before the entry was opened.
+        """
+        rows_selector = f"div#{table_id} div[role='row'][data-item-index]"
+        if position:
+            started = time.time()
+            outcome = None
+            for _ in range(MAX_QUEUE_HISTORY_STEPS):
+                try:
+                    outcome = self.driver.execute_async_script(HISTORY_BACK_TO_STAMP_SCRIPT, position["stamp"], 3000)
+                except Exception as e:
+                    # Going back left the app (a full page load ends the script); reload instead
+                    logger.warning(f"Going back to the Cleanup Queue failed: {e}")
+                    outcome = None
+                if outcome != "moved":
+                    break
+            if outcome == "stamped":
+                if self.wait_for_selector(rows_selector, self.timeouts.timeout("queue_after_history_back", 10)):
+                    self.timeouts.record("queue_after_history_back", time.time() - started)
+                    self.driver.execute_script(
+                        "var s=document.querySelector(arguments[0]);if(s){s.scrollTop=arguments[1];}",
+                        f"div#{table_id} [data-testid='TableWrapper::ScrollableContainer']", position["scroll_top"]
+                    )
+                    self.wait_for_selector(rows_selector, 5)
+                    logger.info("Back on the Cleanup Queue through in-app navigation.")
+                    return
+                self.timeouts.record_timeout("queue_after_history_back", optional=True)
+                logger.warning("Cleanup Queue did not reappear after going back. Reloading the dashboard.")
+            elif outcome is not None:
+                logger.warning(f"Did not get back to the Cleanup Queue's history entry ({outcome}). Reloading the dashboard.")
+
+        logger.info(f"Navigating back to Cleanup Queue page for next entry: {dashboard_url}")
+        self.driver.get(dashboard_url)
+        self.timeouts.wait(self.driver, "cleanup_queue_table", 30).until(
+            EC.presence_of_element_located((By.ID, table_id)),
+            message=f"Timeout waiting for Cleanup Queue table (ID: {table_id}) to be present after navigating back."
+        )
+        time.sleep(5)
+
+    def wait_for_selector(self, selector, timeout_seconds):
+        """Waits for an element to appear using a MutationObserver in the page, in a single round trip."""
+        try:
+            return bool(self.driver.execute_async_script(WAIT_FOR_SELECTOR_SCRIPT, selector, int(timeout_seconds * 1000)))
+        except Exception as e:
+            logger.warning(f"Mutation wait for '{selector}' failed: {e}")
+            return False
+
+    def arm_search_detector(self):
+        """
+        Arms the in-page search completion detector (installing it on first use) so the next
+        search's outcome can be awaited with wait_for_search_result. A fetch that is still running
+        when it is armed is waited out first, so it isn't mistaken for the one being awaited.
+
+        Returns:
+            bool: True if the detector is armed.
+        """
+        args = (SEARCH_FETCHING_MASK_SELECTOR, RESULTS_FIRST_ROW_SELECTOR, RESULTS_EMPTY_STATE_SELECTOR, SEARCH_SETTLE_MS)
+        try:
+            if self.driver.execute_script(INSTALL_SEARCH_DETECTOR_SCRIPT, *args) == "armed":
+                return True
+            self.timeouts.wait(self.driver, "search_fetching_mask", 10).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, SEARCH_FETCHING_MASK_SELECTOR)))
+            return self.driver.execute_script(INSTALL_SEARCH_DETECTOR_SCRIPT, *args) == "armed"
+        except Exception as e:
+            logger.warning(f"Could not arm the search completion detector: {e}")
+            return False
+
+    def wait_for_search_result(self, target="search_results", default=20, max_seconds=SEARCH_DETECTOR_MAX_SECONDS):
+        """
+        Waits for the armed search to finish, in a single round trip. The timeout is learned under
+        `target` (the clear's fetch and the real search are timed separately) and capped at max_seconds.
+
+        Returns:
+            str: "data_found" or "no_results", or None if the detector timed out or wasn't armed.
+        """
+        timeout = min(self.timeouts.timeout(target, default), max_seconds)
+        started = time.time()
+        try:
+            outcome = self.driver.execute_async_script(WAIT_FOR_SEARCH_RESULT_SCRIPT, int(timeout * 1000))
+        except Exception as e:
+            logger.warning(f"Search completion wait failed: {e}")
+            outcome = None
+        if outcome:
+            self.timeouts.record(target, time.time() - started)
+        else:
+            self.timeouts.record_timeout(target, optional=True)
+        return outcome
+
+    def scroll_to_row_index(self, scrollable_element_selector, table_id, target_index, row_selector):
+        """
+        Scrolls a virtualized table so the row with data-item-index target_index is rendered, in one
+        jump computed from the measured row height, then waits for row_selector to appear.
+
+        Returns:
+            bool: True once row_selector is in the DOM.
+        """
+        try:
+            if not self.driver.execute_script(SCROLL_TO_ROW_SCRIPT, scrollable_element_selector, table_id, target_index):
+                return False
+        except Exception as e:
+            logger.warning(f"Could not jump to row {target_index}: {e}")
+            return False
+        timeout = self.timeouts.timeout("row_after_jump", 5)
+        started = time.time()
+        if self.wait_for_selector(row_selector, timeout):
+            self.timeouts.record("row_after_jump", time.time() - started)
+            return True
+        self.timeouts.record_timeout("row_after_jump", optional=True)
+        return False
+
     def find_and_click_row_with_retry(self, scrollable_element_selector, table_id, target_index):
         """
         Robustly finds a row by its index in a lazy-loaded table, scrolling if necessary,
-        and clicks it. Includes a fallback to a JavaScript click.
+        and clicks it. The table is first scrolled straight to the row (see scroll_to_row_index);
+        the stepwise scroll search with a JavaScript click fallback only runs if that fails.
 
         Args:
             scrollable_element_selector (str): The CSS selector for the scrollable container of the table.
@@ -316,19 +828,27 @@ class WebScraper:
             f"div[role='gridcell'][data-column-id='787e6'] div[data-is-cell-contents='true'][class*='_isClickable_']"
         )
 
+        if self.scroll_to_row_index(scrollable_element_selector, table_id, target_index, clickable_name_cell_selector):
+            try:
+                self.driver.find_element(By.CSS_SELECTOR, clickable_name_cell_selector).click()
+                logger.success(f"Click successful for row {target_index} after jumping to it.")
+                return True
+            except Exception as e:
+                logger.warning(f"Jumped to row {target_index} but could not click it ({e}). Falling back to the scroll search.")
+
         for attempt in range(max_find_attempts):
-            print(f"{COLOR_BLUE}Attempt {attempt + 1}/{max_find_attempts} to find and click row {target_index}...{COLOR_RESET}")
+            logger.info(f"Attempt {attempt + 1}/{max_find_attempts} to find and click row {target_index}...")
             try:
                 # First, try to find and click the element directly (it might be visible)
-                target_cell = WebDriverWait(self.driver, 5).until( # Shorter wait for direct find
+                target_cell = self.timeouts.wait(self.driver, "queue_row_clickable", 5, optional=True).until( # Shorter wait for direct find
                     EC.element_to_be_clickable((By.CSS_SELECTOR, clickable_name_cell_selector))
                 )
                 target_cell.click()
-                print(f"{COLOR_GREEN}Standard click successful for row {target_index}.{COLOR_RESET}")
+                logger.success(f"Standard click successful for row {target_index}.")
                 return True
             except TimeoutException:
                 # If not found directly, perform a scroll and search routine
-                print(f"{COLOR_ORANGE}Row {target_index} not immediately visible. Starting scroll search...{COLOR_RESET}")
+                logger.warning(f"Row {target_index} not immediately visible. Starting scroll search...")
                 scrollable_element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, scrollable_element_selector)))
                 
                 # Scroll down a bit to trigger loading
@@ -339,7 +859,7 @@ class WebScraper:
                 try:
                     target_cell = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, clickable_name_cell_selector)))
                     target_cell.click()
-                    print(f"{COLOR_GREEN}Standard click successful for row {target_index} after scrolling.{COLOR_RESET}")
+                    logger.success(f"Standard click successful for row {target_index} after scrolling.")
                     return True
                 except TimeoutException:
                     # If still not found, scroll up to trigger loading in the other direction
@@ -350,20 +870,22 @@ class WebScraper:
                     try:
                         element_to_force_click = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, clickable_name_cell_selector)))
                         self.driver.execute_script(js_click_script, element_to_force_click)
-                        print(f"{COLOR_GREEN}JavaScript click successful for row {target_index} after scrolling.{COLOR_RESET}")
+                        logger.success(f"JavaScript click successful for row {target_index} after scrolling.")
                         return True
                     except Exception as final_e:
-                        print(f"{COLOR_ORANGE}Could not find row {target_index} on attempt {attempt + 1}. Error: {final_e}{COLOR_RESET}")
+                        logger.warning(f"Could not find row {target_index} on attempt {attempt + 1}. Error: {final_e}")
                         # On the last attempt, this will fall through and the function will return False
 
-        print(f"{COLOR_RED}All {max_find_attempts} attempts failed to find and click row {target_index}.{COLOR_RESET}")
+        logger.error(f"All {max_find_attempts} attempts failed to find and click row {target_index}.")
         return False
 
     def close(self):
         """Closes the browser."""
+        if self.owns_shared_state:
+            close_shared_search_state(self.shared_state)
         if self.driver:
             self.driver.quit()
-            print(f"{COLOR_BLUE}Browser closed.{COLOR_RESET}")
+            logger.info("Browser closed.")
 
     def check_login_status(self, test_url, success_indicator, check_timeout=30):
         """
@@ -378,24 +900,24 @@ class WebScraper:
         Returns:
             bool: True if logged in, False otherwise.
         """
-        print(f"{COLOR_BLUE}Attempting to verify existing session on: {test_url}{COLOR_RESET}")
+        logger.info(f"Attempting to verify existing session on: {test_url}")
         try:
             self.driver.get(test_url)
-            print(f"{COLOR_BLUE}Current URL after navigation attempt: {self.driver.current_url}{COLOR_RESET}")
-            print(f"{COLOR_BLUE}Looking for success indicator (XPath): '{success_indicator}' for up to {check_timeout} seconds...{COLOR_RESET}")
+            logger.info(f"Current URL after navigation attempt: {self.driver.current_url}")
+            logger.info(f"Looking for success indicator (XPath): '{success_indicator}' for up to {check_timeout} seconds...")
             
             self.wait.until(
                 EC.presence_of_element_located((By.XPATH, success_indicator)) 
             )
-            print(f"{COLOR_GREEN}Success indicator found. Existing session appears active.{COLOR_RESET}")
+            logger.milestone("Success indicator found. Existing session appears active.")
             self.logged_in = True
             return True
         except TimeoutException:
-            print(f"{COLOR_ORANGE}Success indicator not found on {test_url} within {check_timeout} seconds. Session may be expired or invalid.{COLOR_RESET}")
+            logger.warning(f"Success indicator not found on {test_url} within {check_timeout} seconds. Session may be expired or invalid.")
             self.logged_in = False
             return False
         except Exception as e:
-            print(f"{COLOR_RED}Error during login status check: {e}{COLOR_RESET}")
+            logger.error(f"Error during login status check: {e}")
             self.logged_in = False
             return False
 
@@ -410,13 +932,13 @@ class WebScraper:
             wait_duration (int): How many seconds to wait for the user to log in.
         """
         try:
-            print(f"{COLOR_BLUE}Navigating to initial login page: {login_url}{COLOR_RESET}")
+            logger.info(f"Navigating to initial login page: {login_url}")
             self.driver.get(login_url)
             
-            print(f"\n{COLOR_YELLOW}******************************************************************{COLOR_RESET}")
-            print(f"{COLOR_YELLOW}* ACTION REQUIRED: Please complete the SSO login in the browser. *{COLOR_RESET}")
-            print(f"{COLOR_YELLOW}* You have {wait_duration} seconds to sign in.                           *{COLOR_RESET}")
-            print(f"{COLOR_YELLOW}******************************************************************{COLOR_RESET}")
+            logger.info("\n******************************************************************", color=COLOR_YELLOW)
+            logger.info("* ACTION REQUIRED: Please complete the SSO login in the browser. *", color=COLOR_YELLOW)
+            logger.info(f"* You have {wait_duration} seconds to sign in.                           *", color=COLOR_YELLOW)
+            logger.info("******************************************************************", color=COLOR_YELLOW)
             
             # Wait for the success indicator to appear on the final dashboard page
             # This indicates the user has completed the SSO process and been redirected.
@@ -424,99 +946,154 @@ class WebScraper:
                 EC.presence_of_element_located((By.XPATH, success_indicator))
             )
             
-            print(f"\n{COLOR_GREEN}Login Successful! Success indicator found after manual SSO login.{COLOR_RESET}")
+            logger.milestone("\nLogin Successful! Success indicator found after manual SSO login.")
             self.logged_in = True
             return True
         
         except TimeoutException:
-            print(f"{COLOR_RED}Login timed out. The success indicator was not found after {wait_duration} seconds.{COLOR_RESET}")
-            print(f"{COLOR_RED}Please ensure you completed the login and were redirected to the correct page.{COLOR_RESET}")
-            self.driver.save_screenshot(f"retool_sso_timeout_{int(time.time())}.png")
-            print(f"{COLOR_ORANGE}Screenshot saved for debugging.{COLOR_RESET}")
+            logger.error(f"Login timed out. The success indicator was not found after {wait_duration} seconds.")
+            logger.error("Please ensure you completed the login and were redirected to the correct page.")
+            artifact_path = self.failure_artifacts.capture("retool_sso_timeout")
+            if artifact_path:
+                logger.warning(f"Diagnostics saved to {artifact_path} for debugging.")
             return False
         except Exception as e:
-            print(f"{COLOR_RED}An unexpected error occurred while waiting for SSO login: {e}{COLOR_RESET}")
+            logger.error(f"An unexpected error occurred while waiting for SSO login: {e}")
             return False
 
-    def scrape_cleanup_queue_names(self, retool_dashboard_url, output_json_file=None):
+    def read_table_model(self, table_id):
+        """
+        Reads a Retool table's whole dataset in one script call from the widget's React props
+        (see READ_TABLE_MODEL_SCRIPT), without scrolling.
+
+        Returns:
+            tuple: ({data-item-index: {column id: cell text}}, {column id: header label}), or None
+                   if the widget's displayed data isn't reachable on this page or doesn't match the
+                   rendered rows.
+        """
+        try:
+            model_json = self.driver.execute_script(READ_TABLE_MODEL_SCRIPT, table_id)
+        except Exception as e:
+            logger.warning(f"Could not read the data model of table '{table_id}': {e}")
+            return None
+        if not model_json:
+            return None
+        try:
+            model = json.loads(model_json)
+        except ValueError:
+            return None
+        rows_by_index = dict(enumerate(model.get("rows") or []))
+        logger.info(f"Read {len(rows_by_index)} rows of table '{table_id}' from its data model in one call.")
+        return rows_by_index, model.get("headers") or {}
+
+    def read_table_rows(self, table_id):
+        """All rows of a Retool table: from its data model if reachable, otherwise by a scrolling harvest."""
+        model = self.read_table_model(table_id)
+        if model is not None:
+            return model
+        logger.info(f"Data model of table '{table_id}' not available. Falling back to a scrolling harvest.")
+        return self.harvest_table_rows(table_id)
+
+    def harvest_table_rows(self, table_id, max_scroll_steps=100):
+        """
+        Reads every row of a virtualized Retool table in one scrolling pass, one script call per
+        viewport (see HARVEST_TABLE_ROWS_SCRIPT). Assumes the table is already on the page.
+
+        Returns:
+            tuple: ({data-item-index: {column id: cell text}}, {column id: header label})
         """
-        Scrapes root company name, Pitchbook ID (by clicking into each detail page),
-        and data-item-index from all entries in the Cleanup Queue table.
+        rows_by_index = {}
+        headers = {}
+        self.driver.execute_script("var s=document.querySelector(arguments[0]);if(s){s.scrollTop=0;}",
+                                   f"div#{table_id} [data-testid='TableWrapper::ScrollableContainer']")
+        time.sleep(1)
+        for _ in range(max_scroll_steps):
+            harvested = self.driver.execute_script(HARVEST_TABLE_ROWS_SCRIPT, table_id)
+            if not harvested:
+                logger.warning(f"Table '{table_id}' not found while harvesting rows.")
+                break
+            headers.update(harvested.get("headers") or {})
+            rows_before = len(rows_by_index)
+            for row in harvested.get("rows") or []:
+                rows_by_index.setdefault(row["index"], {}).update(row["cells"])
+            if not harvested.get("scrolled") and len(rows_by_index) == rows_before:
+                break
+            time.sleep(1.5) # Let the next viewport of rows render
+        logger.info(f"Harvested {len(rows_by_index)} rows from table '{table_id}' in one scrolling pass.")
+        return rows_by_index, headers
+
+    def scrape_cleanup_queue_names(self, retool_dashboard_url, output_json_file=None, click_through_all=False):
+        """
+        Scrapes root company name, Pitchbook ID and data-item-index from all entries in the
+        Cleanup Queue table.
         This function is designed to be called by a separate script for initial data collection.
-        It now uses a robust find-and-click retry mechanism.
+
+        Every column is read straight from the list (see read_table_rows). Only rows whose
+        Pitchbook ID column is empty are clicked into, to read the ID from the details page with
+        the robust find-and-click retry mechanism.
 
         Args:
             retool_dashboard_url (str): The URL of the Cleanup Queue page to navigate to.
             output_json_file (str, optional): Path to a JSON file where the scraped data will be saved.
                                              If None, data is not saved to a file.
+            click_through_all (bool): Click into every entry's details page, as before the list harvest.
 
         Returns:
             list: A list of dictionaries, where each dictionary contains
-                  'root_company_name', 'pitchbook_id', and 'data_item_index' for each unique entry.
+                  'root_company_name', 'pitchbook_id', and 'data_item_index' for each unique entry,
+                  plus 'columns' with every list column by header (harvested entries only).
         """
-        print(f"{COLOR_BLUE}Starting to scrape Cleanup Queue entries for names, PIDs, and data-item-indices...{COLOR_RESET}")
+        logger.info("Starting to scrape Cleanup Queue entries for names, PIDs, and data-item-indices...")
 
-        cleanup_queue_table_id = "CleanupQueueEntryTable--0" 
+        cleanup_queue_table_id = CLEANUP_QUEUE_TABLE_ID
         scrollable_element_selector = f"div#{cleanup_queue_table_id} div._outer_1y096_2[data-testid='TableWrapper::ScrollableContainer']"
 
         collected_entries = {} # {data_item_index: {"root_company_name": ..., "pitchbook_id": ..., "data_item_index": ...}}
         
         # --- Initial navigation and discovery of all indices ---
-        print(f"{COLOR_BLUE}Ensuring we are on Cleanup Queue page for discovery: {retool_dashboard_url}{COLOR_RESET}")
+        logger.info(f"Ensuring we are on Cleanup Queue page for discovery: {retool_dashboard_url}")
         self.driver.get(retool_dashboard_url)
         try:
-            WebDriverWait(self.driver, 30).until(
+            self.timeouts.wait(self.driver, "cleanup_queue_table", 30).until(
                 EC.presence_of_element_located((By.ID, cleanup_queue_table_id)),
                 message=f"Timeout waiting for Cleanup Queue table (ID: {cleanup_queue_table_id}) to be present for discovery."
             )
-            print(f"{COLOR_BLUE}Cleanup Queue table is present.{COLOR_RESET}")
+            logger.info("Cleanup Queue table is present.")
             time.sleep(3) # Give some buffer for table contents to fully render.
         except Exception as e:
-            print(f"{COLOR_RED}Error during initial Cleanup Queue page load or scroll for discovery: {e}{COLOR_RESET}")
-            self.driver.save_screenshot(f"cleanup_queue_discovery_error_{int(time.time())}.png")
+            logger.error(f"Error during initial Cleanup Queue page load or scroll for discovery: {e}")
+            self.failure_artifacts.capture("cleanup_queue_discovery_error")
             return [] # Cannot proceed without the table
 
-        # Discover all indices by scrolling
-        discovered_indices = set()
-        last_discovered_count = -1
-        scroll_attempts_discovery = 0
-        max_scroll_attempts_discovery = 100 # Increased scroll attempts for discovery
-        
-        scrollable_element = self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, scrollable_element_selector)))
-        self.driver.execute_script("arguments[0].scrollTop = 0;", scrollable_element)
-        time.sleep(1)
-
-        while scroll_attempts_discovery < max_scroll_attempts_discovery:
-            current_visible_rows_elements = self.driver.find_elements(By.CSS_SELECTOR, f"div#{cleanup_queue_table_id} div[role='rowgroup'] div[role='row'][data-item-index]")
-            for row_elem in current_visible_rows_elements:
-                idx = row_elem.get_attribute('data-item-index')
-                if idx is not None:
-                    discovered_indices.add(int(idx))
-
-            if len(discovered_indices) == last_discovered_count:
-                print(f"{COLOR_BLUE}No new unique indices discovered after scroll. Assuming end of content. Total discovered: {len(discovered_indices)}.{COLOR_RESET}")
-                break
-            
-            last_discovered_count = len(discovered_indices)
-            
-            self.driver.execute_script("arguments[0].scrollTop += arguments[0].clientHeight;", scrollable_element)
-            time.sleep(1.5)
-            scroll_attempts_discovery += 1
-
-        sorted_discovered_indices = sorted(list(discovered_indices))
-        print(f"{COLOR_GREEN}Discovered {len(sorted_discovered_indices)} unique Cleanup Queue entries for detailed scraping.{COLOR_RESET}")
+        # Read every row from the list: the table's data model in one call, or one scrolling pass
+        harvested_rows, column_headers = self.read_table_rows(cleanup_queue_table_id)
+        indices_to_click = []
+        for index, cells in sorted(harvested_rows.items()):
+            root_company_name = cells.get(CLEANUP_QUEUE_NAME_COLUMN_ID) or None
+            pitchbook_id = cells.get(CLEANUP_QUEUE_PB_ID_COLUMN_ID) or None
+            if click_through_all or not pitchbook_id:
+                indices_to_click.append(index)
+                continue
+            collected_entries[index] = {
+                "root_company_name": root_company_name,
+                "pitchbook_id": pitchbook_id,
+                "data_item_index": index,
+                "columns": {column_headers.get(column_id) or column_id: text for column_id, text in cells.items()},
+            }
+
+        logger.success(f"Read {len(collected_entries)} Cleanup Queue entries from the list; {len(indices_to_click)} need the details page.")
 
         # --- Loop through each discovered index, click, scrape details, and navigate back ---
-        for target_index_int in sorted_discovered_indices:
-            print(f"\n{COLOR_BLUE}--- Processing entry with data-item-index='{target_index_int}' ---{COLOR_RESET}")
+        queue_position = None
+        on_queue_page = True
+        for target_index_int in indices_to_click:
+            logger.progress(f"\n--- Processing entry with data-item-index='{target_index_int}' ---")
             try:
-                # 1. Ensure we are on Cleanup Queue page before starting
-                self.driver.get(retool_dashboard_url)
-                WebDriverWait(self.driver, 30).until(
-                    EC.presence_of_element_located((By.ID, cleanup_queue_table_id)),
-                    message=f"Timeout waiting for Cleanup Queue table before processing row {target_index_int}."
-                )
-                time.sleep(3)
+                # 1. Ensure we are on Cleanup Queue page before starting (in-app back navigation when possible)
+                if not on_queue_page:
+                    self.return_to_cleanup_queue(retool_dashboard_url, queue_position, cleanup_queue_table_id)
+                on_queue_page = True
+                queue_position = self.remember_queue_position(cleanup_queue_table_id)
 
                 # 2. Use the robust find and click method
                 click_successful = self.find_and_click_row_with_retry(
@@ -526,6 +1103,7 @@ class WebScraper:
                 )
 
                 if click_successful:
+                    on_queue_page = False
                     time.sleep(2) # Delay after click to allow navigation to details page
 
                     # 3. Scrape details (name and PB ID) from the opened details page
@@ -537,25 +1115,27 @@ class WebScraper:
                             "pitchbook_id": scraped_pitchbook_id,
                             "data_item_index": target_index_int
                         }
-                        print(f"{COLOR_GREEN}Scraped: Name='{scraped_root_company_name}', PB ID='{scraped_pitchbook_id}' for index {target_index_int}.{COLOR_RESET}")
+                        logger.success(f"Scraped: Name='{scraped_root_company_name}', PB ID='{scraped_pitchbook_id}' for index {target_index_int}.")
                     else:
-                        print(f"{COLOR_ORANGE}No data scraped from details page for entry {target_index_int}. Skipping.{COLOR_RESET}")
+                        logger.warning(f"No data scraped from details page for entry {target_index_int}. Skipping.")
                 else:
-                    print(f"{COLOR_RED}Could not click row {target_index_int} after all attempts. Skipping.{COLOR_RESET}")
+                    logger.error(f"Could not click row {target_index_int} after all attempts. Skipping.")
             except Exception as e:
-                print(f"{COLOR_RED}An unexpected error occurred while processing entry {target_index_int}: {e}. Skipping.{COLOR_RESET}")
-                self.driver.save_screenshot(f"scrape_details_unexpected_error_{target_index_int}_{int(time.time())}.png")
+                logger.error(f"An unexpected error occurred while processing entry {target_index_int}: {e}. Skipping.")
+                self.failure_artifacts.capture("scrape_details_unexpected_error", context={"target_index": target_index_int, "error": str(e)})
+                on_queue_page = False
+                queue_position = None
 
         final_scraped_data = list(collected_entries.values())
-        print(f"{COLOR_GREEN}\nFinished detailed scraping of Cleanup Queue. Total unique entries with details: {len(final_scraped_data)}.{COLOR_RESET}")
+        logger.milestone(f"\nFinished detailed scraping of Cleanup Queue. Total unique entries with details: {len(final_scraped_data)}.")
 
         if output_json_file:
             try:
                 with open(output_json_file, 'w', encoding='utf-8') as f:
                     json.dump(final_scraped_data, f, indent=4)
-                print(f"{COLOR_GREEN}Scraped data saved to '{output_json_file}'.{COLOR_RESET}")
+                logger.milestone(f"Scraped data saved to '{output_json_file}'.")
             except Exception as e:
-                print(f"{COLOR_RED}Error saving scraped data to JSON file '{output_json_file}': {e}{COLOR_RESET}")
+                logger.error(f"Error saving scraped data to JSON file '{output_json_file}': {e}")
 
         return final_scraped_data
 
@@ -567,25 +1147,25 @@ class WebScraper:
         Returns:
             tuple: (root_company_name, pitchbook_id) or (None, None) if not found.
         """
-        print(f"{COLOR_BLUE}Scraping data from details page...{COLOR_RESET}")
+        logger.info("Scraping data from details page...")
         root_company_name = None
         pitchbook_id = None
 
         try:
             # 1. Wait for the primary content of the details page (the H4 with dynamic name) to load
             # First, wait for the element to be present.
-            WebDriverWait(self.driver, 30).until(
+            self.timeouts.wait(self.driver, "details_root_heading", 30).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, DETAILS_PAGE_LOAD_INDICATOR)),
                 message="Timeout waiting for details page's Root Name H4 element to be present."
             )
             
             # Then, wait for its text to contain more than just "Root: " (i.e., the actual name has loaded)
-            WebDriverWait(self.driver, 30).until( # Increased this specific wait to 30s
+            self.timeouts.wait(self.driver, "details_root_name_text", 30).until( # Up to 30s until samples exist
                 lambda driver: driver.find_element(By.CSS_SELECTOR, DETAILS_PAGE_LOAD_INDICATOR).text.strip() not in ["Root:", "Root: "],
                 message="Timeout waiting for Root Name H4 text to load actual company name."
             )
             
-            print(f"{COLOR_BLUE}Details page loaded successfully, found dynamic root name H4.{COLOR_RESET}")
+            logger.info("Details page loaded successfully, found dynamic root name H4.")
             time.sleep(1) # Give a little extra time for other data to settle
 
             # --- Re-locate the main row element immediately before using it ---
@@ -597,50 +1177,50 @@ class WebScraper:
             # 2. Scrape Root Company Name using the specific data-column-id
             try:
                 # Use the re-located details_page_row_element as the base for finding children
-                name_element = WebDriverWait(details_page_row_element, 10).until(
+                name_element = self.timeouts.wait(details_page_row_element, "details_root_name_cell", 10, optional=True).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, DETAILS_PAGE_ROOT_COMPANY_NAME_SELECTOR)),
                     message="Root Company Name element not present within timeout."
                 )
                 root_company_name = name_element.text.strip()
-                print(f"{COLOR_BLUE}Scraped Root Company Name: {root_company_name}{COLOR_RESET}")
+                logger.info(f"Scraped Root Company Name: {root_company_name}")
             except TimeoutException:
-                print(f"{COLOR_ORANGE}Root Company Name element not found or loaded within timeout. Setting to None.{COLOR_RESET}")
+                logger.warning("Root Company Name element not found or loaded within timeout. Setting to None.")
                 root_company_name = None
             except NoSuchElementException:
-                print(f"{COLOR_ORANGE}Root Company Name element not found on details page. Setting to None.{COLOR_RESET}")
+                logger.warning("Root Company Name element not found on details page. Setting to None.")
                 root_company_name = None
             except Exception as e:
-                print(f"{COLOR_RED}Error scraping Root Company Name: {e}{COLOR_RESET}")
+                logger.error(f"Error scraping Root Company Name: {e}")
                 root_company_name = None
 
             # 3. Scrape Pitchbook ID using the specific data-column-id
             try:
                 # Use the re-located details_page_row_element as the base for finding children
-                pb_id_element = WebDriverWait(details_page_row_element, 10).until(
+                pb_id_element = self.timeouts.wait(details_page_row_element, "details_pb_id_cell", 10, optional=True).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, DETAILS_PAGE_PITCHBOOK_ID_SELECTOR)),
                     message="Pitchbook ID element not present within timeout."
                 )
                 pitchbook_id = pb_id_element.text.strip()
-                print(f"{COLOR_BLUE}Scraped Pitchbook ID: {pitchbook_id}{COLOR_RESET}")
+                logger.info(f"Scraped Pitchbook ID: {pitchbook_id}")
             except TimeoutException:
-                print(f"{COLOR_ORANGE}Pitchbook ID element not found or loaded within timeout. Setting to None.{COLOR_RESET}")
+                logger.warning("Pitchbook ID element not found or loaded within timeout. Setting to None.")
                 pitchbook_id = None
             except NoSuchElementException:
-                print(f"{COLOR_ORANGE}Pitchbook ID element not found on details page. Setting to None.{COLOR_RESET}")
+                logger.warning("Pitchbook ID element not found on details page. Setting to None.")
                 pitchbook_id = None
             except Exception as e:
-                print(f"{COLOR_RED}Error scraping Pitchbook ID: {e}{COLOR_RESET}")
+                logger.error(f"Error scraping Pitchbook ID: {e}")
                 pitchbook_id = None
 
             if not root_company_name and not pitchbook_id:
-                print(f"{COLOR_ORANGE}Neither Root Company Name nor Pitchbook ID could be scraped from the details page.{COLOR_RESET}")
+                logger.warning("Neither Root Company Name nor Pitchbook ID could be scraped from the details page.")
 
         except TimeoutException as te:
-            print(f"{COLOR_RED}Timeout waiting for details page to load ({DETAILS_PAGE_LOAD_INDICATOR}): {te}{COLOR_RESET}")
-            self.driver.save_screenshot(f"details_page_load_timeout_{int(time.time())}.png") 
+            logger.error(f"Timeout waiting for details page to load ({DETAILS_PAGE_LOAD_INDICATOR}): {te}")
+            self.failure_artifacts.capture("details_page_load_timeout") 
         except Exception as e:
-            print(f"{COLOR_RED}An unexpected error occurred while scraping details page: {e}{COLOR_RESET}")
-            self.driver.save_screenshot(f"details_page_scraping_error_{int(time.time())}.png")
+            logger.error(f"An unexpected error occurred while scraping details page: {e}")
+            self.failure_artifacts.capture("details_page_scraping_error")
 
         return root_company_name, pitchbook_id
     
@@ -652,7 +1232,7 @@ class WebScraper:
         Args:
             index (int): The zero-based index of the entry to click (default is 0 for the first entry).
         """
-        print(f"{COLOR_BLUE}Attempting to click entry {index} in Cleanup Queue table...{COLOR_RESET}")
+        logger.info(f"Attempting to click entry {index} in Cleanup Queue table...")
         
         # Selector for the main Cleanup Queue table container (using data-testid for the table widget)
         table_container_selector = "div[data-testid='RetoolWidget:TableWidget2']"
@@ -671,40 +1251,120 @@ class WebScraper:
             )
             
             entry_element.click()
-            print(f"{COLOR_GREEN}Successfully clicked entry {index} in the Cleanup Queue table.{COLOR_RESET}")
+            logger.success(f"Successfully clicked entry {index} in the Cleanup Queue table.")
             return True
         except TimeoutException:
-            print(f"{COLOR_ORANGE}Timeout waiting for Cleanup Queue entry {index} to be clickable.{COLOR_RESET}")
+            logger.warning(f"Timeout waiting for Cleanup Queue entry {index} to be clickable.")
             return False
         except NoSuchElementException:
-            print(f"{COLOR_ORANGE}Cleanup Queue entry {index} element not found.{COLOR_RESET}")
+            logger.warning(f"Cleanup Queue entry {index} element not found.")
             return False
         except Exception as e:
-            print(f"{COLOR_RED}Error clicking Cleanup Queue entry {index}: {e}{COLOR_RESET}")
+            logger.error(f"Error clicking Cleanup Queue entry {index}: {e}")
             return False
         
-    def check_and_add_accounts(self, add_account_button_selector, source_company_details=None, companies_for_review=None):
+    def _should_select_row(self, result_name, source_company_details=None, companies_for_review=None, scored=None):
+        """
+        Decides whether a search result row should be selected. PB ID and website searches select
+        every row; name searches score the result against the node's names (see name_matching) and
+        only select auto-accepted matches. A match in the review band is added to the review list
+        and not selected.
+        Used for live table rows and for rows answered from the search cache alike.
+
+        Args:
+            scored (dict, optional): This row's entry from a score_table call over the whole result
+                                     table; scored here if not given.
+        """
+        # Not searching by name (e.g., PB ID or Website directly), so it's a direct match.
+        if not source_company_details:
+            return True
+
+        if scored is None:
+            scored = score_table([result_name], node_name_set(source_company_details))[0]
+        name_to_match = scored["matched_name"]
+
+        if scored["decision"] == DECISION_ACCEPT:
+            logger.success(f"Name match validated: '{name_to_match}' ~ '{result_name}' (score {scored['score']:.2f}).")
+            return True
+        # Likely the same company, but not certain enough to add. Add to review and DO NOT click.
+        if scored["decision"] == DECISION_REVIEW:
+            logger.warning(f"Fuzzy match found: '{name_to_match}' is SIMILAR to '{result_name}' (score {scored['score']:.2f}). Adding to review list and SKIPPING click.")
+            if companies_for_review is not None:
+                review_entry = source_company_details.copy()
+                review_entry['review_reason'] = f"Fuzzy match with Retool result: '{result_name}' (score {scored['score']:.2f})"
+                review_entry.pop('related_companies', None)
+                review_entry.pop('nested_related_companies', None)
+                # A row can be scored more than once per search (cache, table model, live scan); queue it once
+                if not any(review_key(entry) == review_key(review_entry) for entry in companies_for_review):
+                    companies_for_review.append(review_entry)
+        # No significant similarity.
+        return False
+
+    def search_and_add_accounts(self, search_value, search_type_label, add_account_button_selector,
+                                source_company_details=None, companies_for_review=None):
+        """
+        Runs one Retool search and adds the matching accounts, consulting the search cache first.
+
+        A cached search is replayed through the same matching rules as live rows. If no cached row
+        would be selected (no results, or only fuzzy or non-matching names), the search is answered
+        without touching the UI. Otherwise the search runs live, since rows can only be selected in
+        the table, and the fresh rows replace the cache entry.
+
+        Returns:
+            list: Account IDs added by this search.
+        """
+        cached_rows = self.search_cache.get(search_type_label, search_value)
+        if cached_rows is not None:
+            # The whole cached table is scored against the node's names in one call. A row's selected
+            # state only holds for the session that saw it, so every cached row counts as unselected.
+            scores = score_table([row.get("name") for row in cached_rows], node_name_set(source_company_details)) if source_company_details else [None] * len(cached_rows)
+            rows_to_select = [
+                row for row, scored in zip(cached_rows, scores)
+                if self._should_select_row(row.get("name"), source_company_details, companies_for_review, scored)
+            ]
+            if not rows_to_select:
+                logger.info(f"Search cache hit for '{search_type_label}' = '{search_value}' ({len(cached_rows)} rows, none to add). Skipping the Retool search.", color=COLOR_YELLOW)
+                return []
+            logger.info(f"Search cache hit for '{search_type_label}' = '{search_value}' has {len(rows_to_select)} row(s) to add. Running the search live.")
+
+        added_account_ids = []
+        if self.enter_data_into_retool_search(search_value, search_type_label):
+            harvest = {"rows": [], "complete": False} if self.search_cache.enabled else None
+            added_account_ids = self.check_and_add_accounts(
+                add_account_button_selector=add_account_button_selector,
+                source_company_details=source_company_details,
+                companies_for_review=companies_for_review,
+                harvest=harvest
+            )
+            if harvest and harvest["complete"]:
+                self.search_cache.put(search_type_label, search_value, harvest["rows"])
+        return added_account_ids
+
+    def check_and_add_accounts(self, add_account_button_selector, source_company_details=None, companies_for_review=None, harvest=None):
         OK_BUTTON_SELECTOR = "//button[./span[text()='OK']]" 
         """
         Validates and clicks checkboxes for accounts. Scrapes the Account ID for each checked row.
-        If a name match is not 100% exact, it is logged for review and not clicked.
+        Name search results are scored against the node's names; only auto-accepted matches are
+        clicked, and matches in the review band are logged for review.
         
         Args:
             add_account_button_selector (str): Selector for the 'Add Account' button.
             source_company_details (dict, optional): Full details of the company being searched for.
             companies_for_review (list, optional): List to append companies that need manual review.
+            harvest (dict, optional): {"rows": [], "complete": False}; filled with every result row as it was
+                                      before clicking, and marked complete once the whole table was read.
             
         Returns:
             list: A list of Account IDs that were successfully checked.
         """
-        print(f"{COLOR_BLUE}Waiting for search results to populate the table or for empty state...{COLOR_RESET}")
-        
         added_account_ids = [] # List to store the scraped Account IDs
-        
-        time.sleep(2) # Initial general buffer
 
-        first_data_row_selector = "div[data-testid^='RetoolWidget:TableWidget'] div[role='row'][data-item-index='0']:not([data-is-header='true'])"
-        no_results_selector = "div[data-testid='TableEmptyState::Container']"
+        # The search completion detector already saw the results come in; otherwise wait for them here
+        table_state, self.last_search_outcome = self.last_search_outcome, None
+        detected_by_search = table_state is not None
+        if not detected_by_search:
+            logger.info("Waiting for search results to populate the table or for empty state...")
+            time.sleep(2) # Initial general buffer
 
         try:
             # Custom Expected Condition to wait for either data or no-results message
@@ -724,98 +1384,110 @@ class WebScraper:
                     except NoSuchElementException: pass
                     return False
 
-            table_state = WebDriverWait(self.driver, 20).until(
-                wait_for_data_or_no_results(first_data_row_selector, no_results_selector),
-                message="Timed out waiting for table to show data or 'No rows found' message."
-            )
+            if not table_state:
+                table_state = self.timeouts.wait(self.driver, "search_results_or_empty", 20).until(
+                    wait_for_data_or_no_results(RESULTS_FIRST_ROW_SELECTOR, RESULTS_EMPTY_STATE_SELECTOR),
+                    message="Timed out waiting for table to show data or 'No rows found' message."
+                )
 
             if table_state == "no_results":
-                print(f"{COLOR_ORANGE}No search results found. Halting this operation.{COLOR_RESET}")
+                logger.warning("No search results found. Halting this operation.")
+                if harvest is not None:
+                    harvest["complete"] = True
                 return added_account_ids # Return empty list
             
-            print(f"{COLOR_BLUE}Search results detected. Processing rows...{COLOR_RESET}")
-            time.sleep(3)
+            logger.info("Search results detected. Processing rows...")
+            if not detected_by_search:
+                time.sleep(3)
 
             table_container_id = "AddAccount--0"
+
+            # A name search often has nothing to select. The table's data model answers that in one
+            # call, so the rows only get scrolled through when something will be clicked.
+            if source_company_details:
+                table_model = self.read_table_model(table_container_id)
+                if table_model is not None:
+                    model_rows = [
+                        {"name": cells.get(ADD_ACCOUNT_TABLE_NAME_COLUMN_ID) or None,
+                         "account_id": cells.get(ADD_ACCOUNT_TABLE_ACCOUNT_ID_COLUMN_ID) or None,
+                         "selected": False}
+                        for _, cells in sorted(table_model[0].items())
+                    ]
+                    scores = score_table([row["name"] for row in model_rows], node_name_set(source_company_details))
+                    rows_to_select = [
+                        row for row, scored in zip(model_rows, scores)
+                        if self._should_select_row(row["name"], source_company_details, companies_for_review, scored)
+                    ]
+                    if not rows_to_select:
+                        logger.info(f"None of the {len(model_rows)} result rows match. Skipping the row scan.", color=COLOR_YELLOW)
+                        if harvest is not None:
+                            harvest["rows"] = model_rows
+                            harvest["complete"] = True
+                        return added_account_ids
+
             scrollable_element_selector = f"div#{table_container_id} div[data-testid='TableWrapper::ScrollableContainer']"
             
             processed_row_indices = set()
             clicked_count = 0
+            rows_missed = False # A row that couldn't be read is never revisited, so the cache would be incomplete
             
             last_number_of_rows = 0
             scroll_attempts = 0
             max_total_scroll_attempts = 50
-            js_click_script = "var e=arguments[0];e&&e.click();return!0;"
 
             while scroll_attempts < max_total_scroll_attempts:
-                current_visible_rows_elements = self.driver.find_elements(By.CSS_SELECTOR, f"div#{table_container_id} div[role='rowgroup'] div[role='row'][data-item-index]")
-                
-                for row_element in current_visible_rows_elements:
-                    try:
-                        row_index_str = row_element.get_attribute('data-item-index')
-                        if row_index_str is None or row_index_str in processed_row_indices:
+                # One call reads every rendered row; Python decides; one call selects the chosen rows
+                snapshot = self.driver.execute_script(
+                    SNAPSHOT_RESULT_ROWS_SCRIPT, table_container_id, ADD_ACCOUNT_TABLE_NAME_COLUMN_ID, ADD_ACCOUNT_TABLE_ACCOUNT_ID_COLUMN_ID
+                ) or []
+                new_rows = []
+                for row in snapshot:
+                    row_index_str = str(row["index"])
+                    if row_index_str in processed_row_indices:
+                        continue
+                    processed_row_indices.add(row_index_str)
+                    if source_company_details and not row.get("name"):
+                        logger.error(f"Could not read the name of result row {row_index_str}. Skipping.")
+                        rows_missed = True
+                        continue
+                    new_rows.append(row)
+                    if harvest is not None:
+                        harvest["rows"].append({"name": row.get("name"), "account_id": row.get("account_id")})
+
+                unselected_rows = [row for row in new_rows if not row.get("selected")]
+                if source_company_details:
+                    scores = score_table([row["name"] for row in unselected_rows], node_name_set(source_company_details))
+                else:
+                    scores = [None] * len(unselected_rows)
+                    if unselected_rows:
+                        logger.info(f"Not searching by name. Selecting {len(unselected_rows)} row(s).")
+                rows_to_click = [
+                    row for row, scored in zip(unselected_rows, scores)
+                    if self._should_select_row(row.get("name"), source_company_details, companies_for_review, scored)
+                ]
+
+                if rows_to_click:
+                    clicked_indices = set(self.driver.execute_script(
+                        SELECT_RESULT_ROWS_SCRIPT, table_container_id, [row["index"] for row in rows_to_click]
+                    ) or [])
+                    for row in rows_to_click:
+                        if row["index"] not in clicked_indices:
+                            logger.warning(f"Checkbox for row {row['index']} disappeared before it could be clicked.")
+                            rows_missed = True
                             continue
-                        
-                        processed_row_indices.add(row_index_str)
-
-                        if row_element.get_attribute('aria-selected') == 'false':
-                            checkbox_gridcell = row_element.find_element(By.CSS_SELECTOR, "div[role='gridcell'][data-is-row-selection='true']")
-                            perform_click = False
-
-                            # If we are searching by name, we need to validate.
-                            if source_company_details:
-                                name_to_match = source_company_details.get("legal_name") or source_company_details.get("Name")
-                                result_name_element = row_element.find_element(By.CSS_SELECTOR, f"div[role='gridcell'][data-column-id='{ADD_ACCOUNT_TABLE_NAME_COLUMN_ID}'] span[data-is-cell-contents='true']")
-                                result_name = result_name_element.text.strip()
-                                
-                                normalized_match_name = normalize_name(name_to_match)
-                                normalized_result_name = normalize_name(result_name)
-                                
-                                # Strict, 100% match after normalization
-                                if normalized_match_name == normalized_result_name:
-                                    print(f"{COLOR_GREEN}Exact name match validated: '{name_to_match}' == '{result_name}'.{COLOR_RESET}")
-                                    perform_click = True
-                                # Fuzzy match, but not exact. Add to review and DO NOT click.
-                                elif are_names_similar(name_to_match, result_name):
-                                    print(f"{COLOR_ORANGE}Fuzzy match found: '{name_to_match}' is SIMILAR to '{result_name}'. Adding to review list and SKIPPING click.{COLOR_RESET}")
-                                    if companies_for_review is not None:
-                                        review_entry = source_company_details.copy()
-                                        review_entry['review_reason'] = f"Fuzzy match with Retool result: '{result_name}'"
-                                        review_entry.pop('related_companies', None)
-                                        review_entry.pop('nested_related_companies', None)
-                                        companies_for_review.append(review_entry)
-                                    perform_click = False
-                                # No significant similarity.
-                                else:
-                                    perform_click = False
-                            else: # Not searching by name (e.g., PB ID or Website directly), so it's a direct match.
-                                perform_click = True
-                                print(f"{COLOR_BLUE}Not searching by name. Selecting row {row_index_str}.{COLOR_RESET}")
-
-                            if perform_click:
-                                # Scrape the Account ID from this row *before* clicking
-                                try:
-                                    account_id_element = row_element.find_element(By.CSS_SELECTOR, f"div[role='gridcell'][data-column-id='{ADD_ACCOUNT_TABLE_ACCOUNT_ID_COLUMN_ID}'] a")
-                                    account_id = account_id_element.text.strip()
-                                    if account_id:
-                                        added_account_ids.append(account_id)
-                                        print(f"{COLOR_GREEN}Scraped Account ID '{account_id}' for row {row_index_str}.{COLOR_RESET}")
-                                except NoSuchElementException:
-                                    print(f"{COLOR_ORANGE}Could not find Account ID for row {row_index_str}. Will click but not record ID.{COLOR_RESET}")
-                                
-                                if self.driver.execute_script(js_click_script, checkbox_gridcell):
-                                    clicked_count += 1
-                                    print(f"{COLOR_GREEN}Clicked checkbox for row {row_index_str}.{COLOR_RESET}")
-                                    time.sleep(0.1)
-                    except StaleElementReferenceException:
-                        print(f"{COLOR_ORANGE}Stale element encountered in check_and_add_accounts. Re-scanning...{COLOR_RESET}")
-                        break
-                    except Exception as e:
-                        print(f"{COLOR_RED}Error during row processing in check_and_add_accounts: {e}{COLOR_RESET}")
-                        pass # Ignore errors on individual rows and continue
+                        clicked_count += 1
+                        # Record the Account ID from this row
+                        if row.get("account_id"):
+                            added_account_ids.append(row["account_id"])
+                            logger.success(f"Scraped Account ID '{row['account_id']}' for row {row['index']}.")
+                        else:
+                            logger.warning(f"Could not find Account ID for row {row['index']}. Clicked but not recording ID.")
+                    logger.success(f"Clicked {len(clicked_indices)} checkbox(es) in one call.")
 
                 if len(processed_row_indices) == last_number_of_rows:
-                    print(f"{COLOR_BLUE}No new unique rows discovered after scroll. Assuming end of content.{COLOR_RESET}")
+                    logger.info("No new unique rows discovered after scroll. Assuming end of content.")
+                    if harvest is not None:
+                        harvest["complete"] = not rows_missed
                     break
                 
                 last_number_of_rows = len(processed_row_indices)
@@ -824,10 +1496,10 @@ class WebScraper:
                 time.sleep(1.5)
                 scroll_attempts += 1
 
-            print(f"{COLOR_GREEN}Finished processing all available account rows. Total clicked: {clicked_count}.{COLOR_RESET}")
+            logger.success(f"Finished processing all available account rows. Total clicked: {clicked_count}.")
             
             if clicked_count == 0:
-                print(f"{COLOR_ORANGE}No accounts were selected for addition. Halting this operation.{COLOR_RESET}")
+                logger.warning("No accounts were selected for addition. Halting this operation.")
                 return added_account_ids # Return any IDs that might have been scraped but not added
 
             time.sleep(1)
@@ -836,55 +1508,59 @@ class WebScraper:
             button_script = "var b=document.querySelector(arguments[0]);if(b){b.click();return true;}return false;"
             button_clicked = False
             start_time = time.time()
-            timeout = 20
+            timeout = self.timeouts.timeout("add_account_button", 20)
             while time.time() - start_time < timeout:
                 try:
                     if self.driver.execute_script(button_script, add_account_button_selector):
                         button_clicked = True
-                        print(f"{COLOR_GREEN}JavaScript click successful on 'Add Account' button.{COLOR_RESET}")
+                        self.timeouts.record("add_account_button", time.time() - start_time)
+                        logger.success("JavaScript click successful on 'Add Account' button.")
                         break
                 except Exception as e:
-                    print(f"{COLOR_ORANGE}Error during JavaScript click attempt for button: {e}{COLOR_RESET}")
+                    logger.warning(f"Error during JavaScript click attempt for button: {e}")
                 time.sleep(0.5)
 
             if not button_clicked:
-                print(f"{COLOR_RED}Failed to click 'Add Account' button via JavaScript after {timeout} seconds. Cannot proceed.{COLOR_RED}")
-                self.driver.save_screenshot(f"CRITICAL_js_button_failed_{int(time.time())}.png")
+                self.timeouts.record_timeout("add_account_button")
+                logger.error(f"Failed to click 'Add Account' button via JavaScript after {timeout} seconds. Cannot proceed.")
+                self.failure_artifacts.capture("CRITICAL_js_button_failed")
                 return added_account_ids # Return what we have so far
 
             time.sleep(2)
 
             # --- Click the "OK" confirmation button ---
-            print(f"{COLOR_BLUE}Attempting to click the 'OK' confirmation button...{COLOR_RESET}")
+            logger.info("Attempting to click the 'OK' confirmation button...")
             ok_button_script = "var b=document.evaluate(arguments[0],document,null,XPathResult.FIRST_ORDERED_NODE_TYPE,null).singleNodeValue;if(b){b.click();return true;}return false;"
             ok_button_clicked = False
             start_time_ok = time.time()
-            timeout_ok = 10
+            timeout_ok = self.timeouts.timeout("ok_confirmation_button", 10)
             while time.time() - start_time_ok < timeout_ok:
                 try:
                     if self.driver.execute_script(ok_button_script, OK_BUTTON_SELECTOR):
                         ok_button_clicked = True
-                        print(f"{COLOR_GREEN}'OK' button clicked successfully.{COLOR_RESET}")
+                        self.timeouts.record("ok_confirmation_button", time.time() - start_time_ok)
+                        logger.success("'OK' button clicked successfully.")
                         break
                 except Exception as e:
-                    print(f"{COLOR_ORANGE}Error during JavaScript click attempt for 'OK' button: {e}{COLOR_RESET}")
+                    logger.warning(f"Error during JavaScript click attempt for 'OK' button: {e}")
                 time.sleep(0.5)
 
             if not ok_button_clicked:
-                print(f"{COLOR_RED}Failed to click 'OK' button via JavaScript after {timeout_ok} seconds. Proceeding without confirmation.{COLOR_RED}")
-                self.driver.save_screenshot(f"CRITICAL_js_ok_button_failed_{int(time.time())}.png")
+                self.timeouts.record_timeout("ok_confirmation_button")
+                logger.error(f"Failed to click 'OK' button via JavaScript after {timeout_ok} seconds. Proceeding without confirmation.")
+                self.failure_artifacts.capture("CRITICAL_js_ok_button_failed")
             else:
                 time.sleep(2)
 
             return added_account_ids
 
         except TimeoutException:
-            print(f"{COLOR_ORANGE}No search results found (timed out waiting for data). Halting this operation.{COLOR_RESET}")
-            self.driver.save_screenshot(f"retool_no_data_found_timeout_{int(time.time())}.png")
+            logger.warning("No search results found (timed out waiting for data). Halting this operation.")
+            self.failure_artifacts.capture("retool_no_data_found_timeout")
             return added_account_ids
         except Exception as e:
-            print(f"{COLOR_RED}An unexpected error occurred during check and add accounts: {e}{COLOR_RESET}")
-            self.driver.save_screenshot(f"retool_add_account_unexpected_error_{int(time.time())}.png")
+            logger.error(f"An unexpected error occurred during check and add accounts: {e}")
+            self.failure_artifacts.capture("retool_add_account_unexpected_error")
             return added_account_ids
 
 
@@ -898,19 +1574,18 @@ class WebScraper:
             search_type_label (str): The visible text of the option to type into the dropdown's input.
         """
         if not search_value:
-            print(f"{COLOR_BLUE}Skipping search for '{search_type_label}' as value is empty.{COLOR_RESET}")
+            logger.info(f"Skipping search for '{search_type_label}' as value is empty.")
             return False
 
         MAX_SEARCH_RETRIES = 3 # Max attempts for the entire search process
         SEARCH_RETRY_DELAY = 5 # Seconds to wait before retrying a failed search
 
         for attempt in range(1, MAX_SEARCH_RETRIES + 1):
-            print(f"{COLOR_BLUE}Attempt {attempt}/{MAX_SEARCH_RETRIES}: Attempting to enter '{search_value}' for type '{search_type_label}'...{COLOR_RESET}")
+            logger.info(f"Attempt {attempt}/{MAX_SEARCH_RETRIES}: Attempting to enter '{search_value}' for type '{search_type_label}'...")
 
             # Selectors for the main search input and the dropdown's input
             search_input_id = "Search2--0" 
             dropdown_input_id = "selectSearch--0" 
-            fetching_mask_selector = "div[data-testid='FetchingMask::WidgetFetchingMask']" # Selector for the searching indicator
             
             try:
                 # 1. Find the main search input element and click to ensure focus
@@ -918,42 +1593,50 @@ class WebScraper:
                     EC.element_to_be_clickable((By.ID, search_input_id))
                 )
                 main_search_input_element.click() # Ensure focus
-                time.sleep(0.2) # Small pause
 
-                # 2. Robustly clear the main search input field
+                # 2. Robustly clear the main search input field. Clearing a previous search starts an
+                # unfiltered fetch; it is awaited through the detector so its results can't be taken
+                # for the new search's.
+                clear_fetch_armed = bool(main_search_input_element.get_attribute("value")) and self.arm_search_detector()
                 main_search_input_element.send_keys(Keys.CONTROL + "a")
                 main_search_input_element.send_keys(Keys.DELETE)
                 main_search_input_element.send_keys(Keys.RETURN) # Trigger any internal Retool clear events
                 self.wait.until(EC.text_to_be_present_in_element_value((By.ID, search_input_id), ""))
-                time.sleep(0.5) # Small buffer after clearing
+                if not clear_fetch_armed or not self.wait_for_search_result("search_clear", 10, SEARCH_CLEAR_MAX_SECONDS):
+                    time.sleep(0.5) # Small buffer after clearing
 
-                # 3. Find the dropdown's input field and click to ensure focus
+                # 3. Find the dropdown's input field. Searches are batched by type, so it usually
+                # already shows the right type; only switch it when the type actually changes.
                 dropdown_input_element = self.wait.until(
                     EC.element_to_be_clickable((By.ID, dropdown_input_id))
                 )
-                dropdown_input_element.click() 
-                time.sleep(0.2) # Give a moment for dropdown to open
-
-                # 4. Robustly clear the dropdown input field and then type the search_type_label
-                # This sequence is critical for preventing the default/revert behavior
-                dropdown_input_element.send_keys(Keys.CONTROL + "a")
-                dropdown_input_element.send_keys(Keys.DELETE)
-                # We explicitly wait for the field to be empty before typing.
-                self.wait.until(EC.text_to_be_present_in_element_value((By.ID, dropdown_input_id), ""))
-                time.sleep(0.1) # Very short pause to ensure cleared state is registered
-
-                dropdown_input_element.send_keys(search_type_label)
-                dropdown_input_element.send_keys(Keys.RETURN) 
-                
-                # Wait for the selection to register and the dropdown input value to reflect the selection
-                self.wait.until(EC.text_to_be_present_in_element_value((By.ID, dropdown_input_id), search_type_label))
-                time.sleep(1) # Give generous time for the selection to register and UI to update
+                if dropdown_input_element.get_attribute("value") == search_type_label:
+                    logger.info(f"Search type is already '{search_type_label}'. Leaving the dropdown as is.")
+                else:
+                    dropdown_input_element.click() 
+
+                    # 4. Robustly clear the dropdown input field and then type the search_type_label
+                    # This sequence is critical for preventing the default/revert behavior
+                    dropdown_input_element.send_keys(Keys.CONTROL + "a")
+                    dropdown_input_element.send_keys(Keys.DELETE)
+                    # We explicitly wait for the field to be empty before typing.
+                    self.wait.until(EC.text_to_be_present_in_element_value((By.ID, dropdown_input_id), ""))
 
+                    dropdown_input_element.send_keys(search_type_label)
+                    dropdown_input_element.send_keys(Keys.RETURN) 
+                    
+                    # Wait for the selection to register and the dropdown input value to reflect the selection
+                    self.wait.until(EC.text_to_be_present_in_element_value((By.ID, dropdown_input_id), search_type_label))
 
                 # 5. Re-locate the main search input field (DOM might have changed)
                 main_search_input_element = self.wait.until(
                     EC.element_to_be_clickable((By.ID, search_input_id))
                 )
+
+                # Arm the completion detector before typing: typing can start Retool's auto-search,
+                # and whichever fetch for this value finishes first is the result set we want.
+                # The clear's fetch was awaited above; arming also waits out a fetch still running from the type switch.
+                detector_armed = self.arm_search_detector()
                 
                 # 6. Enter the actual search value into the main search input field using send_keys
                 # This triggers auto-search events (oninput, onkeyup, etc.)
@@ -962,54 +1645,61 @@ class WebScraper:
                 # 7. Send RETURN to trigger the search in Retool (after auto-search might have happened)
                 main_search_input_element.send_keys(Keys.RETURN) 
                 
-                # --- Wait a moment for the mask to show up before waiting for it to disappear ---
-                time.sleep(1.5) # Allow the fetching mask to visually appear if there's a delay
-
-                # --- Wait for the fetching mask to become invisible ---
-                print(f"{COLOR_BLUE}Waiting for search fetching mask to disappear...{COLOR_RESET}")
-                self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, fetching_mask_selector)))
-                print(f"{COLOR_GREEN}Search fetching mask disappeared. Search is complete.{COLOR_RESET}")
+                # --- Wait for the search to finish: resolved in the page, as soon as the new results are in ---
+                self.last_search_outcome = self.wait_for_search_result() if detector_armed else None
+                if self.last_search_outcome and main_search_input_element.get_attribute("value") != search_value:
+                    # The results that came in weren't for this value (e.g. a keystroke went missing)
+                    logger.warning(f"Search box doesn't hold '{search_value}'. Not trusting the detected search result.")
+                    self.last_search_outcome = None
+                if self.last_search_outcome:
+                    logger.success(f"Search is complete ({self.last_search_outcome.replace('_', ' ')}).")
+                else:
+                    # Detector missed the search (e.g. a fetch too quick to observe): the old fixed wait
+                    time.sleep(1.5) # Allow the fetching mask to visually appear if there's a delay
+                    logger.info("Waiting for search fetching mask to disappear...")
+                    self.timeouts.wait(self.driver, "search_fetching_mask", 10).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, SEARCH_FETCHING_MASK_SELECTOR)))
+                    logger.success("Search fetching mask disappeared. Search is complete.")
 
                 # 8. Verify the value was actually entered in the main search input
                 retried_verification = 0
                 while main_search_input_element.get_attribute("value") != search_value and retried_verification < 3:
-                    print(f"{COLOR_ORANGE}Verification failed for '{search_type_label}'. Retrying main input...{COLOR_RESET}")
+                    logger.warning(f"Verification failed for '{search_type_label}'. Retrying main input...")
                     main_search_input_element = self.wait.until(EC.element_to_be_clickable((By.ID, search_input_id)))
                     main_search_input_element.send_keys(Keys.CONTROL + "a") # Select all
                     main_search_input_element.send_keys(Keys.DELETE) # Delete
                     main_search_input_element.send_keys(search_value) # Re-type
                     main_search_input_element.send_keys(Keys.RETURN)
+                    self.last_search_outcome = None # The retyped search's results have to be waited for again
                     time.sleep(1)
                     retried_verification += 1
 
                 if main_search_input_element.get_attribute("value") == search_value:
-                    print(f"{COLOR_GREEN}Successfully entered '{search_value}' for '{search_type_label}'.{COLOR_RESET}")
-                    time.sleep(1) # Reduced post-input sleep as fetching mask covers loading
+                    logger.success(f"Successfully entered '{search_value}' for '{search_type_label}'.")
                     return True # Success, exit the retry loop
                 else:
-                    print(f"{COLOR_RED}Failed to verify input for '{search_type_label}'. Value still incorrect. Will retry whole search.{COLOR_RED}")
-                    self.driver.save_screenshot(f"retool_input_verification_failed_main_search_{search_type_label}_attempt_{attempt}_{int(time.time())}.png")
+                    logger.error(f"Failed to verify input for '{search_type_label}'. Value still incorrect. Will retry whole search.")
+                    self.failure_artifacts.capture("retool_input_verification_failed_main_search", context={"search_type": search_type_label, "attempt": attempt})
                     # No return True/False here, let the loop continue for retry
             
             except TimeoutException as e:
-                print(f"{COLOR_ORANGE}Timeout during search attempt {attempt} for '{search_type_label}': {e}{COLOR_RESET}")
-                self.driver.save_screenshot(f"retool_search_timeout_{search_type_label}_attempt_{attempt}_{int(time.time())}.png")
+                logger.warning(f"Timeout during search attempt {attempt} for '{search_type_label}': {e}")
+                self.failure_artifacts.capture("retool_search_timeout", context={"search_type": search_type_label, "attempt": attempt})
             except NoSuchElementException as e:
-                print(f"{COLOR_ORANGE}Search element '{search_type_label}' not found (or dropdown option not typed correctly) on attempt {attempt}: {e}{COLOR_RESET}")
-                self.driver.save_screenshot(f"retool_search_element_not_found_{search_type_label}_attempt_{attempt}_{int(time.time())}.png")
+                logger.warning(f"Search element '{search_type_label}' not found (or dropdown option not typed correctly) on attempt {attempt}: {e}")
+                self.failure_artifacts.capture("retool_search_element_not_found", context={"search_type": search_type_label, "attempt": attempt})
             except ElementClickInterceptedException as e:
-                print(f"{COLOR_ORANGE}Click intercepted for '{search_type_label}' on attempt {attempt}: {e}{COLOR_RESET}")
-                self.driver.save_screenshot(f"retool_click_intercepted_{search_type_label}_attempt_{attempt}_{int(time.time())}.png")
+                logger.warning(f"Click intercepted for '{search_type_label}' on attempt {attempt}: {e}")
+                self.failure_artifacts.capture("retool_click_intercepted", context={"search_type": search_type_label, "attempt": attempt})
             except Exception as e:
-                print(f"{COLOR_RED}Unexpected error entering data for '{search_type_label}' on attempt {attempt}: {e}{COLOR_RESET}")
-                self.driver.save_screenshot(f"retool_unexpected_error_{search_type_label}_attempt_{attempt}_{int(time.time())}.png")
+                logger.error(f"Unexpected error entering data for '{search_type_label}' on attempt {attempt}: {e}")
+                self.failure_artifacts.capture("retool_unexpected_error", context={"search_type": search_type_label, "attempt": attempt})
             
             # If we reach here, it means the current attempt failed. Pause and retry.
             if attempt < MAX_SEARCH_RETRIES:
-                print(f"{COLOR_YELLOW}Retrying search in {SEARCH_RETRY_DELAY} seconds...{COLOR_RESET}")
+                logger.info(f"Retrying search in {SEARCH_RETRY_DELAY} seconds...", color=COLOR_YELLOW)
                 time.sleep(SEARCH_RETRY_DELAY)
             else:
-                print(f"{COLOR_RED}All {MAX_SEARCH_RETRIES} attempts failed for '{search_type_label}'. Giving up.{COLOR_RESET}")
+                logger.error(f"All {MAX_SEARCH_RETRIES} attempts failed for '{search_type_label}'. Giving up.")
 
         return False # All attempts failed
     
@@ -1018,16 +1708,16 @@ def load_cleanup_queue_data(json_file_path):
     try:
         with open(json_file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        print(f"{COLOR_BLUE}Successfully loaded {len(data)} entries from Cleanup Queue JSON.{COLOR_RESET}")
+        logger.info(f"Successfully loaded {len(data)} entries from Cleanup Queue JSON.")
         return data
     except FileNotFoundError:
-        print(f"{COLOR_RED}Error: Cleanup Queue JSON file '{json_file_path}' not found.{COLOR_RESET}")
+        logger.error(f"Error: Cleanup Queue JSON file '{json_file_path}' not found.")
         return []
     except json.JSONDecodeError as e:
-        print(f"{COLOR_RED}Error decoding JSON from '{json_file_path}': {e}{COLOR_RESET}")
+        logger.error(f"Error decoding JSON from '{json_file_path}': {e}")
         return []
     except Exception as e:
-        print(f"{COLOR_RED}An unexpected error occurred while loading Cleanup Queue JSON data: {e}{COLOR_RESET}")
+        logger.error(f"An unexpected error occurred while loading Cleanup Queue JSON data: {e}")
         return []
     
 def load_company_data_from_json(json_file_path):
@@ -1035,27 +1725,26 @@ def load_company_data_from_json(json_file_path):
     Loads and flattens company data from the Pitchbook JSON tree into a searchable dictionary.
     Keys will be Pitchbook IDs and normalized legal names.
     Also returns the original hierarchical data for traversal.
+
+    Every flat entry has a "root_index" back-pointer: the position of its root in the returned
+    hierarchical list, so a match leads straight to its hierarchy. When a company appears in
+    several hierarchies, its keys point at the shallowest occurrence, so a root stays a root.
     """
     company_data_map = {} # New structure: {pb_id: company_data, normalized_name: company_data}
     original_full_data = [] # To store the original hierarchical list
 
-    # Helper function to extract PB ID using regex
-    def extract_pb_id_from_url(url):
-        if not url:
-            return None
-        match = re.search(r'/profile/([A-Za-z0-9-]+)(?:/|$)', url)
-        if match:
-            return match.group(1)
-        return None
+    def is_shallower_than_existing(key, details):
+        existing = company_data_map.get(key)
+        return existing is None or details["depth"] <= existing["depth"]
 
-    def process_node_and_add_to_map(node, current_depth):
+    def process_node_and_add_to_map(node, current_depth, root_index):
         # ADDED: Check if node is a dictionary before processing
         if not isinstance(node, dict):
-            print(f"{COLOR_ORANGE}Warning: Skipping non-dictionary node in Pitchbook JSON: {node}{COLOR_RESET}")
+            logger.warning(f"Warning: Skipping non-dictionary node in Pitchbook JSON: {node}")
             return
 
         profile_url = node.get("profile_url")
-        pb_id = extract_pb_id_from_url(profile_url)
+        pb_id = node_pb_id(node)
         legal_name = node.get("legal_name") or node.get("Name") # Use 'Name' as fallback for affiliates
 
         # Create a copy of the original node to store in the map (or reference directly if modifying isn't an issue)
@@ -1065,8 +1754,10 @@ def load_company_data_from_json(json_file_path):
             "website_link": node.get("website_link"),
             "former_names": node.get("former_names"),
             "legal_name": legal_name,
+            "normalized_name": normalize_name(legal_name),
             "also_known_as": node.get("also_known_as"), # ADDED: also_known_as
             "depth": current_depth,
+            "root_index": root_index,
             "contact_name": node.get("contact_name"),
             "contact_profile_link": node.get("contact_profile_link"),
             "contact_title": node.get("contact_title"),
@@ -1082,37 +1773,45 @@ def load_company_data_from_json(json_file_path):
         }
 
         # Add to map by Pitchbook ID
-        if pb_id:
+        if pb_id and is_shallower_than_existing(pb_id, company_details_for_map):
             company_data_map[pb_id] = company_details_for_map
         
         # Add to map by normalized legal name
         if legal_name:
-            normalized_legal_name = normalize_name(legal_name)
+            normalized_legal_name = company_details_for_map["normalized_name"]
             if normalized_legal_name: # Only add if normalized name is not empty
                 # Prioritize PB ID match for keys, otherwise overwrite if new.
                 # This ensures the map prefers unique PB IDs.
-                if normalized_legal_name not in company_data_map or (company_data_map[normalized_legal_name].get("pb_id") is None and pb_id is not None):
+                if normalized_legal_name not in company_data_map or (company_data_map[normalized_legal_name].get("pb_id") is None and pb_id is not None) \
+                or company_data_map[normalized_legal_name]["depth"] > current_depth:
                     company_data_map[normalized_legal_name] = company_details_for_map
 
+        # Related companies as PBTree writes them, at every depth
+        for children_key in ("related_companies", "nested_related_companies"):
+            children = node.get(children_key)
+            if isinstance(children, list):
+                for child in children:
+                    process_node_and_add_to_map(child, current_depth + 1, root_index)
+
         nested_affiliates_data = node.get("scraped_affiliates_table_data")
         if nested_affiliates_data:
             # ADDED: Check if nested_affiliates_data is a list before iterating
             if not isinstance(nested_affiliates_data, list):
-                print(f"{COLOR_ORANGE}Warning: 'scraped_affiliates_table_data' is not a list. Skipping. Node: {node.get('legal_name')}{COLOR_RESET}")
+                logger.warning(f"Warning: 'scraped_affiliates_table_data' is not a list. Skipping. Node: {node.get('legal_name')}")
                 return
 
             for affiliate_row in nested_affiliates_data:
                 # ADDED: Check if affiliate_row is a dictionary before processing
                 if not isinstance(affiliate_row, dict):
-                    print(f"{COLOR_ORANGE}Warning: Skipping non-dictionary affiliate_row: {affiliate_row}{COLOR_RESET}")
+                    logger.warning(f"Warning: Skipping non-dictionary affiliate_row: {affiliate_row}")
                     continue
 
                 if 'full_affiliate_profile_data' in affiliate_row and affiliate_row['full_affiliate_profile_data']:
-                    process_node_and_add_to_map(affiliate_row['full_affiliate_profile_data'], current_depth + 1)
+                    process_node_and_add_to_map(affiliate_row['full_affiliate_profile_data'], current_depth + 1, root_index)
                 else:
                     # For direct affiliates, add their data to the map
                     affiliate_profile_url = affiliate_row.get("Name_link")
-                    affiliate_pb_id = extract_pb_id_from_url(affiliate_profile_url)
+                    affiliate_pb_id = node_pb_id(affiliate_row)
                     affiliate_legal_name = affiliate_row.get("legal_name") or affiliate_row.get("Name")
 
                     affiliate_details_for_map = {
@@ -1121,9 +1820,11 @@ def load_company_data_from_json(json_file_path):
                         "website_link": affiliate_row.get("website_link"),
                         "former_names": affiliate_row.get("former_names"),
                         "legal_name": affiliate_legal_name,
+                        "normalized_name": normalize_name(affiliate_legal_name),
                         "also_known_as": affiliate_row.get("also_known_as"), # ADDED: also_known_as
                         "Name": affiliate_row.get("Name"), # Keep original 'Name' for direct affiliates
                         "depth": current_depth + 1,
+                        "root_index": root_index,
                         "contact_name": affiliate_row.get("contact_name"),
                         "contact_profile_link": affiliate_row.get("contact_profile_link"),
                         "contact_title": affiliate_row.get("contact_title"),
@@ -1138,21 +1839,22 @@ def load_company_data_from_json(json_file_path):
                         "office_phone": affiliate_row.get("office_phone")
                     }
 
-                    if affiliate_pb_id:
+                    if affiliate_pb_id and is_shallower_than_existing(affiliate_pb_id, affiliate_details_for_map):
                         company_data_map[affiliate_pb_id] = affiliate_details_for_map
                     if affiliate_legal_name:
-                        normalized_affiliate_name = normalize_name(affiliate_legal_name)
+                        normalized_affiliate_name = affiliate_details_for_map["normalized_name"]
                         if normalized_affiliate_name:
-                            if normalized_affiliate_name not in company_data_map or (company_data_map[normalized_affiliate_name].get("pb_id") is None and affiliate_pb_id is not None):
+                            if normalized_affiliate_name not in company_data_map or (company_data_map[normalized_affiliate_name].get("pb_id") is None and affiliate_pb_id is not None) \
+                            or company_data_map[normalized_affiliate_name]["depth"] > current_depth + 1:
                                 company_data_map[normalized_affiliate_name] = affiliate_details_for_map
                     
                     if 'related_companies' in affiliate_row and affiliate_row['related_companies']:
                         # ADDED: Check if related_companies is a list before iterating
                         if isinstance(affiliate_row['related_companies'], list):
                             for deeper_affiliate in affiliate_row['related_companies']:
-                                process_node_and_add_to_map(deeper_affiliate, current_depth + 2)
+                                process_node_and_add_to_map(deeper_affiliate, current_depth + 2, root_index)
                         else:
-                            print(f"{COLOR_ORANGE}Warning: 'related_companies' is not a list. Skipping. Affiliate: {affiliate_row.get('Name')}{COLOR_RESET}")
+                            logger.warning(f"Warning: 'related_companies' is not a list. Skipping. Affiliate: {affiliate_row.get('Name')}")
 
 
     try: 
@@ -1161,27 +1863,482 @@ def load_company_data_from_json(json_file_path):
         
         # ADDED: Check if the top-level data is a list as expected
         if not isinstance(data, list):
-            print(f"{COLOR_RED}Error: Top-level JSON data is not a list as expected. Cannot process.{COLOR_RED}")
+            logger.error("Error: Top-level JSON data is not a list as expected. Cannot process.")
             return {}, [] # Return empty map and list
 
         original_full_data = data # Store the original list
 
-        for top_level_company in original_full_data:
-            process_node_and_add_to_map(top_level_company, 0)
+        for root_index, top_level_company in enumerate(original_full_data):
+            process_node_and_add_to_map(top_level_company, 0, root_index)
         
-        print(f"{COLOR_BLUE}Successfully loaded {len(company_data_map)} searchable entries from Pitchbook JSON.{COLOR_RESET}")
+        logger.info(f"Successfully loaded {len(company_data_map)} searchable entries from Pitchbook JSON.")
     except FileNotFoundError:
-        print(f"{COLOR_RED}Error: Pitchbook JSON file '{json_file_path}' not found.{COLOR_RED}")
+        logger.error(f"Error: Pitchbook JSON file '{json_file_path}' not found.")
         return {}, [] # Return empty map and list
     except json.JSONDecodeError as e:
-        print(f"{COLOR_RED}Error decoding JSON from '{json_file_path}': {e}{COLOR_RED}")
+        logger.error(f"Error decoding JSON from '{json_file_path}': {e}")
         return {}, [] # Return empty map and list
     except Exception as e:
-        print(f"{COLOR_RED}An unexpected error occurred while loading Pitchbook JSON data: {e}{COLOR_RED}")
+        logger.error(f"An unexpected error occurred while loading Pitchbook JSON data: {e}")
         return {}, [] # Return empty map and list
 
     return company_data_map, original_full_data
-def main():
+
+
+def root_of(company_data_flat, original_pitchbook_data):
+    """Follows a flat entry's back-pointer to the root node of its hierarchy (None if it has none)."""
+    root_index = company_data_flat.get("root_index")
+    if root_index is None or not 0 <= root_index < len(original_pitchbook_data):
+        return None
+    root_node = original_pitchbook_data[root_index]
+    return root_node if isinstance(root_node, dict) else None
+
+
+def parse_args(argv=None):
+    """Parses the RetoolBot command line. Running without arguments processes every node."""
+    parser = argparse.ArgumentParser(description="Input PBTree hierarchies into the Retool cleanup queue.")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Only input nodes an incremental PBTree crawl flagged as new or newly attached.")
+    parser.add_argument("--failure-artifacts", choices=ARTIFACT_MODES, default=ARTIFACT_MODE_DOM,
+                        help="Diagnostics captured on timeouts and errors (default: %(default)s, a DOM snippet per failure, rate limited).")
+    parser.add_argument("--timeouts-file", default=RETOOL_TIMEOUTS_FILE,
+                        help="Where learned wait timeouts are kept between runs (default: %(default)s).")
+    parser.add_argument("--worklist", action="store_true",
+                        help="Read the whole queue first and open only the entries matching a root, by index, instead of scanning the queue UI.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of Retool browsers to run in parallel, each processing different queue roots (default: %(default)s).")
+    parser.add_argument("--worker-stagger-seconds", type=float, default=5,
+                        help="Delay between starting browsers in a --workers run (default: %(default)s).")
+    parser.add_argument("--search-cache-ttl-hours", type=float, default=DEFAULT_SEARCH_CACHE_TTL_HOURS,
+                        help="How long a cached Retool search result stays valid (default: %(default)s). 0 disables the cache.")
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+def ensure_retool_session(scraper, login_url, dashboard_url, success_indicator, check_timeout):
+    """Reuses the browser profile's Retool session if it is still valid, otherwise waits for a manual SSO login."""
+    if scraper.check_login_status(dashboard_url, success_indicator, check_timeout=check_timeout):
+        return True
+    return scraper.wait_for_sso_login(login_url=login_url, success_indicator=success_indicator)
+
+
+def match_queue_row(live_company_name, live_pitchbook_id, all_pitchbook_data_map, name_index):
+    """Finds the Pitchbook entry for a Cleanup Queue row: by PB ID, then normalized name, then fuzzy name. Returns None if none match."""
+    if live_pitchbook_id and live_pitchbook_id in all_pitchbook_data_map:
+        matched_company_data_flat = all_pitchbook_data_map[live_pitchbook_id]
+        logger.success(f"Direct match found by Pitchbook ID: '{live_pitchbook_id}'. Legal Name: {matched_company_data_flat.get('legal_name')}")
+        return matched_company_data_flat
+    if live_company_name:
+        normalized_live_name = normalize_name(live_company_name)
+        if normalized_live_name and normalized_live_name in all_pitchbook_data_map:
+            matched_company_data_flat = all_pitchbook_data_map[normalized_live_name]
+            logger.success(f"Direct match found by Normalized Name: '{live_company_name}'. Legal Name: {matched_company_data_flat.get('legal_name')}")
+            return matched_company_data_flat
+        # Same rule as are_names_similar, answered from the token index instead of a scan of every company,
+        # then a scored spelling-variant match
+        company_data_obj = name_index.best_match(live_company_name, fuzzy=True)
+        if company_data_obj:
+            logger.success(f"Fuzzy matched by Name: '{live_company_name}' to '{company_data_obj.get('legal_name')}'.")
+            return company_data_obj
+    return None
+
+
+def build_cleanup_worklist(scraper, all_pitchbook_data_map, name_index):
+    """
+    Reads the whole Cleanup Queue once (see read_table_rows) and returns the entries whose PB ID
+    or name matches a root company, one per root, in queue order:
+        [{"index", "name", "pb_id", "company"}]
+    Assumes the Cleanup Queue page is loaded.
+    """
+    queue_rows, _ = scraper.read_table_rows(CLEANUP_QUEUE_TABLE_ID)
+    worklist = []
+    queued_roots = set()
+    for index, cells in sorted(queue_rows.items()):
+        live_company_name = cells.get(CLEANUP_QUEUE_NAME_COLUMN_ID) or None
+        live_pitchbook_id = cells.get(CLEANUP_QUEUE_PB_ID_COLUMN_ID) or None
+        live_pitchbook_id = normalize_pb_id(live_pitchbook_id) or live_pitchbook_id
+        matched_company_data_flat = match_queue_row(live_company_name, live_pitchbook_id, all_pitchbook_data_map, name_index)
+        if not matched_company_data_flat or matched_company_data_flat.get("depth") != 0:
+            continue
+        root_key = matched_company_data_flat.get("pb_id") or matched_company_data_flat.get("normalized_name")
+        if root_key in queued_roots:
+            continue
+        queued_roots.add(root_key)
+        worklist.append({"index": index, "name": live_company_name, "pb_id": live_pitchbook_id, "company": matched_company_data_flat})
+    logger.milestone(f"Cleanup Queue worklist: {len(worklist)} of {len(queue_rows)} entries match a root company.")
+    return worklist
+
+
+def queue_row_name_at(scraper, index):
+    """The name cell text of the rendered Cleanup Queue row at data-item-index `index`, or None."""
+    return scraper.driver.execute_script(
+        "var c=document.querySelector(arguments[0]);return c?c.innerText.trim():null;",
+        f"div#{CLEANUP_QUEUE_TABLE_ID} div[role='row'][data-item-index='{index}'] div[role='gridcell'][data-column-id='{CLEANUP_QUEUE_NAME_COLUMN_ID}']"
+    )
+
+
+def process_cleanup_worklist(scraper, dashboard_url, all_pitchbook_data_map, original_pitchbook_data, add_account_button_selector,
+                             companies_for_review, processed_pitchbook_nodes, claimed_queue_rows=None, changed_only=False,
+                             name_index=None):
+    """
+    Worklist mode of process_cleanup_queue: computes the matching root entries up front
+    (build_cleanup_worklist), then goes straight to each one by index (find_and_click_row_with_retry)
+    instead of re-scanning the queue after every entry. One navigation per matching root.
+
+    If the row at an entry's index no longer has the expected name (the queue changed since it was
+    read), the worklist is rebuilt from the current queue, and the later entries use the rebuilt
+    indices too. An entry whose row still doesn't have the expected name after the rebuild is skipped,
+    so another company's queue entry is never opened.
+
+    Returns:
+        int: Number of root entries this scraper processed.
+    """
+    if name_index is None:
+        name_index = NameTokenIndex.from_company_map(all_pitchbook_data_map)
+    scrollable_element_selector = f"div#{CLEANUP_QUEUE_TABLE_ID} div._outer_1y096_2[data-testid='TableWrapper::ScrollableContainer']"
+
+    def load_queue_page():
+        scraper.driver.get(dashboard_url)
+        scraper.timeouts.wait(scraper.driver, "cleanup_queue_table", 30).until(
+            EC.presence_of_element_located((By.ID, CLEANUP_QUEUE_TABLE_ID)),
+            message=f"Timeout waiting for Cleanup Queue table (ID: {CLEANUP_QUEUE_TABLE_ID}) to be present."
+        )
+        scraper.wait_for_selector(f"div#{CLEANUP_QUEUE_TABLE_ID} div[role='row'][data-item-index]", 10)
+
+    logger.info(f"Navigating to Cleanup Queue page to build the worklist: {dashboard_url}")
+    try:
+        load_queue_page()
+    except Exception as e:
+        logger.error(f"Error during initial Cleanup Queue page load for processing: {e}")
+        scraper.failure_artifacts.capture("cleanup_queue_initial_processing_load_error")
+        return 0
+    worklist = build_cleanup_worklist(scraper, all_pitchbook_data_map, name_index)
+
+    processed_root_entries_count = 0
+    on_queue_page = True
+    queue_position = None
+    rebuilt_entries = None # {id(company): entry} from the latest re-read of the queue, once it has moved
+
+    def row_matches(index, name):
+        return scraper.scroll_to_row_index(scrollable_element_selector, CLEANUP_QUEUE_TABLE_ID, index,
+                                           f"div#{CLEANUP_QUEUE_TABLE_ID} div[role='row'][data-item-index='{index}']") \
+            and queue_row_name_at(scraper, index) == name
+
+    for entry in worklist:
+        company = entry["company"]
+        root_claim_key = company.get("pb_id") or company.get("normalized_name")
+        if claimed_queue_rows is not None and not claim_key(claimed_queue_rows, root_claim_key):
+            logger.info(f"ROOT company ({company.get('legal_name')}) is being processed by another worker. Skipping.", color=COLOR_YELLOW)
+            continue
+        entry_done = False
+        try:
+            if not on_queue_page:
+                if queue_position:
+                    scraper.return_to_cleanup_queue(dashboard_url, queue_position)
+                else:
+                    load_queue_page()
+            on_queue_page = True
+            queue_position = None
+            if rebuilt_entries is not None:
+                entry = rebuilt_entries.get(id(company))
+                if entry is None:
+                    logger.warning(f"ROOT company ({company.get('legal_name')}) is no longer in the Cleanup Queue. Skipping.")
+                    continue
+            index = entry["index"]
+            if not row_matches(index, entry["name"]):
+                logger.warning(f"Queue entry '{entry['name']}' is no longer at index {index}. Re-reading the queue to find it.")
+                rebuilt_entries = {id(item["company"]): item for item in build_cleanup_worklist(scraper, all_pitchbook_data_map, name_index)}
+                entry = rebuilt_entries.get(id(company))
+                if entry is None:
+                    logger.warning(f"ROOT company ({company.get('legal_name')}) is no longer in the Cleanup Queue. Skipping.")
+                    continue
+                index = entry["index"]
+                if not row_matches(index, entry["name"]):
+                    logger.error(f"Row {index} still isn't '{entry['name']}' after re-reading the queue. Skipping it rather than open the wrong entry.")
+                    continue
+
+            queue_position = scraper.remember_queue_position()
+            if not scraper.find_and_click_row_with_retry(scrollable_element_selector, CLEANUP_QUEUE_TABLE_ID, index):
+                logger.error(f"Could not open Cleanup Queue entry '{entry['name']}' (index {index}). Skipping.")
+                continue
+            on_queue_page = False
+            time.sleep(2)
+            logger.success(f"Opened Cleanup Queue entry '{entry['name']}' (index {index}).")
+
+            full_root_company_to_process = root_of(company, original_pitchbook_data)
+            if not full_root_company_to_process:
+                logger.warning(f"Error: Matched flat company data ({company.get('legal_name')}) not found in original hierarchical Pitchbook data. Skipping.")
+                continue
+            logger.info(f"Starting recursive data input for '{full_root_company_to_process.get('legal_name')}' and its affiliates...")
+            process_pitchbook_hierarchy(scraper, full_root_company_to_process, add_account_button_selector, companies_for_review, processed_pitchbook_nodes, changed_only=changed_only)
+            processed_root_entries_count += 1
+            entry_done = True
+            logger.info("Finished recursive data input for this hierarchy.")
+        except Exception as e:
+            logger.error(f"Error processing Cleanup Queue entry '{entry['name']}': {e}. Skipping.")
+            scraper.failure_artifacts.capture("processing_worklist_entry_error", context={"row_index": entry["index"], "name": entry["name"], "pb_id": entry["pb_id"], "error": str(e)})
+            on_queue_page = False
+            queue_position = None # Reload rather than trust the history after an error
+        finally:
+            if not entry_done and claimed_queue_rows is not None:
+                # Not opened or not finished: let another worker pick the root up
+                claimed_queue_rows.release(root_claim_key)
+    return processed_root_entries_count
+
+
+def process_cleanup_queue(scraper, dashboard_url, all_pitchbook_data_map, original_pitchbook_data, add_account_button_selector,
+                          companies_for_review, processed_pitchbook_nodes, claimed_queue_rows=None, changed_only=False,
+                          name_index=None, worklist=False):
+    """
+    Walks the live Cleanup Queue and, for every entry matching a root company in the Pitchbook data,
+    opens it and inputs that root's hierarchy (see process_pitchbook_hierarchy).
+
+    Args:
+        claimed_queue_rows (SharedClaimSet, optional): Roots claimed by the workers of a --workers run.
+                                                       A worker only opens roots it manages to claim.
+        name_index (NameTokenIndex, optional): Token index over the Pitchbook names, built from
+                                               all_pitchbook_data_map if not given.
+        worklist (bool): Compute the matching entries first and go straight to each one
+                         (see process_cleanup_worklist) instead of scanning the queue UI.
+
+    Returns:
+        int: Number of root entries this scraper processed.
+    """
+    if worklist:
+        return process_cleanup_worklist(scraper, dashboard_url, all_pitchbook_data_map, original_pitchbook_data, add_account_button_selector,
+                                        companies_for_review, processed_pitchbook_nodes, claimed_queue_rows, changed_only, name_index)
+    if name_index is None:
+        name_index = NameTokenIndex.from_company_map(all_pitchbook_data_map)
+    cleanup_queue_table_id = CLEANUP_QUEUE_TABLE_ID
+    scrollable_element_selector = f"div#{cleanup_queue_table_id} div._outer_1y096_2[data-testid='TableWrapper::ScrollableContainer']"
+    name_column_selector_in_row = "div[role='gridcell'][data-column-id='787e6'] span[data-is-cell-contents='true']"
+    pb_id_column_selector_in_row = "div[role='gridcell'][data-column-id='49266'] span[data-is-cell-contents='true']"
+
+
+    logger.info(f"Navigating to Cleanup Queue page for processing: {dashboard_url}")
+    scraper.driver.get(dashboard_url)
+    try:
+        scraper.timeouts.wait(scraper.driver, "cleanup_queue_table", 30).until(
+            EC.presence_of_element_located((By.ID, cleanup_queue_table_id)),
+            message=f"Timeout waiting for Cleanup Queue table (ID: {cleanup_queue_table_id}) to be present after initial navigation."
+        )
+        logger.info("Cleanup Queue table is present.")
+        time.sleep(5)
+    except Exception as e:
+        logger.error(f"Error during initial Cleanup Queue page load for processing: {e}")
+        scraper.failure_artifacts.capture("cleanup_queue_initial_processing_load_error")
+        return 0
+
+    processed_root_entries_count = 0
+    processed_row_unique_keys = set() 
+    
+    scroll_attempts_processing = 0
+    max_scroll_attempts_processing = 100 
+
+    while scroll_attempts_processing < max_scroll_attempts_processing:
+        initial_processed_unique_keys_count_in_pass = len(processed_row_unique_keys)
+        
+        scrollable_element = scraper.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, scrollable_element_selector)))
+        
+        current_visible_rows_elements = scraper.driver.find_elements(By.CSS_SELECTOR, f"div#{cleanup_queue_table_id} div[role='rowgroup'] div[role='row'][data-item-index]")
+        
+        found_and_clicked_in_this_pass = False
+
+        for row_element in current_visible_rows_elements:
+            live_company_name = None
+            live_pitchbook_id = None
+            row_data_item_index = row_element.get_attribute('data-item-index') 
+
+            try:
+                name_element = row_element.find_element(By.CSS_SELECTOR, name_column_selector_in_row)
+                live_company_name = name_element.text.strip()
+                
+                try: 
+                    pb_id_element = row_element.find_element(By.CSS_SELECTOR, pb_id_column_selector_in_row)
+                    live_pitchbook_id = pb_id_element.text.strip()
+                except NoSuchElementException:
+                    live_pitchbook_id = None 
+                
+                current_row_unique_key = f"{live_company_name}-{live_pitchbook_id}"
+                
+                if current_row_unique_key in processed_row_unique_keys:
+                    continue
+
+                processed_row_unique_keys.add(current_row_unique_key)
+                
+                logger.info(f"Evaluating live row (Index: {row_data_item_index}): Name='{live_company_name}', PB ID='{live_pitchbook_id}'.")
+
+                live_pitchbook_id = normalize_pb_id(live_pitchbook_id) or live_pitchbook_id
+                matched_company_data_flat = match_queue_row(live_company_name, live_pitchbook_id, all_pitchbook_data_map, name_index)
+                
+                if matched_company_data_flat:
+                    if matched_company_data_flat.get("depth") == 0:
+                        root_claim_key = matched_company_data_flat.get("pb_id") or matched_company_data_flat.get("normalized_name")
+                        if claimed_queue_rows is not None and not claim_key(claimed_queue_rows, root_claim_key):
+                            logger.info(f"ROOT company ({matched_company_data_flat.get('legal_name')}) is being processed by another worker. Skipping.", color=COLOR_YELLOW)
+                            continue
+                        logger.success(f"Match found and is a ROOT company ({matched_company_data_flat.get('legal_name')}, Depth: 0). Proceeding to click and input data.")
+
+                        root_done = False
+                        try:
+                            clickable_name_cell = row_element.find_element(By.CSS_SELECTOR, "div[role='gridcell'][data-column-id='787e6'] div[data-is-cell-contents='true'][class*='_isClickable_']")
+                            queue_position = scraper.remember_queue_position()
+                            clickable_name_cell.click()
+                            time.sleep(2) 
+                            logger.success(f"Clicked live Cleanup Queue entry: '{live_company_name}'.")
+                        
+                            full_root_company_to_process = root_of(matched_company_data_flat, original_pitchbook_data)
+
+                            if full_root_company_to_process:
+                               
+                                logger.info(f"Starting recursive data input for '{full_root_company_to_process.get('legal_name')}' and its affiliates...")
+                                process_pitchbook_hierarchy(scraper, full_root_company_to_process, add_account_button_selector, companies_for_review, processed_pitchbook_nodes, changed_only=changed_only)
+                                processed_root_entries_count += 1
+                                logger.info("Finished recursive data input for this hierarchy.")
+                            else:
+                                logger.warning(f"Error: Matched flat company data ({matched_company_data_flat.get('legal_name')}) not found in original hierarchical Pitchbook data. Skipping.")
+                            root_done = True
+                        finally:
+                            if not root_done and claimed_queue_rows is not None:
+                                # The click or the input failed: let another worker pick the root up
+                                claimed_queue_rows.release(root_claim_key)
+                        
+                       
+                        try:
+                            scraper.return_to_cleanup_queue(dashboard_url, queue_position)
+                        except Exception as e:
+                            logger.error(f"Error navigating back to Cleanup Queue: {e}")
+                            scraper.failure_artifacts.capture("cleanup_queue_navigate_back_process_error")
+                            found_and_clicked_in_this_pass = False 
+                            break 
+                        found_and_clicked_in_this_pass = True 
+                        break 
+                    else:
+                        root_node = root_of(matched_company_data_flat, original_pitchbook_data)
+                        root_name = root_node.get("legal_name") if root_node else None
+                        logger.info(f"Match found ({matched_company_data_flat.get('legal_name')}), but NOT a ROOT company (Depth: {matched_company_data_flat.get('depth')}, in the hierarchy of '{root_name}'). Skipping.", color=COLOR_YELLOW)
+                else:
+                    logger.warning(f"No match found in Pitchbook data for live row (Name: '{live_company_name}', PB ID: '{live_pitchbook_id}'). Skipping.")
+
+            except StaleElementReferenceException:
+                logger.warning("Stale element encountered while processing live row. Re-scanning current view.")
+                found_and_clicked_in_this_pass = False
+                break 
+            except Exception as e:
+                logger.error(f"Error processing live row (Index: {row_data_item_index}, Name: '{live_company_name}', PB ID: '{live_pitchbook_id}'): {e}. Skipping.")
+                
+                scraper.failure_artifacts.capture("processing_live_row_error", context={"row_index": row_data_item_index, "name": live_company_name, "pb_id": live_pitchbook_id, "error": str(e)})
+                
+                break
+
+        if found_and_clicked_in_this_pass:
+            continue
+
+        if len(processed_row_unique_keys) == initial_processed_unique_keys_count_in_pass:
+            current_scroll_position = scraper.driver.execute_script("return arguments[0].scrollTop;", scrollable_element)
+            scraper.driver.execute_script("arguments[0].scrollTop += arguments[0].clientHeight;", scrollable_element)
+            time.sleep(1.5)
+            new_scroll_position = scraper.driver.execute_script("return arguments[0].scrollTop;", scrollable_element)
+
+            if new_scroll_position == current_scroll_position:
+                logger.info("Reached end of scrollable content or no new entries loaded. Breaking processing loop.")
+                break 
+        
+        scroll_attempts_processing += 1
+        if scroll_attempts_processing == max_scroll_attempts_processing:
+            logger.warning("Max scroll attempts reached in processing loop. Breaking.")
+            break
+            
+    return processed_root_entries_count
+
+
+def run_retool_worker(worker_index, profile_name, args, urls, pitchbook_data, shared_run, shared_search_state):
+    """One browser of a --workers run: logs in, then processes whichever queue roots it can claim."""
+    login_url, dashboard_url, success_indicator, check_timeout, add_account_button_selector = urls
+    all_pitchbook_data_map, original_pitchbook_data, name_index = pitchbook_data
+    scraper = None
+    try:
+        scraper = WebScraper(headless=False, profile_name=profile_name, artifact_mode=args.failure_artifacts,
+                             shared_state=shared_search_state)
+        scraper.stop_event = shared_run["stop_event"]
+        if not ensure_retool_session(scraper, login_url, dashboard_url, success_indicator, check_timeout):
+            logger.error(f"Worker {worker_index}: failed to log in. This worker will not process any entries.")
+            return
+        processed = process_cleanup_queue(
+            scraper, dashboard_url, all_pitchbook_data_map, original_pitchbook_data, add_account_button_selector,
+            shared_run["companies_for_review"], shared_run["processed_pitchbook_nodes"],
+            claimed_queue_rows=shared_run["claimed_queue_rows"], changed_only=args.changed_only, name_index=name_index,
+            worklist=args.worklist
+        )
+        shared_run["processed_counts"][worker_index] = processed
+        logger.milestone(f"Worker {worker_index}: finished with {processed} root entries processed.")
+    except WorkerStopped:
+        logger.warning(f"Worker {worker_index}: stopped before finishing its entries.")
+    except Exception as e:
+        logger.error(f"Worker {worker_index}: unexpected error: {e}")
+    finally:
+        if scraper:
+            scraper.close()
+
+
+def run_worker_pool(args, urls, pitchbook_data):
+    """
+    Runs args.workers Retool browsers in parallel threads, each with its own Chrome profile and SSO
+    session. Workers claim different roots from the cleanup queue, share the processed-node set so
+    no account is added twice, and write Account IDs into the same Pitchbook data, which is saved
+    once all workers are done. On Ctrl-C the workers stop after their current search, and the
+    results so far are still saved.
+    """
+    shared_run = {
+        "companies_for_review": [], # list.append is atomic, so the workers can share it
+        "processed_pitchbook_nodes": SharedClaimSet(),
+        "claimed_queue_rows": SharedClaimSet(),
+        "processed_counts": {},
+        "stop_event": threading.Event(),
+    }
+    shared_search_state = create_shared_search_state(args.timeouts_file, SEARCH_CACHE_FILE, args.search_cache_ttl_hours,
+                                                     artifact_mode=args.failure_artifacts)
+    logger.progress(f"=== Starting {args.workers} Retool workers. Complete the SSO login in any window that asks for it. ===")
+
+    threads = []
+    try:
+        for worker_index in range(args.workers):
+            # Chrome can't open one profile from two browsers at once; worker 0 keeps the usual profile
+            profile_name = "retool_sso_profile" if worker_index == 0 else f"retool_sso_profile_worker{worker_index}"
+            thread = threading.Thread(
+                target=run_retool_worker, name=f"retool-worker-{worker_index}",
+                args=(worker_index, profile_name, args, urls, pitchbook_data, shared_run, shared_search_state),
+            )
+            thread.start()
+            threads.append(thread)
+            time.sleep(args.worker_stagger_seconds) # Spread out the logins and first searches
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        logger.warning("Interrupted. Stopping the workers after their current search, then saving the results so far...")
+        shared_run["stop_event"].set()
+        for thread in threads:
+            thread.join()
+        raise
+    finally:
+        # The workers have all exited here, so the Pitchbook data is no longer being written to
+        close_shared_search_state(shared_search_state)
+        total = sum(shared_run["processed_counts"].values())
+        logger.success(f"\nAll workers finished. Total root entries processed with data input: {total}.")
+        save_processed_results(pitchbook_data[1], shared_run["companies_for_review"])
+
+
+def save_processed_results(original_pitchbook_data, companies_for_review):
+    with open('processed_pitchbook_data_with_ids.json', 'w', encoding='utf-8') as f:
+        json.dump(original_pitchbook_data, f, indent=4)
+    logger.success("Modified Pitchbook data with Account IDs saved to 'processed_pitchbook_data_with_ids.json'.")
+
+    if companies_for_review: 
+        write_companies_to_review_json(companies_for_review)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging_from_args(args)
 
     # The initial login URL for Retool (where you'd click "Sign in with SSO")
     RETOOL_LOGIN_URL = "https://prod.retool.hl.com/auth/login" 
@@ -1199,209 +2356,57 @@ def main():
     ADD_ACCOUNT_BUTTON_SELECTOR = "div#button9--0 button"
 
     if RETOOL_DASHBOARD_URL == "https://prod.retool.hl.com/apps/7a30d6e7-6466-456e-9b7e-8055c5a8e475/Data%20Ops/Data%20Ops/CleanupQueue#CurrentMergeGroupID":
-        print(f"{COLOR_RED}Please ensure RETOOL_DASHBOARD_URL is correctly set for your Retool instance.{COLOR_RESET}")
-        print(f"{COLOR_RED}The provided value is a placeholder based on previous interaction and might need to be specific to your setup.{COLOR_RESET}")
+        logger.error("Please ensure RETOOL_DASHBOARD_URL is correctly set for your Retool instance.")
+        logger.error("The provided value is a placeholder based on previous interaction and might need to be specific to your setup.")
+
+    all_pitchbook_data_map, original_pitchbook_data = load_company_data_from_json(PITCHBOOK_JSON_FILE)
+    if not all_pitchbook_data_map or not original_pitchbook_data:
+        logger.error("No Pitchbook data loaded or it's malformed. Cannot proceed with processing.")
+        return
+    if args.changed_only and not has_change_markers(original_pitchbook_data):
+        logger.error(f"--changed-only needs the output of an incremental crawl, but {PITCHBOOK_JSON_FILE} has no change markers. Run without --changed-only to input every node.")
+        return
 
-    scraper = WebScraper(headless=False, profile_name="retool_sso_profile") 
+    if args.workers > 1:
+        run_worker_pool(args, (RETOOL_LOGIN_URL, RETOOL_DASHBOARD_URL, LOGIN_SUCCESS_INDICATOR, CHECK_LOGIN_TIMEOUT, ADD_ACCOUNT_BUTTON_SELECTOR),
+                        (all_pitchbook_data_map, original_pitchbook_data, NameTokenIndex.from_company_map(all_pitchbook_data_map)))
+        return
+
+    scraper = WebScraper(headless=False, profile_name="retool_sso_profile", artifact_mode=args.failure_artifacts,
+                         timeouts_path=args.timeouts_file, search_cache_ttl_hours=args.search_cache_ttl_hours) 
     
     companies_for_review = []
     processed_pitchbook_nodes = set()
 
     try:
-        print(f"{COLOR_BLUE}=== Attempting to log into Retool ==={COLOR_RESET}")
+        logger.progress("=== Attempting to log into Retool ===")
         
-        if not scraper.check_login_status(RETOOL_DASHBOARD_URL, LOGIN_SUCCESS_INDICATOR, check_timeout=CHECK_LOGIN_TIMEOUT):
-            logged_in_successfully = scraper.wait_for_sso_login(
-                login_url=RETOOL_LOGIN_URL, 
-                success_indicator=LOGIN_SUCCESS_INDICATOR 
-            )
-            if not logged_in_successfully:
-                print(f"{COLOR_RED}Failed to log in. Exiting.{COLOR_RED}")
-                return
+        if not ensure_retool_session(scraper, RETOOL_LOGIN_URL, RETOOL_DASHBOARD_URL, LOGIN_SUCCESS_INDICATOR, CHECK_LOGIN_TIMEOUT):
+            logger.error("Failed to log in. Exiting.")
+            return
 
         if scraper.logged_in:
-            print(f"\n{COLOR_GREEN}Session is active. Proceeding with actions on dashboard.{COLOR_RESET}")
-            
+            logger.success("\nSession is active. Proceeding with actions on dashboard.")
 
-            all_pitchbook_data_map, original_pitchbook_data = load_company_data_from_json(PITCHBOOK_JSON_FILE)
-            if not all_pitchbook_data_map or not original_pitchbook_data:
-                print(f"{COLOR_RED}No Pitchbook data loaded or it's malformed. Cannot proceed with processing.{COLOR_RED}")
-                return
-
-            cleanup_queue_table_id = "CleanupQueueEntryTable--0" 
-            scrollable_element_selector = f"div#{cleanup_queue_table_id} div._outer_1y096_2[data-testid='TableWrapper::ScrollableContainer']"
-            name_column_selector_in_row = "div[role='gridcell'][data-column-id='787e6'] span[data-is-cell-contents='true']"
-            pb_id_column_selector_in_row = "div[role='gridcell'][data-column-id='49266'] span[data-is-cell-contents='true']"
-
-
-            print(f"{COLOR_BLUE}Navigating to Cleanup Queue page for processing: {RETOOL_DASHBOARD_URL}{COLOR_RESET}")
-            scraper.driver.get(RETOOL_DASHBOARD_URL)
-            try:
-                WebDriverWait(scraper.driver, 30).until(
-                    EC.presence_of_element_located((By.ID, cleanup_queue_table_id)),
-                    message=f"Timeout waiting for Cleanup Queue table (ID: {cleanup_queue_table_id}) to be present after initial navigation."
-                )
-                print(f"{COLOR_BLUE}Cleanup Queue table is present.{COLOR_RESET}")
-                time.sleep(5)
-            except Exception as e:
-                print(f"{COLOR_RED}Error during initial Cleanup Queue page load for processing: {e}{COLOR_RESET}")
-                scraper.driver.save_screenshot(f"cleanup_queue_initial_processing_load_error_{int(time.time())}.png")
-                return 
-
-            processed_root_entries_count = 0
-            processed_row_unique_keys = set() 
-            
-            scroll_attempts_processing = 0
-            max_scroll_attempts_processing = 100 
-
-            while scroll_attempts_processing < max_scroll_attempts_processing:
-                initial_processed_unique_keys_count_in_pass = len(processed_row_unique_keys)
-                
-                scrollable_element = scraper.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, scrollable_element_selector)))
-                
-                current_visible_rows_elements = scraper.driver.find_elements(By.CSS_SELECTOR, f"div#{cleanup_queue_table_id} div[role='rowgroup'] div[role='row'][data-item-index]")
-                
-                found_and_clicked_in_this_pass = False
-
-                for row_element in current_visible_rows_elements:
-                    live_company_name = None
-                    live_pitchbook_id = None
-                    row_data_item_index = row_element.get_attribute('data-item-index') 
-
-                    try:
-                        name_element = row_element.find_element(By.CSS_SELECTOR, name_column_selector_in_row)
-                        live_company_name = name_element.text.strip()
-                        
-                        try: 
-                            pb_id_element = row_element.find_element(By.CSS_SELECTOR, pb_id_column_selector_in_row)
-                            live_pitchbook_id = pb_id_element.text.strip()
-                        except NoSuchElementException:
-                            live_pitchbook_id = None 
-                        
-                        current_row_unique_key = f"{live_company_name}-{live_pitchbook_id}"
-                        
-                        if current_row_unique_key in processed_row_unique_keys:
-                            continue
-
-                        processed_row_unique_keys.add(current_row_unique_key)
-                        
-                        print(f"{COLOR_BLUE}Evaluating live row (Index: {row_data_item_index}): Name='{live_company_name}', PB ID='{live_pitchbook_id}'.{COLOR_RESET}")
-
-                        matched_company_data_flat = None
-                        if live_pitchbook_id and live_pitchbook_id in all_pitchbook_data_map:
-                            matched_company_data_flat = all_pitchbook_data_map[live_pitchbook_id]
-                            print(f"{COLOR_GREEN}Direct match found by Pitchbook ID: '{live_pitchbook_id}'. Legal Name: {matched_company_data_flat.get('legal_name')}{COLOR_RESET}")
-                        elif live_company_name:
-                            normalized_live_name = normalize_name(live_company_name)
-                            if normalized_live_name and normalized_live_name in all_pitchbook_data_map:
-                                matched_company_data_flat = all_pitchbook_data_map[normalized_live_name]
-                                print(f"{COLOR_GREEN}Direct match found by Normalized Name: '{live_company_name}'. Legal Name: {matched_company_data_flat.get('legal_name')}{COLOR_RESET}")
-                            else:
-                                for pb_key, company_data_obj in all_pitchbook_data_map.items():
-                                    if isinstance(company_data_obj, dict) and company_data_obj.get('legal_name') and \
-                                    are_names_similar(live_company_name, company_data_obj.get('legal_name')):
-                                        matched_company_data_flat = company_data_obj
-                                        print(f"{COLOR_GREEN}Fuzzy matched by Name: '{live_company_name}' to '{company_data_obj.get('legal_name')}'.{COLOR_RESET}")
-                                        break
-                        
-                        if matched_company_data_flat:
-                            if matched_company_data_flat.get("depth") == 0:
-                                print(f"{COLOR_GREEN}Match found and is a ROOT company ({matched_company_data_flat.get('legal_name')}, Depth: 0). Proceeding to click and input data.{COLOR_RESET}")
-
-                                clickable_name_cell = row_element.find_element(By.CSS_SELECTOR, "div[role='gridcell'][data-column-id='787e6'] div[data-is-cell-contents='true'][class*='_isClickable_']")
-                                clickable_name_cell.click()
-                                time.sleep(2) 
-                                print(f"{COLOR_GREEN}Clicked live Cleanup Queue entry: '{live_company_name}'.{COLOR_RESET}")
-                            
-                                full_root_company_to_process = None
-                                for root_node in original_pitchbook_data:
-                                    if isinstance(root_node, dict):
-                                        if matched_company_data_flat.get("pb_id") and root_node.get("pb_id") == matched_company_data_flat["pb_id"]:
-                                            full_root_company_to_process = root_node
-                                            break
-                                        elif matched_company_data_flat.get("legal_name") and normalize_name(root_node.get("legal_name")) == normalize_name(matched_company_data_flat["legal_name"]):
-                                            full_root_company_to_process = root_node
-                                            break
-
-                                if full_root_company_to_process:
-                                   
-                                    print(f"{COLOR_BLUE}Starting recursive data input for '{full_root_company_to_process.get('legal_name')}' and its affiliates...{COLOR_RESET}")
-                                    process_pitchbook_hierarchy(scraper, full_root_company_to_process, ADD_ACCOUNT_BUTTON_SELECTOR, companies_for_review, processed_pitchbook_nodes)
-                                    processed_root_entries_count += 1
-                                    print(f"{COLOR_BLUE}Finished recursive data input for this hierarchy.{COLOR_RESET}")
-                                else:
-                                    print(f"{COLOR_ORANGE}Error: Matched flat company data ({matched_company_data_flat.get('legal_name')}) not found in original hierarchical Pitchbook data. Skipping.{COLOR_RESET}")
-                                
-                               
-                                print(f"{COLOR_BLUE}Navigating back to Cleanup Queue page for next entry: {RETOOL_DASHBOARD_URL}{COLOR_RESET}")
-                                scraper.driver.get(RETOOL_DASHBOARD_URL)
-                                try:
-                                    WebDriverWait(scraper.driver, 30).until(
-                                        EC.presence_of_element_located((By.ID, cleanup_queue_table_id)),
-                                        message=f"Timeout waiting for Cleanup Queue table (ID: {cleanup_queue_table_id}) to be present after navigating back."
-                                    )
-                                    time.sleep(5)
-                                except Exception as e:
-                                    print(f"{COLOR_RED}Error navigating back to Cleanup Queue: {e}{COLOR_RESET}")
-                                    scraper.driver.save_screenshot(f"cleanup_queue_navigate_back_process_error_{int(time.time())}.png")
-                                    found_and_clicked_in_this_pass = False 
-                                    break 
-                                found_and_clicked_in_this_pass = True 
-                                break 
-                            else:
-                                print(f"{COLOR_YELLOW}Match found ({matched_company_data_flat.get('legal_name')}), but NOT a ROOT company (Depth: {matched_company_data_flat.get('depth')}). Skipping.{COLOR_RESET}")
-                        else:
-                            print(f"{COLOR_ORANGE}No match found in Pitchbook data for live row (Name: '{live_company_name}', PB ID: '{live_pitchbook_id}'). Skipping.{COLOR_RESET}")
-
-                    except StaleElementReferenceException:
-                        print(f"{COLOR_ORANGE}Stale element encountered while processing live row. Re-scanning current view.{COLOR_RESET}")
-                        found_and_clicked_in_this_pass = False
-                        break 
-                    except Exception as e:
-                        print(f"{COLOR_RED}Error processing live row (Index: {row_data_item_index}, Name: '{live_company_name}', PB ID: '{live_pitchbook_id}'): {e}. Skipping.{COLOR_RESET}")
-                        
-                        scraper.driver.save_screenshot(f"processing_live_row_error_idx_{row_data_item_index}_{int(time.time())}.png")
-                        
-                        break
-
-                if found_and_clicked_in_this_pass:
-                    continue
-
-                if len(processed_row_unique_keys) == initial_processed_unique_keys_count_in_pass:
-                    current_scroll_position = scraper.driver.execute_script("return arguments[0].scrollTop;", scrollable_element)
-                    scraper.driver.execute_script("arguments[0].scrollTop += arguments[0].clientHeight;", scrollable_element)
-                    time.sleep(1.5)
-                    new_scroll_position = scraper.driver.execute_script("return arguments[0].scrollTop;", scrollable_element)
-
-                    if new_scroll_position == current_scroll_position:
-                        print(f"{COLOR_BLUE}Reached end of scrollable content or no new entries loaded. Breaking processing loop.{COLOR_RESET}")
-                        break 
-                
-                scroll_attempts_processing += 1
-                if scroll_attempts_processing == max_scroll_attempts_processing:
-                    print(f"{COLOR_ORANGE}Max scroll attempts reached in processing loop. Breaking.{COLOR_RESET}")
-                    break
-                    
-            print(f"{COLOR_GREEN}\nFinished iterating Cleanup Queue. Total root entries processed with data input: {processed_root_entries_count}.{COLOR_RESET}")
+            processed_root_entries_count = process_cleanup_queue(
+                scraper, RETOOL_DASHBOARD_URL, all_pitchbook_data_map, original_pitchbook_data, ADD_ACCOUNT_BUTTON_SELECTOR,
+                companies_for_review, processed_pitchbook_nodes, changed_only=args.changed_only, worklist=args.worklist
+            )
+            logger.success(f"\nFinished iterating Cleanup Queue. Total root entries processed with data input: {processed_root_entries_count}.")
 
-            print(f"\n{COLOR_GREEN}All actions completed. The browser will remain open for 60 seconds for observation.{COLOR_RESET}")
+            logger.success("\nAll actions completed. The browser will remain open for 60 seconds for observation.")
             time.sleep(60)
         else:
-            print(f"{COLOR_RED}Could not establish a session. Exiting.{COLOR_RED}")
+            logger.error("Could not establish a session. Exiting.")
             time.sleep(10)
 
     except Exception as e:
-        print(f"{COLOR_RED}An unexpected error occurred in the main process: {e}{COLOR_RESET}")
+        logger.error(f"An unexpected error occurred in the main process: {e}")
     
     finally:
         if scraper:
             scraper.close()
-            with open('processed_pitchbook_data_with_ids.json', 'w', encoding='utf-8') as f:
-                json.dump(original_pitchbook_data, f, indent=4)
-            print(f"{COLOR_GREEN}Modified Pitchbook data with Account IDs saved to 'processed_pitchbook_data_with_ids.json'.{COLOR_RESET}")
-
-            if companies_for_review: 
-                write_companies_to_review_json(companies_for_review)
+            save_processed_results(original_pitchbook_data, companies_for_review)
 
 if __name__ == "__main__":
     main()
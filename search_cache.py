@@ -0,0 +1,124 @@
+import json
+import os
+import re
+import threading
+import time
+
+from pb_ids import normalize_pb_id
+from bot_logging import get_logger
+
+logger = get_logger("search_cache")
+
+SEARCH_CACHE_FILE = "retool_search_cache.json"
+DEFAULT_SEARCH_CACHE_TTL_HOURS = 24
+
+
+def normalize_search_value(search_type, value):
+    """
+    Normalizes a search value the way Retool treats it, so trivially different spellings of the
+    same search share a cache entry. Only differences Retool ignores are folded: case, repeated
+    whitespace, and for websites the scheme, 'www.' and trailing slashes.
+    """
+    if value is None:
+        return ""
+    text = re.sub(r'\s+', ' ', str(value)).strip()
+    if search_type == "Pitchbook ID":
+        return normalize_pb_id(text) or text.upper()
+    text = text.casefold()
+    if search_type == "Website":
+        text = re.sub(r'^[a-z]+://', '', text)
+        if text.startswith("www."):
+            text = text[4:]
+        text = text.rstrip("/")
+    return text
+
+
+class SearchResultCache:
+    """
+    Remembers the Add Account table rows each RetoolBot search returned, keyed by
+    (search type, normalized value), so repeat searches can be answered without the UI.
+
+    Each entry holds the rows the search returned:
+        {"name": ..., "account_id": ...}
+    Whether a row was already selected is not kept: that only holds for the session that saw it.
+    An empty row list means the search found nothing. Entries expire after ttl_seconds so
+    accounts created in Retool since the search are picked up. The cache is kept in a JSON
+    file between runs.
+    """
+
+    def __init__(self, path=SEARCH_CACHE_FILE, ttl_seconds=DEFAULT_SEARCH_CACHE_TTL_HOURS * 3600, save_every=10):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.save_every = save_every
+        self.entries = {}  # {"<search type>|<normalized value>": {"rows": [...], "cached_at": epoch seconds}}
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+        self._lock = threading.Lock() # Parallel RetoolBot workers share one cache
+        self._load()
+
+    @property
+    def enabled(self):
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def _key(search_type, value):
+        return f"{search_type}|{normalize_search_value(search_type, value)}"
+
+    def _load(self):
+        if not self.enabled or not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load search cache from {self.path}, starting empty. Error: {e}")
+            return
+        now = time.time()
+        self.entries = {
+            key: entry for key, entry in stored.get("entries", {}).items()
+            if now - entry.get("cached_at", 0) < self.ttl_seconds
+        }
+        logger.info(f"Loaded {len(self.entries)} cached Retool searches from {self.path}")
+
+    def save(self):
+        if not self.enabled or not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        with self._lock:
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump({"entries": self.entries}, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+                self._unsaved = 0
+            except OSError as e:
+                logger.warning(f"Could not save search cache to {self.path}. Error: {e}")
+
+    def get(self, search_type, value):
+        """Returns the cached rows for a search (possibly empty), or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        key = self._key(search_type, value)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry.get("cached_at", 0) >= self.ttl_seconds:
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry["rows"]
+
+    def put(self, search_type, value, rows):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.entries[self._key(search_type, value)] = {"rows": list(rows), "cached_at": time.time()}
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def close(self):
+        self.save()
+        if self.hits or self.misses:
+            logger.info(f"Search cache: {self.hits} hits, {self.misses} misses.")
@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+
+from search_cache import normalize_search_value
+from bot_logging import get_logger
+
+logger = get_logger("search_planner")
+
+SEARCH_STATS_FILE = "retool_search_stats.json"
+
+# (node field, Retool search type, whether results are validated against the node's name)
+SEARCH_FIELDS = [
+    ("pb_id", "Pitchbook ID", False),
+    ("legal_name", "Name", True),
+    ("former_names", "Name", True),
+    ("also_known_as", "Name", True),
+    ("website_link", "Website", False),
+]
+
+# A search on one of these that adds an account is conclusive: the remaining searches for the node are skipped
+HIGH_CONFIDENCE_FIELDS = {"pb_id", "website_link"}
+
+
+class SearchPlanner:
+    """
+    Decides which Retool searches to run for a node, and in what order.
+
+    Identifiers that normalize to the same search are only searched once (e.g. a former name that
+    equals the legal name after suffix and punctuation stripping). The remaining searches are
+    ordered by how often each field's search added an account in past runs, using smoothed
+    hit rates so fields with little history keep roughly the original PB ID, name, website order.
+    The per-field counts are kept in a JSON file between runs.
+
+    A node whose PB ID or website search added an account skips its remaining searches. Those
+    skipped searches are counted separately ("skipped") and left out of the hit rates, so each
+    rate is conditional on no high-confidence search having already matched the node.
+    """
+
+    def __init__(self, path=SEARCH_STATS_FILE, name_normalizer=None):
+        self.path = path
+        self.name_normalizer = name_normalizer
+        self.stats = {}  # {field: {"searches": n, "hits": n, "skipped": n}}
+        self._lock = threading.Lock() # Parallel RetoolBot workers share one planner
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.stats = json.load(f).get("fields", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load search statistics from {self.path}, using the default order. Error: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        with self._lock:
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump({"fields": self.stats}, f, indent=2)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save search statistics to {self.path}. Error: {e}")
+
+    def hit_rate(self, field, position):
+        """
+        Laplace-smoothed share of this field's searches that added an account; earlier fields get a
+        slightly higher prior. Only searches that ran count: a search skipped because the node was
+        already matched would most likely have found the same account, so counting it as a miss
+        would push that field down the order for the nodes where it still runs.
+        """
+        with self._lock:
+            counts = dict(self.stats.get(field, {}))
+        prior = 1.0 - position * 0.05
+        return (counts.get("hits", 0) + prior) / (counts.get("searches", 0) + 2)
+
+    def _dedupe_key(self, search_type, value):
+        if search_type == "Name" and self.name_normalizer:
+            return (search_type, self.name_normalizer(value))
+        return (search_type, normalize_search_value(search_type, value))
+
+    def plan(self, company_details):
+        """
+        Returns the searches to run for a node as a list of dicts:
+            {"field", "search_type", "value", "validate_name", "score"}
+        in the order they should run.
+        """
+        planned = []
+        seen_keys = set()
+        for position, (field, search_type, validate_name) in enumerate(SEARCH_FIELDS):
+            value = company_details.get(field)
+            if not value:
+                continue
+            key = self._dedupe_key(search_type, value)
+            if key[1] and key in seen_keys:
+                logger.info(f"Skipping {field} search for '{value}': same search as an earlier identifier.")
+                continue
+            seen_keys.add(key)
+            planned.append({
+                "field": field,
+                "search_type": search_type,
+                "value": value,
+                "validate_name": validate_name,
+                "score": self.hit_rate(field, position),
+            })
+        planned.sort(key=lambda search: search["score"], reverse=True)
+        return planned
+
+    def record(self, field, added_account):
+        with self._lock:
+            counts = self.stats.setdefault(field, {"searches": 0, "hits": 0})
+            counts["searches"] += 1
+            if added_account:
+                counts["hits"] += 1
+
+    def record_skipped(self, field):
+        """Counts a planned search that was not run because a high-confidence search already matched the node."""
+        with self._lock:
+            counts = self.stats.setdefault(field, {"searches": 0, "hits": 0})
+            counts["skipped"] = counts.get("skipped", 0) + 1
+
+    def close(self):
+        self.save()
@@ -0,0 +1,57 @@
+import pytest
+
+from name_matching import name_similarity, match_decision, score_table, DECISION_ACCEPT, DECISION_REVIEW, DECISION_REJECT
+from name_index import NameTokenIndex
+
+NUMBERED_ENTITY_PAIRS = [
+    ("Bain Capital Fund XII", "Bain Capital Fund XIII"),
+    ("Blackstone Real Estate Partners VII", "Blackstone Real Estate Partners VIII"),
+    ("Alpha Capital Partners II", "Alpha Capital Partners III"),
+    ("Acme Growth Fund 2019", "Acme Growth Fund 2020"),
+]
+
+
+@pytest.mark.parametrize("name_a, name_b", NUMBERED_ENTITY_PAIRS)
+def test_different_numbered_entities_are_rejected(name_a, name_b):
+    assert match_decision(name_similarity(name_a, name_b)) == DECISION_REJECT
+    assert match_decision(name_similarity(name_b, name_a)) == DECISION_REJECT
+
+
+@pytest.mark.parametrize("name_a, name_b", NUMBERED_ENTITY_PAIRS)
+def test_score_table_does_not_accept_a_different_fund(name_a, name_b):
+    assert score_table([name_b], [name_a])[0]["decision"] != DECISION_ACCEPT
+
+
+@pytest.mark.parametrize("name_a, name_b", [
+    ("Blue River Partner", "Blue River Partners"),
+    ("Blue-River Inc", "Blue River LLC"),
+    ("Acme Holdings", "ACME, Inc."),
+    ("Bain Capital Fund XII", "Bain Capital Fund, XII."),
+])
+def test_equivalent_names_are_accepted(name_a, name_b):
+    assert match_decision(name_similarity(name_a, name_b)) == DECISION_ACCEPT
+
+
+@pytest.mark.parametrize("name_a, name_b", [
+    ("Alpha Capital Partners", "Alpha Capital Partners II"),
+    ("Grass Valley", "Gras Valley"),
+    ("Acme Corp", "Acme Corporation"),
+    ("Carlyle Group", "The Carlyle Group Inc"),
+    ("Blackstone", "The Blackstone Group"),
+])
+def test_close_but_different_names_go_to_review(name_a, name_b):
+    assert match_decision(name_similarity(name_a, name_b)) == DECISION_REVIEW
+
+
+@pytest.mark.parametrize("query, indexed", NUMBERED_ENTITY_PAIRS)
+def test_queue_rows_do_not_match_a_different_fund(query, indexed):
+    index = NameTokenIndex()
+    index.add(indexed, {"legal_name": indexed})
+    assert index.best_match(query, fuzzy=True) is None
+
+
+def test_queue_rows_match_the_same_fund():
+    index = NameTokenIndex()
+    for name in ("Bain Capital Fund XII", "Bain Capital Fund XIII"):
+        index.add(name, {"legal_name": name})
+    assert index.best_match("Bain Capital Fund XIII, L.P.", fuzzy=True)["legal_name"] == "Bain Capital Fund XIII"